@@ -0,0 +1,10 @@
+"""
+Benchmarks
+==========
+
+Messungen für Parser, Abruf, Speicher und die Benchmark-Suite.
+
+- korpus: Reproduzierbare synthetische Anzeigen und Ergebnisseiten
+- suite: Gesamtlauf mit JSON-Ausgabe und Vergleich (``python -m benchmarks.suite``)
+- stub_server: Lokaler HTTP-Server mit Ergebnis- und Detailseiten
+"""
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: synchroner vs. asynchroner Abruf
+===========================================
+
+Misst den Durchsatz (Seiten pro Sekunde) von ``KleinanzeigenScraper``
+(streng nacheinander und mit Vorausladen der nächsten Seite) und
+``AsyncKleinanzeigenScraper`` gegen einen lokalen Stub-Server.
+
+Verwendung:
+    python benchmarks/bench_async_fetch.py --suchen 20 --seiten 3 --latenz 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.kleinanzeigen_scraper import KleinanzeigenScraper
+from src.async_scraper import AsyncKleinanzeigenScraper
+from src.rate_limiter import RateLimiter
+from stub_server import StubServer
+
+
+def bench_sync(url, suchen, verzoegerung, vorausladen):
+    scraper = KleinanzeigenScraper(base_url=url, rate_limiter=RateLimiter(standard_intervall=verzoegerung))
+    scraper.VORAUSLADEN = vorausladen
+    start = time.perf_counter()
+    anzahl = sum(len(scraper.extrahiere_anzeigen(*suche)) for suche in suchen)
+    return time.perf_counter() - start, anzahl
+
+
+def bench_async(url, suchen, verzoegerung, parallel):
+    scraper = AsyncKleinanzeigenScraper(base_url=url, max_parallel_pro_host=parallel,
+                                        verzoegerung=verzoegerung)
+    start = time.perf_counter()
+    ergebnisse = asyncio.run(scraper.extrahiere_viele_async(suchen))
+    dauer = time.perf_counter() - start
+    scraper.schliessen()
+    return dauer, sum(len(anzeigen) for anzeigen in ergebnisse)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--suchen', type=int, default=20)
+    parser.add_argument('--seiten', type=int, default=3)
+    parser.add_argument('--latenz', type=float, default=0.05, help='Antwortzeit des Stub-Servers in Sekunden')
+    parser.add_argument('--verzoegerung', type=float, default=0.0, help='Startintervall des Rate-Limiters')
+    parser.add_argument('--parallel', type=int, default=8, help='Maximale Anfragen pro Host')
+    args = parser.parse_args()
+
+    suchen = [(f"handwerker{i}", "berlin", args.seiten) for i in range(args.suchen)]
+    seiten_gesamt = args.suchen * args.seiten
+
+    with StubServer(latenz=args.latenz, seiten=args.seiten) as server:
+        for name, messung in (
+            ('sync (nacheinander)', lambda: bench_sync(server.url, suchen, args.verzoegerung, 0)),
+            ('sync (vorausladen)', lambda: bench_sync(server.url, suchen, args.verzoegerung, 1)),
+            (f'async (parallel={args.parallel})',
+             lambda: bench_async(server.url, suchen, args.verzoegerung, args.parallel)),
+        ):
+            dauer, anzahl = messung()
+            print(f"{name:24} {dauer:7.2f} s  {seiten_gesamt / dauer:8.1f} Seiten/s  {anzahl} Anzeigen")
+
+
+if __name__ == "__main__":
+    main()
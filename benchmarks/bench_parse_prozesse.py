@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Parsen im Prozesspool
+================================
+
+Misst, wie die Seiten pro Sekunde mit der Anzahl der Parse-Prozesse
+skalieren. Verglichen wird mit dem Parsen im aufrufenden Thread; die
+Seiten werden wie vom Abruf als rohe Bytes übergeben
+(``fixtures/suchergebnis.html``).
+
+Verwendung:
+    python benchmarks/bench_parse_prozesse.py --seiten 400 --prozesse 1 2 4 8 16
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.kleinanzeigen_scraper import KleinanzeigenScraper
+from src.parse_prozesse import ParseProzesse
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'suchergebnis.html')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seiten', type=int, default=400)
+    parser.add_argument('--prozesse', type=int, nargs='+',
+                        default=sorted({1, 2, 4, 8, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    with open(FIXTURE, 'rb') as f:
+        html = f.read()
+    seiten = [html] * args.seiten
+    scraper = KleinanzeigenScraper()
+
+    print(f"📄 {args.seiten} Seiten à {len(html) / 1024:.0f} KiB, {os.cpu_count()} CPU-Kerne\n")
+
+    scraper.parse_ergebnisseite(html)  # Aufwärmen
+    start = time.perf_counter()
+    anzahl = sum(len(scraper.parse_ergebnisseite(seite)) for seite in seiten)
+    basis = args.seiten / (time.perf_counter() - start)
+    print(f"{'im Thread':16} {basis:8.1f} Seiten/s  1.00x  ({anzahl} Anzeigen)")
+
+    for prozesse in args.prozesse:
+        with ParseProzesse(scraper.base_url, scraper.kategorien, prozesse) as pool:
+            pool.aufwaermen()
+            start = time.perf_counter()
+            anzahl = sum(len(anzeigen) for anzeigen in pool.parse_viele(seiten))
+            rate = args.seiten / (time.perf_counter() - start)
+        print(f"{f'{prozesse} Prozesse':16} {rate:8.1f} Seiten/s  {rate / basis:.2f}x  ({anzahl} Anzeigen)")
+
+
+if __name__ == '__main__':
+    main()
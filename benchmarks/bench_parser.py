@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: lxml- vs. BeautifulSoup-Parser
+=========================================
+
+Vergleicht Seiten pro Sekunde und Spitzenspeicher beim Parsen einer
+Suchergebnisseite (``fixtures/suchergebnis.html``).
+
+Varianten:
+- lxml:        ErgebnisParser mit lxml und Teilbaum-Schnitt
+- bs4:         ErgebnisParser mit BeautifulSoup-Fallback
+- bs4 (alt):   BeautifulSoup über die ganze Seite wie vor dem Parser-Modul
+
+Verwendung:
+    python benchmarks/bench_parser.py --wiederholungen 200
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+
+from src.ergebnis_parser import ErgebnisParser
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'suchergebnis.html')
+
+
+def parse_bs4_ganze_seite(html):
+    """Ursprünglicher Pfad: ganze Seite mit dem Standard-Baumbauer parsen"""
+    soup = BeautifulSoup(html, 'html.parser')
+    return [artikel.select_one('h2 a').get_text(strip=True) for artikel in soup.select('article.aditem')]
+
+
+def miss(parse, html, wiederholungen):
+    parse(html)  # Aufwärmen
+
+    start = time.perf_counter()
+    for _ in range(wiederholungen):
+        parse(html)
+    dauer = time.perf_counter() - start
+
+    tracemalloc.start()
+    parse(html)
+    _, spitze = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return wiederholungen / dauer, spitze
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--wiederholungen', type=int, default=100)
+    args = parser.parse_args()
+
+    with open(FIXTURE, encoding='utf-8') as f:
+        html = f.read()
+
+    kategorisiere = lambda text: ('sonstige', [])
+    varianten = [
+        ('lxml', ErgebnisParser('https://www.kleinanzeigen.de', kategorisiere, backend='lxml').parse),
+        ('bs4', ErgebnisParser('https://www.kleinanzeigen.de', kategorisiere, backend='bs4').parse),
+        ('bs4 (alt)', parse_bs4_ganze_seite),
+    ]
+
+    print(f"Fixture: {len(html) / 1024:.0f} KiB, {args.wiederholungen} Wiederholungen")
+    for name, parse in varianten:
+        seiten_pro_s, spitze = miss(parse, html, args.wiederholungen)
+        print(f"{name:12} {seiten_pro_s:9.1f} Seiten/s  Spitze {spitze / 1024:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SQLite-Anzeigenspeicher
+==================================
+
+Misst den Durchsatz beim Speichern synthetischer Anzeigen
+(``benchmarks.korpus``) und die Latenz typischer Abfragen (Kategorie,
+Ort, Preisspanne, Volltext, kombiniert) im ``AnzeigenSpeicher``.
+
+Verwendung:
+    python -m benchmarks.bench_speicher
+    python -m benchmarks.bench_speicher --anzahl 1000000   # großer Lauf
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.korpus import erzeuge_anzeigen
+from src.speicher import AnzeigenSpeicher
+
+def miss(name, abfrage, wiederholungen=5):
+    anzahl = sum(1 for _ in abfrage())
+    start = time.perf_counter()
+    for _ in range(wiederholungen):
+        for _ in abfrage():
+            pass
+    dauer = (time.perf_counter() - start) / wiederholungen
+    print(f"  {name:<28} {dauer * 1000:9.1f} ms  ({anzahl} Treffer)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--anzahl', type=int, default=100_000)
+    parser.add_argument('--batch', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        pfad = os.path.join(verzeichnis, 'anzeigen.db')
+        with AnzeigenSpeicher(pfad, batch_groesse=args.batch) as speicher:
+            print(f"💾 Speichere {args.anzahl} Anzeigen (FTS5: {'ja' if speicher.volltext else 'nein'})...")
+            start = time.perf_counter()
+            speicher.speichere(erzeuge_anzeigen(args.anzahl))
+            dauer = time.perf_counter() - start
+            print(f"  Einfügen:   {dauer:7.1f} s  ({args.anzahl / dauer:,.0f} Anzeigen/s)")
+
+            start = time.perf_counter()
+            speicher.speichere(erzeuge_anzeigen(min(args.anzahl, 100_000)))
+            dauer = time.perf_counter() - start
+            print(f"  Upsert:     {dauer:7.1f} s  ({min(args.anzahl, 100_000) / dauer:,.0f} Anzeigen/s)")
+            print(f"  Dateigröße: {os.path.getsize(pfad) / 2 ** 20:7.1f} MiB")
+
+            print("\n🔎 Abfragen (Mittel über 5 Läufe, alle Treffer geladen):")
+            miss("Kategorie 'it'", lambda: speicher.filtere(kategorie='it'))
+            miss("Ort 'köln'", lambda: speicher.filtere(ort='köln'))
+            miss("Preis 20–50 €", lambda: speicher.filtere(min_preis=20, max_preis=50,
+                                                            ohne_preis_behalten=False))
+            miss("Volltext 'umzug'", lambda: speicher.filtere(text='umzug'))
+            miss("Kombiniert", lambda: speicher.filtere(kategorie='it', ort='berlin', max_preis=50,
+                                                        text='computer'))
+            miss("Top 20 Volltext", lambda: speicher.suche('computer hilfe', limit=20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Kaltstart
+====================
+
+Misst die Startzeit kurzlebiger Aufrufe (``import src``, Scraper-Import,
+``kleinanzeigen --help``) als Aufschlag auf den reinen
+Interpreterstart und wertet ``-X importtime`` aus: die teuersten
+Importe und schwere Module, die beim Start nicht geladen werden dürfen
+(requests, bs4, lxml, sqlite3, asyncio, tkinter).
+
+Exit-Code 1, wenn ein verbotenes Modul geladen wird oder ein Aufschlag
+``--max-aufschlag`` Millisekunden überschreitet.
+
+Verwendung:
+    python -m benchmarks.bench_start --laeufe 20 --max-aufschlag 50
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+WURZEL = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Name -> Argumente nach dem Interpreter
+AUFRUFE = {
+    'interpreter': ['-c', 'pass'],
+    'import src': ['-c', 'import src'],
+    'import scraper': ['-c', 'import src.kleinanzeigen_scraper'],
+    'cli --help': ['-m', 'src.cli', '--help'],
+    'export --help': ['-m', 'src.export', '--help'],
+}
+# Diese Module gehören erst zur ersten Anfrage, zum Parsen, Speichern oder zur GUI
+VERBOTEN = ('requests', 'bs4', 'lxml', 'sqlite3', 'asyncio', 'tkinter', 'concurrent.futures')
+
+
+def starte(argumente: List[str], importtime=False) -> Tuple[float, str]:
+    """Startet den Interpreter einmal; liefert Dauer in Sekunden und stderr"""
+    befehl = [sys.executable] + (['-X', 'importtime'] if importtime else []) + argumente
+    start = time.perf_counter()
+    ergebnis = subprocess.run(befehl, cwd=WURZEL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                              universal_newlines=True, check=True)
+    return time.perf_counter() - start, ergebnis.stderr
+
+
+def werte_importtime_aus(ausgabe: str) -> Dict[str, Tuple[int, int]]:
+    """``-X importtime``-Ausgabe -> {modul: (eigene µs, kumulierte µs)}"""
+    module = {}
+    for zeile in ausgabe.splitlines():
+        if not zeile.startswith('import time:') or 'self [us]' in zeile:
+            continue
+        eigen, kumuliert, name = zeile[len('import time:'):].split('|')
+        module[name.strip()] = (int(eigen), int(kumuliert))
+    return module
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--laeufe', type=int, default=10, help="Starts pro Aufruf (Median)")
+    parser.add_argument('--top', type=int, default=8, help="Teuerste Importe pro Aufruf")
+    parser.add_argument('--max-aufschlag', type=float, help="Höchster Aufschlag auf den Interpreterstart in ms")
+    args = parser.parse_args(argv)
+
+    basis_module = set(werte_importtime_aus(starte(AUFRUFE['interpreter'], importtime=True)[1]))
+    zeiten = {}
+    probleme = []
+    print(f"🚀 Kaltstart, Median aus {args.laeufe} Läufen ({sys.executable})\n")
+    for name, argumente in AUFRUFE.items():
+        starte(argumente)  # Bytecode-Cache anlegen
+        zeiten[name] = statistics.median(starte(argumente)[0] for _ in range(args.laeufe))
+        aufschlag = (zeiten[name] - zeiten['interpreter']) * 1000
+        print(f"{name:16} {zeiten[name] * 1000:7.1f} ms" +
+              (f"  ({aufschlag:+.1f} ms)" if name != 'interpreter' else ""))
+        if name == 'interpreter':
+            continue
+
+        module = werte_importtime_aus(starte(argumente, importtime=True)[1])
+        eigene = {modul: werte for modul, werte in module.items() if modul not in basis_module}
+        for modul, (eigen, _) in sorted(eigene.items(), key=lambda eintrag: -eintrag[1][0])[:args.top]:
+            print(f"    {eigen / 1000:6.1f} ms  {modul}")
+        geladen = sorted(modul for modul in VERBOTEN if modul in eigene)
+        if geladen:
+            probleme.append(f"{name}: lädt {', '.join(geladen)}")
+        if args.max_aufschlag is not None and aufschlag > args.max_aufschlag:
+            probleme.append(f"{name}: +{aufschlag:.1f} ms > {args.max_aufschlag:.0f} ms")
+
+    if probleme:
+        print("\n❌ " + "\n❌ ".join(probleme))
+        return 1
+    print("\n✅ Keine schweren Importe beim Start")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
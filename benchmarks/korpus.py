@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Synthetischer Anzeigen-Korpus
+=============================
+
+Erzeugt reproduzierbare (``seed``) ``DienstleistungsAnzeige``-Datensätze
+und Suchergebnisseiten im Kleinanzeigen-Markup für Benchmarks.
+
+Titel und Beschreibungen enthalten die Keywords der Standardkategorien
+in wechselnden Formen, Orte, Preise und Datumsangaben folgen den
+Formaten der echten Seiten. Ein kleiner Anteil sind erneut eingestellte
+Anzeigen mit leicht geändertem Text.
+
+Verwendung:
+    from benchmarks.korpus import GROESSEN, erzeuge_anzeigen, erzeuge_ergebnisseite
+    anzeigen = list(erzeuge_anzeigen(GROESSEN['100k'], seed=42))
+"""
+
+import html
+import random
+import re
+from typing import Iterator, List, Optional
+
+from src.kleinanzeigen_scraper import DienstleistungsAnzeige
+
+GROESSEN = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+ANZEIGEN_PRO_SEITE = 25
+
+TITEL = {
+    'handwerk': ['Handwerker für alle Reparaturen', 'Renovierung vom Profi', 'Installation von Lampen und Steckdosen',
+                 'Reparatur von Türen und Fenstern', 'Handwerker übernimmt Renovierung Ihrer Wohnung'],
+    'reinigung': ['Reinigung von Wohnungen und Büros', 'Putzen mit Erfahrung', 'Haushaltsreinigung wöchentlich',
+                  'Fensterputzen und Reinigung'],
+    'garten': ['Gartenarbeit aller Art', 'Rasenmähen und Heckenschnitt', 'Gartenpflege & Heckenschnitt',
+               'Hilfe im Garten gesucht?'],
+    'transport': ['Umzug mit Transporter', 'Transport und Lieferung', 'Kurierdienst in der Stadt',
+                  'Umzugshelfer für Ihren Umzug'],
+    'betreuung': ['Babysitter mit Erfahrung', 'Kinderbetreuung am Nachmittag', 'Tiersitting für Hund und Katze'],
+    'unterricht': ['Nachhilfe in Mathe und Physik', 'Unterricht für Gitarre', 'Coaching für Bewerbungen',
+                   'Personal Training im Park'],
+    'beauty': ['Friseur kommt zu Ihnen', 'Kosmetik und Pflege', 'Massage zum Entspannen', 'Wellness für zu Hause'],
+    'it': ['Computer Hilfe vor Ort', 'Programmierung von Apps', 'Website erstellen lassen', 'Technik Support'],
+    'sonstige': ['Biete Hilfe im Alltag', 'Fotograf für Events', 'Hochzeitsplanung', 'Schlüsseldienst 24h'],
+}
+LEISTUNGEN = {
+    'handwerk': ['Trockenbau', 'Malerarbeiten', 'Fliesen legen', 'Laminat verlegen', 'Möbelmontage', 'Türen einstellen',
+                 'Silikonfugen erneuern', 'Wasserhahn tauschen', 'Lampen anschließen', 'Tapezieren'],
+    'reinigung': ['Grundreinigung', 'Fenster', 'Treppenhaus', 'Büro', 'Endreinigung nach Umzug', 'Küche und Bad',
+                  'Polster', 'Teppich', 'Backofen', 'Balkon'],
+    'garten': ['Rasen mähen', 'Hecke schneiden', 'Laub entfernen', 'Beete anlegen', 'Bäume fällen', 'Zaun streichen',
+               'Pflaster reinigen', 'Grünschnitt entsorgen', 'Bewässerung', 'Winterdienst'],
+    'transport': ['Möbeltransport', 'Sperrmüll', 'Entrümpelung', 'Klaviertransport', 'Waschmaschine', 'Kartons',
+                  'Einlagerung', 'Halteverbotszone', 'Küchenabbau', 'Fahrten ins Ausland'],
+    'betreuung': ['Hausaufgaben', 'Abholung von der Kita', 'Gassi gehen', 'Katzen füttern', 'Abends und am Wochenende',
+                  'Ferienbetreuung', 'Seniorenbegleitung', 'Spielen und Basteln'],
+    'unterricht': ['Mathematik', 'Englisch', 'Deutsch', 'Chemie', 'Abiturvorbereitung', 'Prüfungstraining',
+                   'Klavier', 'Schlagzeug', 'Fitness', 'Bewerbungstraining'],
+    'beauty': ['Haare schneiden', 'Färben', 'Maniküre', 'Pediküre', 'Gesichtsbehandlung', 'Rückenmassage',
+               'Make-up', 'Wimpern', 'Augenbrauen', 'Hochsteckfrisur'],
+    'it': ['PC einrichten', 'WLAN', 'Drucker', 'Datenrettung', 'Virenentfernung', 'WordPress', 'Onlineshop',
+           'Python', 'Smartphone', 'Netzwerk'],
+    'sonstige': ['Hochzeiten', 'Geburtstage', 'Behördengänge', 'Übersetzungen', 'Einkäufe', 'Hausmeisterdienste',
+                 'Schlüssel', 'Fotos', 'Reisebegleitung', 'Beratung'],
+}
+VORNAMEN = ['Anna', 'Ben', 'Carla', 'Deniz', 'Emil', 'Fatma', 'Gregor', 'Hanna', 'Ivan', 'Jana', 'Kemal', 'Lea',
+            'Mats', 'Nora', 'Olga', 'Paul', 'Rita', 'Sven', 'Tina', 'Yusuf']
+SAETZE = [
+    'Zuverlässig, pünktlich und mit langjähriger Erfahrung.',
+    'Termine nach Vereinbarung, auch am Wochenende möglich.',
+    'Faire Preise, kostenlose Besichtigung vor Ort.',
+    'Schnell und sauber, Referenzen auf Anfrage.',
+    'Anfahrt im Stadtgebiet inklusive.',
+    'Bitte per Nachricht melden, ich antworte zeitnah.',
+    'Auch kurzfristig verfügbar.',
+    'Eigenes Werkzeug und Material vorhanden.',
+    'Kostenloser Kostenvoranschlag.',
+    'Barzahlung oder Überweisung.',
+    'Rechnung mit ausgewiesener MwSt.',
+    'Bei Fragen einfach anrufen.',
+    'Gerne auch Großaufträge.',
+    'Kleine Aufträge sind kein Problem.',
+]
+VORSTELLUNGEN = [
+    'Ich bin {name} und biete seit {jahre} Jahren',
+    'Hallo, mein Name ist {name}. Ich übernehme',
+    '{name} hier – {jahre} Jahre Erfahrung mit',
+    'Unser Team ({jahre} Mitarbeiter) erledigt',
+    'Biete zuverlässig',
+]
+ORTE = [('10115', 'Berlin'), ('20095', 'Hamburg'), ('80331', 'München'), ('50667', 'Köln'),
+        ('60311', 'Frankfurt am Main'), ('70173', 'Stuttgart'), ('40213', 'Düsseldorf'), ('04109', 'Leipzig'),
+        ('44135', 'Dortmund'), ('45127', 'Essen'), ('28195', 'Bremen'), ('01067', 'Dresden'),
+        ('30159', 'Hannover'), ('90402', 'Nürnberg'), ('14467', 'Potsdam'), ('24103', 'Kiel')]
+STADTTEILE = ['Mitte', 'Nord', 'Süd', 'Altstadt', 'Neustadt', 'West', 'Ost']
+PREISE = ['{b} €', '{b} € VB', '{b} €/h', '{b} € pro Stunde', 'ab {b} €', 'VB', 'Auf Anfrage',
+          'Zu verschenken', None]
+DATEN = ['Heute, {h:02d}:{m:02d}', 'Gestern, {h:02d}:{m:02d}', '{t:02d}.{mo:02d}.2025']
+
+_SLUG = re.compile(r'[^a-z0-9äöüß]+')
+
+
+def _preis(zufall):
+    vorlage = zufall.choice(PREISE)
+    if vorlage is None or '{b}' not in vorlage:
+        return vorlage
+    betrag = zufall.choice((15, 20, 25, 30, 35, 40, 45, 50, 60, 80, 120, 250, 400, 1200))
+    return vorlage.format(b=f"{betrag:,}".replace(',', '.'))
+
+
+def _abwandlung(zufall, anzeige: DienstleistungsAnzeige, nummer):
+    """Erneut eingestellte Anzeige: gleicher Text mit kleiner Änderung, neue URL"""
+    beschreibung = anzeige.roher_wert('beschreibung')
+    aenderung = zufall.choice((
+        lambda text: 'NEU: ' + text,
+        lambda text: text + ' ' + zufall.choice(SAETZE),
+        lambda text: text.replace('.', '!', 1),
+    ))
+    return DienstleistungsAnzeige(
+        titel=anzeige.titel, beschreibung=aenderung(beschreibung), preis=_preis(zufall), ort=anzeige.ort,
+        kategorie=anzeige.kategorie, kontakt=anzeige.roher_wert('kontakt'),
+        url=f"https://www.kleinanzeigen.de/s-anzeige/{_SLUG.sub('-', anzeige.titel.lower()).strip('-')}/"
+            f"{3_000_000_000 + nummer}-297-3331",
+        datum=anzeige.datum, tags=list(anzeige.tags))
+
+
+def erzeuge_anzeigen(anzahl, seed=42, duplikat_anteil=0.05, start=0) -> Iterator[DienstleistungsAnzeige]:
+    """
+    Erzeugt ``anzahl`` Anzeigen; gleiche Argumente liefern gleiche Anzeigen
+
+    Args:
+        duplikat_anteil: Anteil erneut eingestellter, leicht geänderter Anzeigen
+        start: Erste laufende Nummer (für URLs und IDs)
+    """
+    zufall = random.Random(seed)
+    kategorien = list(TITEL)
+    letzte: List[DienstleistungsAnzeige] = []
+    for nummer in range(start, start + anzahl):
+        if letzte and zufall.random() < duplikat_anteil:
+            anzeige = _abwandlung(zufall, zufall.choice(letzte), nummer)
+        else:
+            kategorie = zufall.choice(kategorien)
+            titel = zufall.choice(TITEL[kategorie])
+            if zufall.random() < 0.3:
+                titel = f"{titel} in {zufall.choice(ORTE)[1]}"
+            leistungen = ', '.join(zufall.sample(LEISTUNGEN[kategorie], zufall.randint(2, 5)))
+            vorstellung = zufall.choice(VORSTELLUNGEN).format(name=zufall.choice(VORNAMEN),
+                                                              jahre=zufall.randint(2, 30))
+            beschreibung = (f"{titel}. {vorstellung}: {leistungen}. "
+                            + ' '.join(zufall.sample(SAETZE, zufall.randint(1, 3))))
+            plz, stadt = zufall.choice(ORTE)
+            ort = f"{plz} {stadt}" if zufall.random() < 0.6 else f"{plz} {stadt} {zufall.choice(STADTTEILE)}"
+            datum = zufall.choice(DATEN).format(h=zufall.randrange(24), m=zufall.randrange(60),
+                                                t=zufall.randint(1, 28), mo=zufall.randint(1, 12))
+            anzeige = DienstleistungsAnzeige(
+                titel=titel, beschreibung=beschreibung, preis=_preis(zufall), ort=ort, kategorie=kategorie,
+                kontakt="Siehe Anzeige",
+                url=f"https://www.kleinanzeigen.de/s-anzeige/{_SLUG.sub('-', titel.lower()).strip('-')}/"
+                    f"{2_800_000_000 + nummer}-297-3331",
+                datum=datum, tags=[kategorie])
+        # Kleiner Ringpuffer als Vorlage für Duplikate
+        if len(letzte) < 1000:
+            letzte.append(anzeige)
+        else:
+            letzte[nummer % 1000] = anzeige
+        yield anzeige
+
+
+ARTIKEL_VORLAGE = """
+      <li class="ad-listitem lazyload-item">
+        <article class="aditem" data-adid="{id}" data-href="{pfad}">
+          <div class="aditem-image">
+            <a href="{pfad}" tabindex="-1">
+              <div class="imagebox srpimagebox" data-imgsrc="https://img.kleinanzeigen.de/api/v1/prod-ads/images/{bild}/{id}?rule=$_2.JPG" data-imgtitle="{titel}"></div>
+            </a>
+          </div>
+          <div class="aditem-main">
+            <div class="aditem-main--top">
+              <div class="aditem-main--top--left">
+                <i class="icon icon-small icon-pin-gray"></i> {ort}
+              </div>
+              <div class="aditem-main--top--right">
+                <i class="icon icon-small icon-calendar-open"></i>
+                {datum}
+              </div>
+            </div>
+            <div class="aditem-main--middle">
+              <h2 class="text-module-begin">
+                <a class="ellipsis" href="{pfad}">{titel}</a>
+              </h2>
+              <p class="aditem-main--middle--description">{beschreibung}</p>
+              <div class="aditem-main--middle--price-shipping">
+                <p class="aditem-main--middle--price-shipping--price">
+                  {preis}
+                </p>
+              </div>
+            </div>
+            <div class="aditem-main--bottom">
+              <p class="text-module-end">
+                <span class="simpletag">Dienstleistungen</span>
+              </p>
+            </div>
+          </div>
+        </article>
+      </li>"""
+
+
+def erzeuge_ergebnisseite(anzeigen: List[DienstleistungsAnzeige], titel="Dienstleistungen") -> str:
+    """Baut eine Suchergebnisseite mit Kopf, Navigation und Skripten wie auf der echten Seite"""
+    artikel = []
+    for anzeige in anzeigen:
+        pfad = anzeige.url.split('kleinanzeigen.de', 1)[-1]
+        anzeige_id = pfad.rstrip('/').rsplit('/', 1)[-1].split('-')[0]
+        artikel.append(ARTIKEL_VORLAGE.format(
+            id=anzeige_id, pfad=html.escape(pfad), bild=anzeige_id[-2:], titel=html.escape(anzeige.titel),
+            ort=html.escape(anzeige.ort), datum=anzeige.datum or '',
+            beschreibung=html.escape(anzeige.roher_wert('beschreibung')), preis=html.escape(anzeige.preis or '')))
+    zustand = ''.join(
+        f'      window.__INITIAL_STATE__.k{i} = {{"id": {i}, "name": "kategorie-{i}", "count": {i * 37 % 9973}}};\n'
+        for i in range(80))
+    navigation = ''.join(f'<li><a href="/s-kategorie-{i}/c{i}">Kategorie {i}</a></li>' for i in range(60))
+    return (
+        '<!DOCTYPE html>\n<html lang="de">\n  <head>\n    <meta charset="utf-8">\n'
+        f'    <title>{html.escape(titel)} | kleinanzeigen.de</title>\n'
+        f'    <script>\n      window.__INITIAL_STATE__ = {{}};\n{zustand}    </script>\n  </head>\n  <body>\n'
+        f'    <header><nav><ul>{navigation}</ul></nav></header>\n'
+        '    <div id="site-content">\n'
+        f'      <ul id="srchrslt-adtable" class="itemlist">{"".join(artikel)}\n      </ul>\n'
+        '    </div>\n    <footer>Footer</footer>\n  </body>\n</html>\n'
+    )
+
+
+def erzeuge_seiten(anzahl_seiten, seed=42, pro_seite=ANZEIGEN_PRO_SEITE,
+                   anzeigen: Optional[List[DienstleistungsAnzeige]] = None) -> List[bytes]:
+    """Erzeugt Suchergebnisseiten als UTF-8-Bytes (wie vom Abruf geliefert)"""
+    if anzeigen is None:
+        anzeigen = list(erzeuge_anzeigen(anzahl_seiten * pro_seite, seed))
+    return [erzeuge_ergebnisseite(anzeigen[i:i + pro_seite]).encode('utf-8')
+            for i in range(0, min(len(anzeigen), anzahl_seiten * pro_seite), pro_seite)]
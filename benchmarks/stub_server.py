@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Lokaler Stub-Server für Benchmarks
+==================================
+
+Liefert synthetische Suchergebnis- und Detailseiten im
+Kleinanzeigen-Format mit einstellbarer Antwortzeit aus. Für Benchmarks ohne Internetverbindung.
+"""
+
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ANZEIGEN_PRO_SEITE = 25
+
+ANZEIGE_VORLAGE = """
+<li class="ad-listitem">
+  <article class="aditem" data-adid="{id}" data-href="/s-anzeige/dienstleistung-{id}/{id}-297-3331">
+    <div class="aditem-main">
+      <div class="aditem-main--top">
+        <div class="aditem-main--top--left">10115 Berlin</div>
+        <div class="aditem-main--top--right">Heute, 12:00</div>
+      </div>
+      <div class="aditem-main--middle">
+        <h2 class="text-module-begin"><a class="ellipsis" href="/s-anzeige/dienstleistung-{id}/{id}-297-3331">Handwerker für Reparatur Nr. {id}</a></h2>
+        <p class="aditem-main--middle--description">Erfahrener Handwerker bietet Reparaturen und Renovierung aller Art.</p>
+        <div class="aditem-main--middle--price-shipping">
+          <p class="aditem-main--middle--price-shipping--price">{preis} € VB</p>
+        </div>
+      </div>
+    </div>
+  </article>
+</li>"""
+
+
+def erzeuge_ergebnisseite(seite, anzahl=ANZEIGEN_PRO_SEITE):
+    """Erzeugt eine Suchergebnisseite mit ``anzahl`` Anzeigen"""
+    eintraege = "".join(
+        ANZEIGE_VORLAGE.format(id=seite * 1000 + i, preis=20 + i)
+        for i in range(anzahl)
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>Suche</title></head><body>"
+        "<header><nav>Navigation</nav></header>"
+        f'<ul id="srchrslt-adtable" class="itemlist">{eintraege}</ul>'
+        "<footer>Footer</footer></body></html>"
+    )
+
+
+def erzeuge_detailseite(anzeige_id):
+    """Erzeugt die Detailseite einer Anzeige mit Beschreibung und Kontakt"""
+    return (
+        "<!DOCTYPE html><html><head><title>Anzeige</title></head><body>"
+        f'<h1 id="viewad-title">Handwerker für Reparatur Nr. {anzeige_id}</h1>'
+        '<p id="viewad-description-text">Erfahrener Handwerker bietet Reparaturen und Renovierung '
+        'aller Art.<br>Termine auch am Wochenende, Anfahrt im Stadtgebiet inklusive.</p>'
+        f'<div id="viewad-contact"><span class="userprofile-vip">Meister {anzeige_id}</span></div>'
+        "</body></html>"
+    )
+
+
+class StubServer:
+    """
+    HTTP-Server im Hintergrund-Thread mit künstlicher Latenz
+
+    Args:
+        letzte_anzahl: Anzeigen auf der letzten Seite (Standard: volle Seite)
+        keep_alive: HTTP/1.1 mit offenen Verbindungen statt HTTP/1.0
+    """
+
+    def __init__(self, latenz=0.05, seiten=5, letzte_anzahl=ANZEIGEN_PRO_SEITE, keep_alive=False):
+        self.latenz = latenz
+        self.seiten = seiten
+        self.letzte_anzahl = letzte_anzahl
+        self.anfragen = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1' if keep_alive else 'HTTP/1.0'
+
+            def do_GET(self):
+                server.anfragen += 1
+                time.sleep(server.latenz)
+                if self.path == '/robots.txt':
+                    body = b"User-agent: *\nAllow: /\n"
+                elif self.path.startswith('/s-anzeige/'):
+                    body = erzeuge_detailseite(self.path.rstrip('/').rsplit('/', 1)[-1].split('-')[0]).encode('utf-8')
+                else:
+                    treffer = re.search(r'seite:(\d+)', self.path)
+                    seite = int(treffer.group(1)) if treffer else 1
+                    if seite < server.seiten:
+                        anzahl = ANZEIGEN_PRO_SEITE
+                    else:
+                        anzahl = server.letzte_anzahl if seite == server.seiten else 0
+                    body = erzeuge_ergebnisseite(seite, anzahl).encode('utf-8')
+                etag = f'"{zlib.crc32(body):08x}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
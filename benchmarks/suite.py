@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Benchmark-Suite
+===============
+
+Misst Kategorisierung, Filter, Parsen, Export, Duplikaterkennung und
+das Einfügen in die GUI-Ergebnisliste auf einem synthetischen Korpus
+(``korpus.py``) fester Größe. Die Ergebnisse werden als JSON
+geschrieben und lassen sich mit einem früheren Lauf vergleichen.
+
+Verwendung:
+    python -m benchmarks.suite --groesse 100k --ausgabe neu.json
+    python -m benchmarks.suite --groesse 1k --nur 'filter/*' 'export/*'
+    python -m benchmarks.suite --groesse 100k --vergleiche alt.json
+
+Bei ``--vergleiche`` ist der Exit-Code 1, wenn ein Benchmark im Median
+um mehr als ``--toleranz`` langsamer geworden ist.
+"""
+
+import argparse
+import fnmatch
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from itertools import cycle, islice
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.korpus import ANZEIGEN_PRO_SEITE, GROESSEN, erzeuge_anzeigen, erzeuge_seiten
+from src.kleinanzeigen_scraper import KleinanzeigenScraper
+from src.ortsindex import OrtsIndex
+from src.preise import PreisIndex
+
+FORMAT_VERSION = 1
+# Verschiedene Seiten für den Parse-Benchmark; größere Korpora wiederholen sie
+MAX_SEITEN_VORRAT = 100
+
+
+class Uebersprungen(Exception):
+    """Benchmark kann in dieser Umgebung nicht laufen (z. B. fehlende Abhängigkeit)"""
+
+
+class Korpus:
+    """Erzeugt Anzeigen und Seiten einmal pro Lauf der Suite"""
+
+    def __init__(self, anzahl, seed=42):
+        self.anzahl = anzahl
+        self.seed = seed
+        self._anzeigen = None
+        self._seiten = None
+
+    @property
+    def anzeigen(self) -> list:
+        if self._anzeigen is None:
+            self._anzeigen = list(erzeuge_anzeigen(self.anzahl, self.seed))
+        return self._anzeigen
+
+    @property
+    def seiten(self) -> List[bytes]:
+        """Vorrat verschiedener Ergebnisseiten"""
+        if self._seiten is None:
+            anzahl = min(MAX_SEITEN_VORRAT, max(1, self.anzahl // ANZEIGEN_PRO_SEITE))
+            self._seiten = erzeuge_seiten(anzahl, self.seed, anzeigen=self.anzeigen)
+        return self._seiten
+
+    @property
+    def anzahl_seiten(self):
+        return max(1, self.anzahl // ANZEIGEN_PRO_SEITE)
+
+
+@dataclass
+class Ergebnis:
+    einheit: str
+    einheiten: int = 0
+    laeufe_s: List[float] = field(default_factory=list)
+    uebersprungen: Optional[str] = None
+
+    @property
+    def median_s(self):
+        return statistics.median(self.laeufe_s) if self.laeufe_s else None
+
+    @property
+    def bester_s(self):
+        return min(self.laeufe_s) if self.laeufe_s else None
+
+    def als_dict(self):
+        daten = asdict(self)
+        if self.laeufe_s:
+            daten.update(median_s=self.median_s, bester_s=self.bester_s,
+                         pro_sekunde=self.einheiten / self.median_s if self.median_s else None)
+        return daten
+
+
+# Name -> (Einheit, Vorbereitung); die Vorbereitung liefert den gemessenen Lauf
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name, einheit='anzeigen'):
+    """
+    Registriert einen Benchmark
+
+    Die Funktion bekommt den ``Korpus`` und liefert ein Callable ohne
+    Argumente, das gemessen wird und die Anzahl verarbeiteter Einheiten
+    zurückgibt. Sie wird vor jedem Lauf erneut aufgerufen, sodass
+    Vorbereitung (Kopien, Indizes) nicht in die Messung eingeht.
+    """
+    def registriere(funktion):
+        BENCHMARKS[name] = (einheit, funktion)
+        return funktion
+    return registriere
+
+
+# Kategorisierung
+
+@benchmark('kategorisieren/einzeln')
+def _kategorisieren_einzeln(korpus):
+    scraper = KleinanzeigenScraper()
+    texte = [f"{a.titel} {a.roher_wert('beschreibung')}" for a in korpus.anzeigen]
+
+    def lauf():
+        for text in texte:
+            scraper.bestimme_kategorie(text)
+        return len(texte)
+    return lauf
+
+
+@benchmark('kategorisieren/batch')
+def _kategorisieren_batch(korpus):
+    scraper = KleinanzeigenScraper()
+    return lambda: len(scraper.kategorisiere_anzeigen(korpus.anzeigen))
+
+
+# Filter
+
+def _filter_lauf(anzeigen, filtere):
+    def lauf():
+        filtere(anzeigen)
+        return len(anzeigen)
+    return lauf
+
+
+@benchmark('filter/kategorie')
+def _filter_kategorie(korpus):
+    scraper = KleinanzeigenScraper()
+    return _filter_lauf(korpus.anzeigen, lambda anzeigen: scraper.filtere_nach_kategorie(anzeigen, 'handwerk'))
+
+
+@benchmark('filter/ort')
+def _filter_ort(korpus):
+    scraper = KleinanzeigenScraper()
+    index = OrtsIndex(korpus.anzeigen)
+    return _filter_lauf(korpus.anzeigen, lambda anzeigen: scraper.filtere_nach_ort(index, 'berlin'))
+
+
+@benchmark('filter/ort_liste')
+def _filter_ort_liste(korpus):
+    scraper = KleinanzeigenScraper()
+    return _filter_lauf(korpus.anzeigen, lambda anzeigen: scraper.filtere_nach_ort(anzeigen, 'berlin'))
+
+
+@benchmark('filter/preisspanne')
+def _filter_preis(korpus):
+    scraper = KleinanzeigenScraper()
+    index = PreisIndex(korpus.anzeigen)
+    return _filter_lauf(korpus.anzeigen, lambda anzeigen: scraper.filtere_nach_preisspanne(index, 20, 60))
+
+
+@benchmark('filter/preisspanne_liste')
+def _filter_preis_liste(korpus):
+    scraper = KleinanzeigenScraper()
+    return _filter_lauf(korpus.anzeigen, lambda anzeigen: scraper.filtere_nach_preisspanne(anzeigen, 20, 60))
+
+
+@benchmark('filter/abfrage_kombiniert')
+def _filter_abfrage(korpus):
+    scraper = KleinanzeigenScraper()
+    return _filter_lauf(korpus.anzeigen, lambda anzeigen: scraper.abfrage(anzeigen).kategorie('it')
+                        .ort('berlin').preis(max=60).anzahl())
+
+
+# Parsen
+
+def _parse_lauf(korpus, backend):
+    try:
+        from src.ergebnis_parser import ErgebnisParser
+        parser = ErgebnisParser('https://www.kleinanzeigen.de', KleinanzeigenScraper().kategorisierer.finde,
+                                backend=backend)
+    except ImportError as e:
+        raise Uebersprungen(str(e))
+    seiten = korpus.seiten
+    parser.parse(seiten[0])  # Aufwärmen
+
+    def lauf():
+        for seite in islice(cycle(seiten), korpus.anzahl_seiten):
+            parser.parse(seite)
+        return korpus.anzahl_seiten
+    return lauf
+
+
+@benchmark('parsen/lxml', einheit='seiten')
+def _parsen_lxml(korpus):
+    return _parse_lauf(korpus, 'lxml')
+
+
+@benchmark('parsen/bs4', einheit='seiten')
+def _parsen_bs4(korpus):
+    return _parse_lauf(korpus, 'bs4')
+
+
+# Export
+
+def _export_lauf(korpus, format):
+    from src.export import exportiere
+
+    if format == 'parquet':
+        if importlib.util.find_spec('pyarrow') is None:
+            raise Uebersprungen("pyarrow nicht installiert")
+    verzeichnis = tempfile.mkdtemp(prefix='kleinanzeigen-bench-')
+    pfad = os.path.join(verzeichnis, f'export.{format}')
+
+    def lauf():
+        try:
+            return exportiere(korpus.anzeigen, pfad, format=format)
+        finally:
+            os.remove(pfad)
+            os.rmdir(verzeichnis)
+    return lauf
+
+
+for _format in ('csv', 'jsonl', 'json', 'txt', 'parquet'):
+    benchmark(f'export/{_format}')(lambda korpus, format=_format: _export_lauf(korpus, format))
+
+
+# Duplikate
+
+@benchmark('duplikate/index')
+def _duplikate(korpus):
+    from src.duplikate import DuplikatIndex
+    index = DuplikatIndex()
+    return lambda: len(index.hinzufuegen_viele(korpus.anzeigen))
+
+
+# GUI
+
+@benchmark('gui/einfuegen', einheit='zeilen')
+def _gui_einfuegen(korpus):
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+    except Exception as e:  # kein tkinter oder kein Display
+        raise Uebersprungen(f"Tk nicht verfügbar: {e}")
+    from src.ergebnis_ansicht import ErgebnisAnsicht
+
+    root.withdraw()
+    tree = ttk.Treeview(root, columns=('titel', 'preis', 'ort', 'kategorie'), show='headings', height=20)
+    tree.pack()
+    ansicht = ErgebnisAnsicht(tree)
+    zeilen = [(a.titel, a.preis or "", a.ort, a.kategorie) for a in korpus.anzeigen]
+
+    def lauf():
+        try:
+            ansicht.hinzufuegen(zeilen)
+            while ansicht.laedt:
+                root.update()
+            root.update()
+            return len(ansicht)
+        finally:
+            root.destroy()
+    return lauf
+
+
+# Ablauf
+
+def fuehre_aus(korpus: Korpus, muster: List[str], wiederholungen=3,
+               melde: Callable[[str, Ergebnis], None] = lambda name, ergebnis: None) -> Dict[str, Ergebnis]:
+    """Führt alle Benchmarks aus, deren Name auf eines der ``muster`` passt"""
+    ergebnisse = {}
+    for name, (einheit, vorbereitung) in BENCHMARKS.items():
+        if not any(fnmatch.fnmatch(name, m) for m in muster):
+            continue
+        ergebnis = Ergebnis(einheit)
+        try:
+            for _ in range(wiederholungen):
+                lauf = vorbereitung(korpus)
+                start = time.perf_counter()
+                ergebnis.einheiten = lauf()
+                ergebnis.laeufe_s.append(time.perf_counter() - start)
+        except Uebersprungen as e:
+            ergebnis.uebersprungen = str(e)
+        ergebnisse[name] = ergebnis
+        melde(name, ergebnis)
+    return ergebnisse
+
+
+def umgebung() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    return {
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'plattform': platform.platform(),
+        'cpu_kerne': os.cpu_count(),
+        'zeitpunkt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def vergleiche(alt: dict, neu: dict, toleranz) -> List[str]:
+    """Druckt Median-Verhältnisse; liefert die Namen langsamer gewordener Benchmarks"""
+    langsamer = []
+    print(f"\n📊 Vergleich mit {alt['umgebung'].get('commit') or 'Basis'} "
+          f"({alt['korpus']['groesse']}, Toleranz {toleranz:.0%}):")
+    for name, ergebnis in neu['ergebnisse'].items():
+        basis = alt['ergebnisse'].get(name)
+        if not basis or not basis.get('median_s') or not ergebnis.get('median_s'):
+            continue
+        faktor = ergebnis['median_s'] / basis['median_s']
+        markierung = ''
+        if faktor > 1 + toleranz:
+            markierung = '  ⚠️ langsamer'
+            langsamer.append(name)
+        elif faktor < 1 / (1 + toleranz):
+            markierung = '  🚀 schneller'
+        print(f"  {name:36} {basis['median_s'] * 1000:10.1f} ms → {ergebnis['median_s'] * 1000:10.1f} ms"
+              f"  {faktor:5.2f}x{markierung}")
+    return langsamer
+
+
+def _zeige(name, ergebnis: Ergebnis):
+    if ergebnis.uebersprungen:
+        print(f"  {name:36} übersprungen: {ergebnis.uebersprungen}")
+    else:
+        rate = ergebnis.einheiten / ergebnis.median_s if ergebnis.median_s else float('inf')
+        print(f"  {name:36} {ergebnis.median_s * 1000:10.1f} ms  {rate:14,.0f} {ergebnis.einheit}/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--groesse', choices=GROESSEN, default='1k')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--wiederholungen', type=int, default=3)
+    parser.add_argument('--nur', nargs='+', default=['*'], metavar='MUSTER',
+                        help="Nur Benchmarks, deren Name passt (z. B. 'filter/*')")
+    parser.add_argument('--ausgabe', help="JSON-Datei für die Ergebnisse")
+    parser.add_argument('--vergleiche', metavar='JSON', help="Früheres Ergebnis zum Vergleich")
+    parser.add_argument('--toleranz', type=float, default=0.1, help="Erlaubte Verlangsamung (0.1 = 10 %%)")
+    parser.add_argument('--liste', action='store_true', help="Nur die verfügbaren Benchmarks anzeigen")
+    args = parser.parse_args(argv)
+
+    if args.liste:
+        for name, (einheit, _) in BENCHMARKS.items():
+            print(f"{name:36} {einheit}")
+        return 0
+
+    korpus = Korpus(GROESSEN[args.groesse], args.seed)
+    start = time.perf_counter()
+    anzahl = len(korpus.anzeigen)
+    print(f"📦 Korpus {args.groesse}: {anzahl} Anzeigen in {time.perf_counter() - start:.1f} s erzeugt "
+          f"(seed {args.seed}), {args.wiederholungen} Läufe pro Benchmark\n")
+
+    ergebnisse = fuehre_aus(korpus, args.nur, args.wiederholungen, melde=_zeige)
+    bericht = {
+        'format': FORMAT_VERSION,
+        'umgebung': umgebung(),
+        'korpus': {'groesse': args.groesse, 'anzahl': anzahl, 'seed': args.seed},
+        'ergebnisse': {name: ergebnis.als_dict() for name, ergebnis in ergebnisse.items()},
+    }
+    if args.ausgabe:
+        with open(args.ausgabe, 'w', encoding='utf-8') as f:
+            json.dump(bericht, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Ergebnisse gespeichert: {args.ausgabe}")
+
+    if args.vergleiche:
+        with open(args.vergleiche, encoding='utf-8') as f:
+            alt = json.load(f)
+        if alt['korpus'] != bericht['korpus']:
+            print("⚠️ Korpus unterscheidet sich vom Vergleichslauf")
+        if vergleiche(alt, bericht, args.toleranz):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,6 +7,7 @@ Starter-Script für die grafische Benutzeroberfläche des Kleinanzeigen Scrapers
 
 Verwendung:
     python gui_starter.py
+    python gui_starter.py --profil profile   # CPU- und Speicherprofil der GUI
 
 Features:
 - Automatische Abhängigkeitsprüfung
@@ -16,35 +17,25 @@ Features:
 """
 
 import sys
-import tkinter as tk
-from tkinter import messagebox
 import importlib.util
 import subprocess
 
+# Modul, das gesucht wird -> Paketname; für tkinter die C-Erweiterung,
+# denn das reine Python-Paket ist auch ohne Tk vorhanden
+ABHAENGIGKEITEN = {
+    '_tkinter': 'tkinter',
+    'requests': 'requests',
+    'bs4': 'beautifulsoup4',
+}
+
 def check_dependencies():
-    """Prüft ob alle Abhängigkeiten verfügbar sind"""
-    missing_deps = []
-    
-    # Prüfe tkinter
-    try:
-        import tkinter
-        import tkinter.ttk
-    except ImportError:
-        missing_deps.append("tkinter")
-    
-    # Prüfe requests
-    try:
-        import requests
-    except ImportError:
-        missing_deps.append("requests")
-    
-    # Prüfe beautifulsoup4
-    try:
-        from bs4 import BeautifulSoup
-    except ImportError:
-        missing_deps.append("beautifulsoup4")
-    
-    return missing_deps
+    """
+    Prüft ob alle Abhängigkeiten verfügbar sind
+
+    Sucht die Module nur (``find_spec``), statt sie zu importieren; das
+    spart beim Start die Importzeit von requests und BeautifulSoup.
+    """
+    return [paket for modul, paket in ABHAENGIGKEITEN.items() if importlib.util.find_spec(modul) is None]
 
 def install_dependencies():
     """Versucht fehlende Abhängigkeiten zu installieren"""
@@ -56,6 +47,9 @@ def install_dependencies():
             print(f"  - {dep}")
         
         if 'tkinter' not in missing:  # Nur wenn GUI verfügbar ist
+            import tkinter as tk
+            from tkinter import messagebox
+
             root = tk.Tk()
             root.withdraw()  # Verstecke Hauptfenster
             
@@ -91,6 +85,8 @@ def install_dependencies():
 
 def show_demo_info():
     """Zeigt Demo-Informationen an"""
+    import tkinter as tk
+
     root = tk.Tk()
     root.title("Kleinanzeigen Scraper - Demo")
     root.geometry("600x400")
@@ -299,6 +295,16 @@ def main():
     """Hauptfunktion"""
     print("🔍 Kleinanzeigen Scraper - GUI Starter")
     print("=" * 50)
+
+    # --profil VERZEICHNIS: die GUI liest KLEINANZEIGEN_PROFIL beim Start
+    if '--profil' in sys.argv[1:]:
+        position = sys.argv.index('--profil')
+        if position + 1 >= len(sys.argv):
+            print("❌ --profil erwartet ein Verzeichnis")
+            return 2
+        # Als Paket, damit der Start aus jedem Verzeichnis funktioniert
+        from src.profil import aktiviere
+        aktiviere(sys.argv[position + 1])
     
     # Prüfe Python-Version
     if sys.version_info < (3, 7):
@@ -331,7 +337,7 @@ def main():
         print(f"❌ Fehler beim Starten der GUI: {e}")
         
         try:
-            import tkinter
+            from tkinter import messagebox
             messagebox.showerror(
                 "Startup-Fehler",
                 f"Fehler beim Starten der GUI:\n{str(e)}\n\n"
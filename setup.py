@@ -24,7 +24,7 @@ setup(
         "Source": "https://github.com/p3p3ee/kleinanzeigen-scraper",
         "Documentation": "https://github.com/p3p3ee/kleinanzeigen-scraper#readme",
     },
-    packages=find_packages(),
+    packages=find_packages(exclude=('benchmarks', 'benchmarks.*')),
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: End Users/Desktop",
@@ -61,11 +61,23 @@ setup(
             "pandas>=1.3.0",
             "matplotlib>=3.4.0",
         ],
+        "export": [
+            "pyarrow>=6.0.0",
+            "zstandard>=0.15.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
+        "kompression": [
+            "brotli>=1.0.9",
+            "zstandard>=0.18.0",
+        ],
     },
     entry_points={
         "console_scripts": [
             "kleinanzeigen-scraper=gui_starter:main",
             "kleinanzeigen-gui=gui_starter:main",
+            "kleinanzeigen=src.cli:main",
         ],
     },
     include_package_data=True,
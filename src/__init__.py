@@ -7,6 +7,27 @@ Ein intelligenter Scraper für Dienstleistungsanzeigen mit WhatsApp-Benachrichti
 Hauptmodule:
 - scraper_gui: Grafische Benutzeroberfläche
 - kleinanzeigen_scraper: Core Scraping-Funktionalität
+- async_scraper: Asynchroner Abruf mit Parallelitätslimit pro Host
+- rate_limiter: Adaptiver Token-Bucket pro Host
+- robots: robots.txt-Cache mit Crawl-delay
+- http_cache: HTTP-Cache für bedingte Anfragen
+- ergebnis_parser: lxml-Parser für Suchergebnisseiten
+- kategorisierung: Kompilierter Keyword-Matcher für Kategorien
+- preise: Strukturierte Preise und sortierter Preisindex
+- abfrage: Verkettbare, verzögert ausgewertete Filter
+- ortsindex: Trigramm-Index für Ortsabfragen
+- gesehen: Persistenter Speicher gesehener Anzeigen mit Bloom-Filter
+- alarme: Scheduler für gespeicherte Suchen mit gemeinsamem Abruf
+- speicher: SQLite-Anzeigenspeicher mit Indizes und Volltextsuche
+- export: Streamende Exporter (CSV, JSONL, JSON, TXT, Parquet)
+- ergebnis_ansicht: Virtualisierte Ergebnisliste für den Treeview
+- hintergrund: Suchaufträge im Hintergrund-Thread mit Fortschritt und Abbruch
+- parse_prozesse: Prozesspool für das Parsen auf mehreren Kernen
+- duplikate: Erkennung erneut eingestellter Anzeigen (MinHash-LSH)
+- metriken: Stufen-Zeiten, Zähler und Histogramme (Statistik und Prometheus)
+- profil: Profiling-Modus mit cProfile/Sampling und tracemalloc
+- cli: Headless-Kommandozeile für Suchdateien mit JSONL-Ausgabe
+- transport: HTTP-Transport mit dimensionierten Pools, optional HTTP/2
 - whatsapp_notification: WhatsApp-Benachrichtigungssystem
 
 Verwendung:
@@ -30,4 +51,25 @@ __description__ = "Intelligenter Scraper für Dienstleistungsanzeigen mit WhatsA
 __all__ = [
     "scraper_gui",
     "kleinanzeigen_scraper",
+    "async_scraper",
+    "rate_limiter",
+    "robots",
+    "http_cache",
+    "ergebnis_parser",
+    "kategorisierung",
+    "preise",
+    "abfrage",
+    "ortsindex",
+    "gesehen",
+    "alarme",
+    "speicher",
+    "export",
+    "ergebnis_ansicht",
+    "hintergrund",
+    "parse_prozesse",
+    "duplikate",
+    "metriken",
+    "profil",
+    "cli",
+    "transport",
 ]
\ No newline at end of file
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Abfragen
+================================
+
+Verkettbare, verzögert ausgewertete Filter für Anzeigen.
+
+Verwendung:
+    treffer = scraper.abfrage(anzeigen).kategorie('it').ort('berlin').preis(max=60).limit(10)
+    for anzeige in treffer:
+        ...
+
+Mit ``eindeutig()`` bleibt von mehrfach eingestellten Anzeigen nur eine
+pro Duplikat-Cluster übrig (siehe ``duplikate.py``).
+
+Die Filter werden als verkettete ``filter``-Iteratoren ausgewertet, also
+in einem Durchlauf über die Anzeigen. Anhand einer kleinen Stichprobe vom Anfang des Datenstroms wird der
+selektivste Filter zuerst geprüft. Zwischenlisten entstehen nicht, und
+mit ``limit`` endet die Auswertung, sobald genug Treffer gefunden sind.
+"""
+
+import heapq
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, List, Optional
+
+
+class _Filter:
+    """Eine Bedingung mit geschätzten relativen Kosten"""
+
+    __slots__ = ('kosten', 'praedikat')
+
+    def __init__(self, kosten, praedikat: Callable):
+        self.kosten = kosten
+        self.praedikat = praedikat
+
+
+def _preis_praedikat(unter, ober, ohne_preis_behalten):
+    def praedikat(anzeige):
+        betrag = anzeige.preis_info.betrag
+        if betrag is None:
+            return ohne_preis_behalten
+        return unter <= betrag <= ober
+    return praedikat
+
+
+class Abfrage:
+    """
+    Abfrage über einen (auch unbegrenzten) Strom von Anzeigen
+
+    Jede Filtermethode gibt die Abfrage selbst zurück, sodass Aufrufe
+    verkettet werden können. Ausgewertet wird erst beim Iterieren.
+
+    Args:
+        anzeigen: Anzeigen oder ein (auch unbegrenzter) Iterator
+        duplikate: ``DuplikatIndex`` für ``eindeutig()`` oder eine
+            Funktion, die ihn erst bei Bedarf liefert
+    """
+
+    # Anzahl Anzeigen, an denen die Selektivität geschätzt wird
+    STICHPROBE = 256
+
+    def __init__(self, anzeigen: Iterable, duplikate=None):
+        self._quelle = anzeigen
+        self._filter: List[_Filter] = []
+        self._limit: Optional[int] = None
+        self._duplikate = duplikate
+        self._eindeutig = False
+
+    def kategorie(self, kategorie):
+        """Nur Anzeigen der angegebenen Kategorie"""
+        self._filter.append(_Filter(1.0, lambda anzeige: anzeige.kategorie == kategorie))
+        return self
+
+    def ort(self, ort):
+        """Nur Anzeigen, deren Ort ``ort`` enthält (ohne Groß-/Kleinschreibung)"""
+        ort_klein = ort.lower()
+        self._filter.append(_Filter(2.0, lambda anzeige: ort_klein in anzeige.ort.lower()))
+        return self
+
+    def preis(self, min=None, max=None, ohne_preis_behalten=True):
+        """Nur Anzeigen im Preisbereich (Grenzen inklusive)"""
+        if min is None and max is None:
+            return self
+        self._filter.append(_Filter(1.5, _preis_praedikat(
+            float('-inf') if min is None else min,
+            float('inf') if max is None else max,
+            ohne_preis_behalten,
+        )))
+        return self
+
+    def wo(self, praedikat: Callable, kosten=3.0):
+        """Eigenes Prädikat hinzufügen"""
+        self._filter.append(_Filter(kosten, praedikat))
+        return self
+
+    def eindeutig(self, index=None):
+        """
+        Nur eine Anzeige pro Duplikat-Cluster (die erste Fundstelle)
+
+        Wird nach den übrigen Filtern angewendet. Ohne ``index`` wird der
+        Index der Abfrage bzw. ein neuer ``DuplikatIndex`` verwendet.
+        """
+        if index is not None:
+            self._duplikate = index
+        elif callable(self._duplikate):
+            self._duplikate = self._duplikate()
+        if self._duplikate is None:
+            try:
+                from .duplikate import DuplikatIndex
+            except ImportError:
+                from duplikate import DuplikatIndex
+            self._duplikate = DuplikatIndex()
+        self._eindeutig = True
+        return self
+
+    def limit(self, anzahl):
+        """Auswertung nach ``anzahl`` Treffern beenden"""
+        self._limit = anzahl
+        return self
+
+    def _sortiere_filter(self, stichprobe) -> List[_Filter]:
+        """Ordnet die Filter nach Kosten pro ausgeschlossener Anzeige"""
+        if len(self._filter) < 2 or not stichprobe:
+            return list(self._filter)
+
+        def rang(f):
+            durchgelassen = sum(1 for anzeige in stichprobe if f.praedikat(anzeige)) / len(stichprobe)
+            if durchgelassen >= 1.0:
+                return float('inf')
+            return f.kosten / (1.0 - durchgelassen)
+
+        return sorted(self._filter, key=rang)
+
+    def __iter__(self) -> Iterator:
+        quelle = iter(self._quelle)
+        stichprobe = list(islice(quelle, self.STICHPROBE)) if len(self._filter) > 1 else []
+        strom = chain(stichprobe, quelle)
+
+        # Selektivster Filter innen: spätere Bedingungen sehen nur seine Treffer
+        treffer = strom
+        for f in self._sortiere_filter(stichprobe):
+            treffer = filter(f.praedikat, treffer)
+
+        if self._eindeutig:
+            treffer = self._duplikate.repraesentanten(treffer)
+        if self._limit is not None:
+            treffer = islice(treffer, self._limit)
+        return treffer
+
+    def liste(self) -> List:
+        """Wertet die Abfrage aus und liefert eine Liste"""
+        return list(self)
+
+    def anzahl(self) -> int:
+        """Zählt die Treffer, ohne sie zu speichern"""
+        return sum(1 for _ in self)
+
+    def erste(self):
+        """Erster Treffer oder ``None``"""
+        return next(iter(self), None)
+
+    def top(self, k, schluessel: Callable, absteigend=False) -> List:
+        """
+        Die ``k`` besten Treffer nach ``schluessel``
+
+        Hält nur ``k`` Anzeigen im Speicher.
+        """
+        if absteigend:
+            return heapq.nlargest(k, self, key=schluessel)
+        return heapq.nsmallest(k, self, key=schluessel)
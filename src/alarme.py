@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Alarme
+==============================
+
+Scheduler für viele gespeicherte Suchen (Alarme) mit gemeinsamem Abruf.
+
+- Jeder Alarm hat Suchbegriff, Ort, Intervall und Priorität
+- Startzeiten werden über das Intervall verteilt und mit Jitter
+  versehen, damit hunderte Alarme nicht gleichzeitig feuern
+- Alarme mit derselben Suche werden zu einem Abruf zusammengelegt;
+  bald fällige Alarme derselben Suche werden mitgenommen
+- Jede Ergebnisseite wird pro Zyklus höchstens einmal geladen und an
+  alle passenden Alarme verteilt
+- Mit einem ``GesehenSpeicher`` werden jedem Alarm nur die für ihn
+  neuen Anzeigen gemeldet; finden mehrere Alarme dieselbe neue Anzeige,
+  wird jeder benachrichtigt
+- Mit einem ``DuplikatIndex`` werden erneut eingestellte Anzeigen mit
+  leicht geändertem Text nicht noch einmal gemeldet
+- Fehler einer Suche oder eines Callbacks werden geloggt und gezählt;
+  die Alarme werden trotzdem neu eingeplant, und nicht zugestellte
+  Anzeigen gelten weiter als ungesehen
+
+Die Anfragerate selbst begrenzt der Rate-Limiter des Scrapers. Für
+500 Alarme im 5-Minuten-Takt muss sein Intervall entsprechend klein
+gewählt werden (z. B. ``RateLimiter(standard_intervall=0.5)``).
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+
+import requests
+
+try:
+    from .robots import RobotsVerbot
+except ImportError:
+    from robots import RobotsVerbot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class Alarm:
+    """Eine gespeicherte Suche"""
+    suchbegriff: str
+    ort: str = ""
+    intervall: float = 300.0
+    prioritaet: int = 0
+    max_seiten: int = 1
+    name: Optional[str] = None
+    naechster_lauf: float = field(default=0.0, repr=False)
+    letzter_lauf: Optional[float] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.name is None:
+            self.name = f"{self.suchbegriff} @ {self.ort}" if self.ort else self.suchbegriff
+
+
+@dataclass
+class ZyklusStatistik:
+    """Ergebnis eines Scheduler-Durchlaufs"""
+    alarme: int = 0
+    seiten: int = 0
+    anzeigen: int = 0
+    neue: int = 0
+    duplikate: int = 0
+    fehler: int = 0
+
+
+class AlarmScheduler:
+    """
+    Führt Alarme periodisch mit gemeinsamem Seitenabruf aus
+
+    Args:
+        scraper: ``KleinanzeigenScraper`` für URL-Bau, Abruf und Parsing
+        benachrichtige: Callback ``(alarm, anzeigen)`` für gefundene Anzeigen
+        gesehen: Optionaler ``GesehenSpeicher``; dann werden nur neue Anzeigen
+            gemeldet (getrennt pro Alarm, Bereich ist ``alarm.name``)
+        duplikate: Optionaler ``DuplikatIndex``; erneut eingestellte Anzeigen
+            mit leicht geändertem Text werden dann nicht gemeldet
+        jitter: Relative Streuung der Intervalle (0.1 = ±10 %)
+        mitnahme_anteil: Alarme derselben Suche, die innerhalb dieses
+            Anteils ihres Intervalls fällig werden, laufen gleich mit
+    """
+
+    def __init__(self, scraper, benachrichtige: Callable, gesehen=None, jitter=0.1,
+                 mitnahme_anteil=0.25, zufall: Optional[random.Random] = None, duplikate=None):
+        self.scraper = scraper
+        self.benachrichtige = benachrichtige
+        self.gesehen = gesehen
+        self.duplikate = duplikate
+        self.jitter = jitter
+        self.mitnahme_anteil = mitnahme_anteil
+        self._zufall = zufall or random.Random()
+
+        self._heap = []
+        self._zaehler = itertools.count()
+        self._gruppen: Dict[str, Set[Alarm]] = {}
+        self._lock = threading.Lock()
+        self._stopp = threading.Event()
+        self._aenderung = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _gruppe(self, alarm):
+        """Schlüssel für Alarme mit identischer Suche"""
+        return self.scraper.baue_such_url(alarm.suchbegriff, alarm.ort, 1)
+
+    def hinzufuegen(self, alarm: Alarm, jetzt=None):
+        """
+        Plant einen Alarm ein
+
+        Der erste Lauf liegt an einer festen, aus der Suche abgeleiteten
+        Stelle im Intervall. So verteilen sich viele Alarme gleichmäßig,
+        und identische Suchen landen auf demselben Zeitpunkt.
+        """
+        jetzt = time.monotonic() if jetzt is None else jetzt
+        gruppe = self._gruppe(alarm)
+        phase = zlib.crc32(gruppe.encode('utf-8')) / 2 ** 32
+        with self._lock:
+            alarm.naechster_lauf = jetzt + phase * alarm.intervall
+            self._gruppen.setdefault(gruppe, set()).add(alarm)
+            self._einplanen(alarm)
+        self._aenderung.set()
+        return alarm
+
+    def entfernen(self, alarm: Alarm):
+        """Entfernt einen Alarm"""
+        with self._lock:
+            gruppe = self._gruppen.get(self._gruppe(alarm))
+            if gruppe is not None:
+                gruppe.discard(alarm)
+                if not gruppe:
+                    del self._gruppen[self._gruppe(alarm)]
+
+    @property
+    def alarme(self) -> List[Alarm]:
+        with self._lock:
+            return [alarm for gruppe in self._gruppen.values() for alarm in gruppe]
+
+    def _einplanen(self, alarm):
+        heapq.heappush(self._heap, (alarm.naechster_lauf, -alarm.prioritaet, next(self._zaehler), alarm))
+
+    def _aktiv(self, eintrag):
+        zeitpunkt, _, _, alarm = eintrag
+        gruppe = self._gruppen.get(self._gruppe(alarm))
+        return gruppe is not None and alarm in gruppe and alarm.naechster_lauf == zeitpunkt
+
+    def naechster_zeitpunkt(self) -> Optional[float]:
+        """Zeitpunkt (time.monotonic) des nächsten fälligen Alarms"""
+        with self._lock:
+            while self._heap and not self._aktiv(self._heap[0]):
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def _faellige_gruppen(self, jetzt) -> Dict[str, List[Alarm]]:
+        """Entnimmt alle fälligen Alarme und gruppiert sie nach Suche (Lock gehalten)"""
+        gruppen: Dict[str, List[Alarm]] = {}
+        while self._heap and self._heap[0][0] <= jetzt:
+            eintrag = heapq.heappop(self._heap)
+            if self._aktiv(eintrag):
+                alarm = eintrag[3]
+                gruppen.setdefault(self._gruppe(alarm), []).append(alarm)
+
+        # Bald fällige Alarme derselben Suche mitnehmen
+        for schluessel, faellige in gruppen.items():
+            for alarm in self._gruppen.get(schluessel, ()):
+                if alarm not in faellige and \
+                        alarm.naechster_lauf - jetzt <= alarm.intervall * self.mitnahme_anteil:
+                    faellige.append(alarm)
+        return gruppen
+
+    def fuehre_zyklus_aus(self, jetzt=None) -> ZyklusStatistik:
+        """Führt alle fälligen Alarme aus und plant sie neu ein"""
+        jetzt = time.monotonic() if jetzt is None else jetzt
+        with self._lock:
+            gruppen = self._faellige_gruppen(jetzt)
+
+        statistik = ZyklusStatistik()
+        seiten: Dict[str, list] = {}
+
+        # Höchste Priorität zuerst
+        reihenfolge = sorted(gruppen.values(), key=lambda alarme: -max(a.prioritaet for a in alarme))
+        for alarme in reihenfolge:
+            statistik.alarme += len(alarme)
+            try:
+                self._verarbeite_gruppe(alarme, seiten, statistik)
+            except Exception:
+                logger.exception("Fehler bei Alarm '%s'", alarme[0].name)
+                statistik.fehler += 1
+            finally:
+                with self._lock:
+                    for alarm in alarme:
+                        alarm.letzter_lauf = jetzt
+                        streuung = 1.0 + self._zufall.uniform(-self.jitter, self.jitter)
+                        alarm.naechster_lauf = max(alarm.naechster_lauf, jetzt) + alarm.intervall * streuung
+                        self._einplanen(alarm)
+
+        return statistik
+
+    def _verarbeite_gruppe(self, alarme, seiten, statistik):
+        """Lädt die Seiten einer Suche und benachrichtigt jeden Alarm der Gruppe"""
+        anzeigen_je_seite = self._lade_seiten(alarme, seiten, statistik)
+
+        gefunden = []
+        for seite_anzeigen in anzeigen_je_seite:
+            gefunden.extend(seite_anzeigen)
+        statistik.anzeigen += len(gefunden)
+
+        # Nur der Repräsentant eines Clusters wird gemeldet
+        doppelte_urls = set()
+        if self.duplikate is not None and gefunden:
+            self.duplikate.hinzufuegen_viele(gefunden)
+            doppelte_urls = {anzeige.url for anzeige in gefunden
+                             if not self.duplikate.ist_repraesentant(anzeige)}
+            statistik.duplikate += len(doppelte_urls)
+
+        neue_urls = set()
+        for alarm in alarme:
+            treffer = [anzeige
+                       for seite_anzeigen in anzeigen_je_seite[:alarm.max_seiten]
+                       for anzeige in seite_anzeigen]
+            neu = []
+            if self.gesehen is not None and treffer:
+                treffer = neu = self.gesehen.neue(treffer, bereich=alarm.name)
+                neue_urls.update(anzeige.url for anzeige in treffer)
+            if doppelte_urls:
+                treffer = [anzeige for anzeige in treffer if anzeige.url not in doppelte_urls]
+            if not treffer:
+                continue
+            try:
+                self.benachrichtige(alarm, treffer)
+            except Exception:
+                logger.exception("Benachrichtigung für Alarm '%s' fehlgeschlagen", alarm.name)
+                statistik.fehler += 1
+                # Beim nächsten Lauf erneut melden
+                if neu:
+                    self.gesehen.vergiss((anzeige.url for anzeige in neu), bereich=alarm.name)
+        statistik.neue += len(neue_urls)
+
+    def _lade_seiten(self, alarme, seiten, statistik):
+        """Lädt die Seiten einer Suche einmal für alle Alarme der Gruppe"""
+        vorlage = alarme[0]
+        ergebnis = []
+        for nummer in range(1, max(alarm.max_seiten for alarm in alarme) + 1):
+            url = self.scraper.baue_such_url(vorlage.suchbegriff, vorlage.ort, nummer)
+            if url not in seiten:
+                try:
+                    seiten[url] = self.scraper.lade_ergebnisseite(url)
+                    statistik.seiten += 1
+                except (requests.RequestException, RobotsVerbot) as e:
+                    logger.warning("Fehler bei Alarm '%s' (Seite %d): %s", vorlage.name, nummer, e)
+                    statistik.fehler += 1
+                    seiten[url] = []
+            if not seiten[url]:
+                break
+            ergebnis.append(seiten[url])
+        return ergebnis
+
+    def starte(self):
+        """Startet den Scheduler in einem Hintergrund-Thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopp.clear()
+        self._thread = threading.Thread(target=self._schleife, name='alarm-scheduler', daemon=True)
+        self._thread.start()
+
+    def stoppe(self, timeout=None):
+        """Beendet den Hintergrund-Thread nach dem laufenden Zyklus"""
+        self._stopp.set()
+        self._aenderung.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _schleife(self):
+        while not self._stopp.is_set():
+            # Vor dem Lesen der Alarme zurücksetzen, sonst geht eine
+            # Änderung zwischen Lesen und Warten verloren
+            self._aenderung.clear()
+            naechster = self.naechster_zeitpunkt()
+            wartezeit = None if naechster is None else naechster - time.monotonic()
+            if wartezeit is None or wartezeit > 0:
+                self._aenderung.wait(wartezeit)
+                continue
+            self.fuehre_zyklus_aus()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Asyncio Modul
+=====================================
+
+Asynchrone Variante des Scrapers für viele gespeicherte Suchen.
+
+Die HTTP-Anfragen laufen weiterhin über die ``requests.Session`` des
+Scrapers, werden aber in einem Thread-Pool ausgeführt. Ein Semaphor pro
+Host begrenzt die gleichzeitigen Anfragen. Die Wartezeiten kommen aus
+dem gemeinsamen Rate-Limiter und blockieren die Event-Loop nicht.
+
+Verwendung:
+    scraper = AsyncKleinanzeigenScraper(max_parallel_pro_host=4)
+    anzeigen = asyncio.run(scraper.extrahiere_anzeigen_async("Handwerker", "Berlin"))
+"""
+
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Sequence, Tuple
+from urllib.parse import urlparse
+
+try:
+    from .kleinanzeigen_scraper import KleinanzeigenScraper, DienstleistungsAnzeige
+    from .rate_limiter import RateLimiter
+    from .transport import Transport
+except ImportError:
+    from kleinanzeigen_scraper import KleinanzeigenScraper, DienstleistungsAnzeige
+    from rate_limiter import RateLimiter
+    from transport import Transport
+
+
+class AsyncKleinanzeigenScraper(KleinanzeigenScraper):
+    """
+    Asynchroner Scraper mit begrenzter Parallelität pro Host
+
+    Liefert dieselben ``DienstleistungsAnzeige``-Objekte wie der
+    synchrone ``KleinanzeigenScraper``.
+    """
+
+    def __init__(self, base_url="https://www.kleinanzeigen.de", timeout=10,
+                 max_parallel_pro_host=4, verzoegerung=2.0, rate_limiter=None, parse_prozesse=0,
+                 metriken=None, transport=None):
+        super().__init__(base_url, timeout=timeout,
+                         rate_limiter=rate_limiter or RateLimiter(standard_intervall=verzoegerung),
+                         parse_prozesse=parse_prozesse, metriken=metriken, transport=transport)
+        self.max_parallel_pro_host = max_parallel_pro_host
+
+        # Verbindungspool passend zur Parallelität dimensionieren
+        if transport is None:
+            self._transport = Transport(pool_pro_host=max_parallel_pro_host, metriken=self.metriken)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_parallel_pro_host,
+                                            thread_name_prefix='kleinanzeigen-fetch')
+        # Semaphoren gehören zu einer Event-Loop: pro Loop und Host einer,
+        # damit mehrere asyncio.run(...) auf demselben Scraper möglich sind
+        self._semaphoren = weakref.WeakKeyDictionary()
+
+    def _semaphore(self, url):
+        """Liefert den Semaphor für den Host der URL in der laufenden Event-Loop"""
+        host = urlparse(url).netloc
+        semaphoren: Dict[str, asyncio.Semaphore] = self._semaphoren.setdefault(asyncio.get_running_loop(), {})
+        semaphore = semaphoren.get(host)
+        if semaphore is None:
+            semaphore = semaphoren[host] = asyncio.Semaphore(self.max_parallel_pro_host)
+        return semaphore
+
+    async def _hole_async(self, url):
+        loop = asyncio.get_running_loop()
+        # Lädt die robots.txt beim ersten Mal, daher im Thread-Pool
+        await loop.run_in_executor(self._executor, self.pruefe_robots_txt, url)
+        async with self._semaphore(url):
+            with self.metriken.stufe('rate_limit'):
+                await self.rate_limiter.warte_async(url)
+            response = await loop.run_in_executor(self._executor, partial(self._sende, url))
+        response.raise_for_status()
+        return response
+
+    async def hole_seite_async(self, url):
+        """Lädt eine Seite, ohne die Event-Loop zu blockieren"""
+        return (await self._hole_async(url)).text
+
+    async def _lade_ergebnisseite(self, url) -> List[DienstleistungsAnzeige]:
+        response = await self._hole_async(url)
+        gemerkt = self._gemerkte_seite(url, response)
+        if gemerkt is not None:
+            self.metriken.seite(len(gemerkt))
+            return gemerkt
+
+        # Im Prozesspool bzw. Thread-Pool parsen, ohne die Event-Loop zu blockieren
+        with self.metriken.stufe('parsen'):
+            if self.parse_pool is not None:
+                tupel = await asyncio.wrap_future(self.parse_pool.einreichen(response.content))
+                anzeigen = self.parse_pool.zu_anzeigen(tupel)
+            else:
+                anzeigen = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, partial(self.parse_ergebnisseite, response.text))
+        self.metriken.seite(len(anzeigen))
+        return self._merke_seite(url, response, anzeigen)
+
+    async def extrahiere_anzeigen_async(self, suchbegriff, ort="", max_seiten=3):
+        """
+        Extrahiert Anzeigen aller Seiten einer Suche parallel
+
+        Die erste Seite wird allein geladen; nur wenn sie voll ist
+        (``VOLLE_SEITE``), folgen die übrigen Seiten gleichzeitig. Die Reihenfolge entspricht der
+        synchronen Variante: Nach der ersten leeren, nicht vollen oder
+        fehlgeschlagenen Seite werden die folgenden verworfen. Ein Fehler
+        auf der ersten Seite wird weitergegeben.
+        """
+        urls = [self.baue_such_url(suchbegriff, ort, seite) for seite in range(1, max_seiten + 1)]
+        erste = await self._lade_ergebnisseite(urls[0])
+        anzeigen = list(erste)
+        if len(erste) < self.VOLLE_SEITE or len(urls) == 1:
+            return anzeigen
+
+        weitere = await asyncio.gather(*(self._lade_ergebnisseite(url) for url in urls[1:]),
+                                       return_exceptions=True)
+        volle_seite = len(erste)
+        for seiten_anzeigen in weitere:
+            if isinstance(seiten_anzeigen, BaseException) or not seiten_anzeigen:
+                break
+            anzeigen.extend(seiten_anzeigen)
+            if len(seiten_anzeigen) < volle_seite:
+                break
+        return anzeigen
+
+    async def extrahiere_viele_async(self, suchen: Sequence[Tuple[str, str, int]]):
+        """Führt mehrere Suchen (suchbegriff, ort, max_seiten) gleichzeitig aus"""
+        return await asyncio.gather(*(
+            self.extrahiere_anzeigen_async(suchbegriff, ort, max_seiten)
+            for suchbegriff, ort, max_seiten in suchen
+        ))
+
+    def schliessen(self):
+        """Gibt Thread-Pool, Parse-Prozesse und Verbindungen frei"""
+        self._executor.shutdown(wait=False)
+        self._schliesse_parse_pool()
+        self.transport.schliessen()
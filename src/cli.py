@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Kommandozeile
+=====================================
+
+Headless-Batchbetrieb ohne GUI-Module (kein tkinter, kein Display).
+
+Liest Suchen aus einer Datei, führt sie mit begrenzter Parallelität aus
+und schreibt jede Anzeige sofort als JSON-Zeile (mit der auslösenden
+Suche im Feld ``suche``) auf stdout oder in eine Datei. Meldungen gehen
+nach stderr.
+
+Suchdatei: eine Suche pro Zeile, ``suchbegriff;ort;max_seiten`` (Ort
+und Seitenzahl optional) oder ein JSON-Objekt mit denselben Schlüsseln.
+Leere Zeilen und Zeilen mit ``#`` werden übersprungen, ``-`` liest von
+stdin.
+
+Exit-Codes:
+    0  alle Suchen erfolgreich
+    1  mindestens eine Suche fehlgeschlagen (die übrigen wurden geschrieben)
+    2  Aufruf- oder Eingabefehler
+    3  alle Suchen fehlgeschlagen
+    130  abgebrochen (Strg+C)
+
+Scraper, Exporter und requests werden erst nach dem Parsen der
+Argumente importiert, damit ``--help`` und Aufruffehler sofort antworten.
+
+Verwendung:
+    kleinanzeigen suchen.txt --parallel 8 -o anzeigen.jsonl.gz
+    echo "Handwerker;Berlin;2" | kleinanzeigen - --eindeutig
+"""
+
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+from typing import Iterable, List, NamedTuple
+
+EXIT_OK = 0
+EXIT_TEILWEISE = 1
+EXIT_AUFRUF = 2
+EXIT_ALLE_FEHLGESCHLAGEN = 3
+EXIT_ABGEBROCHEN = 130
+
+
+class Suche(NamedTuple):
+    """Eine Zeile der Suchdatei"""
+    suchbegriff: str
+    ort: str = ""
+    max_seiten: int = 3
+
+    def als_dict(self) -> dict:
+        return {'suchbegriff': self.suchbegriff, 'ort': self.ort}
+
+
+def lese_suchen(zeilen: Iterable[str], max_seiten=3) -> List[Suche]:
+    """Liest Suchen zeilenweise; ungültige Zeilen lösen ``ValueError`` mit Zeilennummer aus"""
+    suchen = []
+    for nummer, zeile in enumerate(zeilen, 1):
+        zeile = zeile.strip()
+        if not zeile or zeile.startswith('#'):
+            continue
+        try:
+            if zeile.startswith('{'):
+                werte = json.loads(zeile)
+                suche = Suche(str(werte['suchbegriff']), str(werte.get('ort') or ''),
+                              int(werte.get('max_seiten') or max_seiten))
+            else:
+                teile = [teil.strip() for teil in zeile.split(';')]
+                if len(teile) > 3:
+                    raise ValueError("höchstens 'suchbegriff;ort;max_seiten' erwartet")
+                suche = Suche(teile[0], teile[1] if len(teile) > 1 else '',
+                              int(teile[2]) if len(teile) > 2 and teile[2] else max_seiten)
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Zeile {nummer}: {e}") from None
+        if not suche.suchbegriff or suche.max_seiten < 1:
+            raise ValueError(f"Zeile {nummer}: Suchbegriff fehlt oder max_seiten < 1")
+        suchen.append(suche)
+    return suchen
+
+
+class _Ausgabe:
+    """Schreibt JSON-Zeilen aus mehreren Threads, eine Zeile am Stück"""
+
+    def __init__(self, datei):
+        self._datei = datei
+        self._lock = threading.Lock()
+        self.anzahl = 0
+
+    def schreibe(self, zeilen: List[dict]):
+        if not zeilen:
+            return
+        text = ''.join(json.dumps(zeile, ensure_ascii=False) + '\n' for zeile in zeilen)
+        with self._lock:
+            self._datei.write(text)
+            self._datei.flush()
+            self.anzahl += len(zeilen)
+
+
+def fuehre_suche_aus(scraper, suche: Suche, ausgabe: _Ausgabe, stopp: threading.Event,
+                     details=False, eindeutig=False) -> int:
+    """Führt eine Suche aus und schreibt ihre Anzeigen Seite für Seite; liefert die Anzahl"""
+    try:
+        from .export import als_dict
+    except ImportError:
+        from export import als_dict
+
+    anzahl = 0
+    herkunft = suche.als_dict()
+    seiten = scraper.iter_seiten(suche.suchbegriff, suche.ort, suche.max_seiten)
+    try:
+        for anzeigen in seiten:
+            if eindeutig:
+                # Auch über Suchen hinweg: nur der Repräsentant jedes Duplikat-Clusters
+                anzeigen = [a for a in anzeigen if scraper.duplikate.hinzufuegen(a) is a]
+            if details:
+                scraper.reichere_an(anzeigen)
+            ausgabe.schreibe([dict(als_dict(a), suche=herkunft) for a in anzeigen])
+            anzahl += len(anzeigen)
+            if stopp.is_set():
+                break
+    finally:
+        seiten.close()
+    return anzahl
+
+
+def main(argv=None):
+    """Führt die Suchen einer Datei aus und schreibt JSON Lines"""
+    parser = argparse.ArgumentParser(prog='kleinanzeigen', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('suchen', help="Datei mit einer Suche pro Zeile ('-' für stdin)")
+    parser.add_argument('-o', '--ausgabe', help="JSONL-Datei (.gz/.zst komprimiert; Standard: stdout)")
+    parser.add_argument('-p', '--parallel', type=int, default=4, help="Gleichzeitige Suchen (Standard: 4)")
+    parser.add_argument('--seiten', type=int, default=3, help="max_seiten für Zeilen ohne Angabe (Standard: 3)")
+    parser.add_argument('--intervall', type=float, default=2.0,
+                        help="Mindestabstand zwischen Anfragen pro Host in Sekunden (Standard: 2.0)")
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--base-url', default="https://www.kleinanzeigen.de")
+    parser.add_argument('--details', action='store_true', help="Beschreibung und Kontakt von den Detailseiten laden")
+    parser.add_argument('--eindeutig', action='store_true', help="Mehrfach eingestellte Anzeigen nur einmal")
+    parser.add_argument('--http2', action='store_true', help="HTTP/2 über httpx (pip install httpx[http2])")
+    parser.add_argument('--metriken', metavar='DATEI', help="Metriken am Ende im Prometheus-Textformat schreiben")
+    parser.add_argument('--profil', metavar='VERZEICHNIS', help="CPU- und Speicherprofil in VERZEICHNIS schreiben")
+    parser.add_argument('-q', '--leise', action='store_true', help="Keine Fortschrittsmeldungen")
+    args = parser.parse_args(argv)
+
+    def melde(text):
+        if not args.leise:
+            print(text, file=sys.stderr, flush=True)
+
+    if args.parallel < 1 or args.seiten < 1:
+        print("❌ --parallel und --seiten müssen mindestens 1 sein", file=sys.stderr)
+        return EXIT_AUFRUF
+    try:
+        if args.suchen == '-':
+            suchen = lese_suchen(sys.stdin, args.seiten)
+        else:
+            with open(args.suchen, encoding='utf-8') as datei:
+                suchen = lese_suchen(datei, args.seiten)
+    except (OSError, ValueError) as e:
+        print(f"❌ Suchdatei: {e}", file=sys.stderr)
+        return EXIT_AUFRUF
+    if not suchen:
+        print("❌ Keine Suchen in der Suchdatei", file=sys.stderr)
+        return EXIT_AUFRUF
+
+    try:
+        from .kleinanzeigen_scraper import KleinanzeigenScraper
+        from .rate_limiter import RateLimiter
+        from .export import erkenne_format, oeffne_ausgabe
+        from .profil import profiliere
+        from .transport import erstelle_transport
+    except ImportError:
+        from kleinanzeigen_scraper import KleinanzeigenScraper
+        from rate_limiter import RateLimiter
+        from export import erkenne_format, oeffne_ausgabe
+        from profil import profiliere
+        from transport import erstelle_transport
+
+    try:
+        if args.ausgabe:
+            _, kompression = erkenne_format(args.ausgabe)
+            ziel = io.TextIOWrapper(oeffne_ausgabe(args.ausgabe, kompression), encoding='utf-8')
+        else:
+            ziel = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', write_through=True)
+    except (OSError, ValueError) as e:
+        print(f"❌ Ausgabe: {e}", file=sys.stderr)
+        return EXIT_AUFRUF
+
+    # Eine Verbindung pro Suche, dazu die Detailanfragen aus reichere_an
+    transport = erstelle_transport(http2=args.http2, pool_pro_host=args.parallel * (5 if args.details else 1))
+    scraper = KleinanzeigenScraper(base_url=args.base_url, timeout=args.timeout,
+                                   rate_limiter=RateLimiter(standard_intervall=args.intervall),
+                                   transport=transport)
+    ausgabe = _Ausgabe(ziel)
+    stopp = threading.Event()
+    fehler = 0
+    start = time.monotonic()
+    melde(f"🔍 {len(suchen)} Suchen, {args.parallel} parallel")
+
+    def ausfuehren(suche):
+        if stopp.is_set():
+            return None
+        try:
+            anzahl = fuehre_suche_aus(scraper, suche, ausgabe, stopp, args.details, args.eindeutig)
+        except Exception as e:
+            melde(f"❌ {suche.suchbegriff!r} ({suche.ort or 'überall'}): {e}")
+            return e
+        melde(f"✅ {suche.suchbegriff!r} ({suche.ort or 'überall'}): {anzahl} Anzeigen")
+        return None
+
+    from concurrent.futures import ThreadPoolExecutor
+    try:
+        with profiliere('cli', args.profil):
+            pool = ThreadPoolExecutor(max_workers=args.parallel, thread_name_prefix='kleinanzeigen-cli')
+            try:
+                ergebnisse = list(pool.map(ausfuehren, suchen))
+            finally:
+                stopp.set()
+                pool.shutdown(wait=True)
+        fehler = sum(1 for ergebnis in ergebnisse if ergebnis is not None)
+    except KeyboardInterrupt:
+        melde("⏹️ Abgebrochen")
+        return EXIT_ABGEBROCHEN
+    finally:
+        if args.ausgabe:
+            ziel.close()
+        else:
+            ziel.detach()
+        if args.metriken:
+            with open(args.metriken, 'w', encoding='utf-8') as datei:
+                datei.write(scraper.metriken.prometheus())
+        scraper.transport.schliessen()
+
+    statistik = scraper.metriken.statistik()
+    melde(f"📊 {ausgabe.anzahl} Anzeigen aus {len(suchen) - fehler}/{len(suchen)} Suchen "
+          f"in {time.monotonic() - start:.1f} s, {statistik['verbindungen_neu']} Verbindungen, "
+          f"{statistik['bytes_netz'] / 1024:.0f} KiB übertragen")
+    if fehler == len(suchen):
+        return EXIT_ALLE_FEHLGESCHLAGEN
+    return EXIT_TEILWEISE if fehler else EXIT_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
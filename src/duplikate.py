@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Duplikate
+=================================
+
+Erkennt neu eingestellte Anzeigen mit leicht geändertem Text.
+
+- MinHash-Signatur über Wörter und Wortpaare aus Titel und Beschreibung;
+  jedes Merkmal wird nur einmal gehasht und einem von 64 Fächern
+  zugeordnet (One-Permutation-Hashing), leere Fächer werden aufgefüllt
+- LSH-Index: 8 Bänder zu je 8 Werten; verglichen werden nur Anzeigen,
+  die in mindestens einem Band übereinstimmen, statt aller bisherigen
+- Ähnliche Anzeigen (geschätzte Jaccard-Ähnlichkeit ab ``schwelle``)
+  werden per Union-Find zu Clustern zusammengefasst; die zuerst
+  gesehene Anzeige ist der Repräsentant
+
+Verwendung:
+    index = DuplikatIndex()
+    eindeutige = list(index.repraesentanten(anzeigen))
+    for cluster in index.cluster():
+        ...
+"""
+
+import operator
+import re
+import threading
+import zlib
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .gesehen import normalisiere_url
+except ImportError:
+    from gesehen import normalisiere_url
+
+FAECHER = 64
+BAENDER = 8
+_WORT = re.compile(r'\w+')
+_MASKE = 0xFFFFFFFF
+# Nach dieser Verschiebung bleibt vom 32-Bit-Hash die Fachnummer
+_FACH_BITS = 32 - (FAECHER - 1).bit_length()
+
+
+def merkmale(text) -> List[str]:
+    """Kleingeschriebene Wörter und benachbarte Wortpaare (Wiederholungen stören MinHash nicht)"""
+    woerter = _WORT.findall(text.lower())
+    return woerter + list(map(' '.join, zip(woerter, woerter[1:])))
+
+
+def signatur(text) -> Optional[array]:
+    """
+    MinHash-Signatur mit ``FAECHER`` 32-Bit-Werten (``None`` ohne Merkmale)
+
+    Das Fach eines Merkmals sind die oberen Bits seines Hashs; nach
+    einmaligem Sortieren ist das Minimum jedes Fachs bekannt. Leere
+    Fächer übernehmen den Wert des nächsten belegten Fachs rechts davon,
+    gemischt mit dem Abstand. Gehasht wird mit CRC-32, Signaturen sind
+    also über Prozesse hinweg stabil und lassen sich speichern.
+    """
+    codes = sorted((zlib.crc32(merkmal.encode('utf-8')) for merkmal in merkmale(text)), reverse=True)
+    if not codes:
+        return None
+    # Absteigend sortiert: der letzte Eintrag pro Fach ist das Minimum
+    kleinste = {code >> _FACH_BITS: code for code in codes}
+    werte = [kleinste.get(fach) for fach in range(FAECHER)]
+    if len(kleinste) < FAECHER:
+        for fach, wert in enumerate(werte):
+            if wert is None:
+                abstand = 1
+                while werte[(fach + abstand) % FAECHER] is None:
+                    abstand += 1
+                werte[fach] = (werte[(fach + abstand) % FAECHER] * 0x9E3779B1 + abstand) & _MASKE
+    return array('I', werte)
+
+
+def aehnlichkeit(a, b) -> float:
+    """Geschätzte Jaccard-Ähnlichkeit zweier Signaturen"""
+    if a is None or b is None:
+        return 0.0
+    return sum(map(operator.eq, a, b)) / len(a)
+
+
+def _text(anzeige):
+    if isinstance(anzeige, dict):
+        return f"{anzeige.get('titel', '')} {anzeige.get('beschreibung', '')}"
+    # Rohwert, damit die Signatur keine Detailseite nachlädt
+    return f"{anzeige.titel} {anzeige.roher_wert('beschreibung')}"
+
+
+def _url(anzeige):
+    return anzeige.get('url', '') if isinstance(anzeige, dict) else anzeige.url
+
+
+class DuplikatIndex:
+    """
+    MinHash-LSH-Index mit Clustern ähnlicher Anzeigen
+
+    Args:
+        schwelle: Ab dieser geschätzten Jaccard-Ähnlichkeit gelten zwei
+            Anzeigen als Duplikat
+        baender: Anzahl LSH-Bänder; mehr Bänder finden auch weniger
+            ähnliche Kandidaten, kosten aber mehr Vergleiche
+    """
+
+    def __init__(self, schwelle=0.7, baender=BAENDER):
+        if FAECHER % baender:
+            raise ValueError(f"baender muss {FAECHER} teilen")
+        self.schwelle = schwelle
+        self.baender = baender
+        self._zeilen = FAECHER // baender
+
+        self._anzeigen: list = []
+        self._signaturen: List[Optional[array]] = []
+        self._nach_url: Dict[str, int] = {}
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(baender)]
+        self._eltern: List[int] = []
+        self._mitglieder: Dict[int, List[int]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._anzeigen)
+
+    @property
+    def anzahl_cluster(self):
+        return len(self._mitglieder)
+
+    def _band_werte(self, signatur):
+        zeilen = self._zeilen
+        return [hash(tuple(signatur[band * zeilen:(band + 1) * zeilen])) for band in range(self.baender)]
+
+    def _aehnliche(self, signatur):
+        """
+        Wurzeln aller Cluster mit einem Kandidaten ab ``schwelle``
+
+        Pro Cluster genügt ein Treffer; weitere Mitglieder desselben
+        Clusters werden nicht mehr verglichen. Liefert außerdem die
+        Bänder, deren Bucket schon ein Mitglied eines gefundenen Clusters
+        enthält.
+        """
+        wurzeln, abgedeckt = set(), set()
+        if signatur is None:
+            return wurzeln, abgedeckt
+        geprueft = set()
+        for band, (bucket, wert) in enumerate(zip(self._buckets, self._band_werte(signatur))):
+            for kandidat in bucket.get(wert, ()):
+                wurzel = self._finde(kandidat)
+                if wurzel in wurzeln:
+                    abgedeckt.add(band)
+                elif kandidat not in geprueft:
+                    geprueft.add(kandidat)
+                    if aehnlichkeit(signatur, self._signaturen[kandidat]) >= self.schwelle:
+                        wurzeln.add(wurzel)
+                        abgedeckt.add(band)
+        return wurzeln, abgedeckt
+
+    def _finde(self, nummer):
+        eltern = self._eltern
+        while eltern[nummer] != nummer:
+            eltern[nummer] = eltern[eltern[nummer]]
+            nummer = eltern[nummer]
+        return nummer
+
+    def _vereinige(self, a, b):
+        a, b = self._finde(a), self._finde(b)
+        if a == b:
+            return a
+        # Die ältere Wurzel bleibt Repräsentant
+        if b < a:
+            a, b = b, a
+        self._eltern[b] = a
+        self._mitglieder[a].extend(self._mitglieder.pop(b))
+        return a
+
+    def _fuege_ein(self, anzeige):
+        """Nimmt eine Anzeige auf; liefert ihre ID und die Wurzeln ähnlicher Cluster"""
+        schluessel = normalisiere_url(_url(anzeige))
+        with self._lock:
+            vorhanden = self._nach_url.get(schluessel)
+            if vorhanden is not None:
+                return vorhanden, set()
+
+            eigene = signatur(_text(anzeige))
+            wurzeln, abgedeckt = self._aehnliche(eigene)
+
+            nummer = len(self._anzeigen)
+            self._anzeigen.append(anzeige)
+            self._signaturen.append(eigene)
+            self._nach_url[schluessel] = nummer
+            self._eltern.append(nummer)
+            self._mitglieder[nummer] = [nummer]
+            if eigene is not None:
+                # Bänder mit einem Mitglied desselben Clusters bekommen keinen
+                # weiteren Eintrag; so wachsen Buckets mit der Zahl der Cluster
+                # statt mit der Zahl gleichartiger Anzeigen
+                for band, (bucket, wert) in enumerate(zip(self._buckets, self._band_werte(eigene))):
+                    if band not in abgedeckt:
+                        bucket.setdefault(wert, []).append(nummer)
+            for wurzel in wurzeln:
+                self._vereinige(nummer, wurzel)
+            return nummer, wurzeln
+
+    def hinzufuegen(self, anzeige):
+        """
+        Nimmt eine Anzeige auf und liefert den Repräsentanten ihres Clusters
+
+        Eine bereits bekannte URL wird nicht erneut aufgenommen.
+        """
+        nummer, _ = self._fuege_ein(anzeige)
+        with self._lock:
+            return self._anzeigen[self._finde(nummer)]
+
+    def hinzufuegen_viele(self, anzeigen: Iterable):
+        for anzeige in anzeigen:
+            self._fuege_ein(anzeige)
+        return self
+
+    def _nummer(self, anzeige) -> Optional[int]:
+        return self._nach_url.get(normalisiere_url(_url(anzeige)))
+
+    def repraesentant(self, anzeige):
+        """Repräsentant des Clusters einer bekannten Anzeige (sonst ``None``)"""
+        with self._lock:
+            nummer = self._nummer(anzeige)
+            return None if nummer is None else self._anzeigen[self._finde(nummer)]
+
+    def ist_repraesentant(self, anzeige) -> bool:
+        """Unbekannte Anzeigen gelten als eigener Cluster"""
+        with self._lock:
+            nummer = self._nummer(anzeige)
+            return nummer is None or self._finde(nummer) == nummer
+
+    def cluster_von(self, anzeige) -> list:
+        """Alle Anzeigen im Cluster einer bekannten Anzeige, Repräsentant zuerst"""
+        with self._lock:
+            nummer = self._nummer(anzeige)
+            if nummer is None:
+                return []
+            return [self._anzeigen[i] for i in sorted(self._mitglieder[self._finde(nummer)])]
+
+    def cluster(self, min_groesse=2) -> List[list]:
+        """Alle Cluster mit mindestens ``min_groesse`` Anzeigen"""
+        with self._lock:
+            return [[self._anzeigen[i] for i in sorted(mitglieder)]
+                    for mitglieder in self._mitglieder.values() if len(mitglieder) >= min_groesse]
+
+    def aehnliche(self, anzeige) -> list:
+        """Repräsentanten ähnlicher Cluster, ohne die Anzeige aufzunehmen"""
+        eigene = signatur(_text(anzeige))
+        schluessel = normalisiere_url(_url(anzeige))
+        with self._lock:
+            nummer = self._nach_url.get(schluessel)
+            eigener_cluster = None if nummer is None else self._finde(nummer)
+            wurzeln, _ = self._aehnliche(eigene)
+            return [self._anzeigen[i] for i in sorted(wurzeln) if i != eigener_cluster]
+
+    def repraesentanten(self, anzeigen: Iterable) -> Iterator:
+        """
+        Nimmt Anzeigen auf und liefert je Cluster nur die erste aus ``anzeigen``
+
+        Arbeitet streamend; ein Cluster, der schon vor diesem Aufruf
+        bekannt war, wird durch seine erste Anzeige im Strom vertreten.
+        """
+        ausgegeben = set()
+        for anzeige in anzeigen:
+            nummer, wurzeln = self._fuege_ein(anzeige)
+            with self._lock:
+                wurzel = self._finde(nummer)
+            doppelt = wurzel in ausgegeben or not ausgegeben.isdisjoint(wurzeln)
+            # Die aktuelle Wurzel merken, auch wenn Cluster verschmolzen sind
+            ausgegeben.add(wurzel)
+            if not doppelt:
+                yield anzeige
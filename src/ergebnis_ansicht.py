@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Ergebnisansicht
+=======================================
+
+Virtualisierte Darstellung großer Ergebnismengen in einem ``ttk.Treeview``.
+
+Die Zeilen liegen in einer Python-Liste außerhalb von Tk. Im Treeview
+existieren nur die Zeilen, die gerade sichtbar sind; Scrollbar,
+Mausrad und Tastatur verschieben lediglich den Ausschnitt. Neue Zeilen
+werden in ``after()``-Stapeln übernommen, sodass auch 100.000
+Ergebnisse das Fenster nicht blockieren.
+
+Verwendung:
+    ansicht = ErgebnisAnsicht(tree, scrollbar)
+    ansicht.hinzufuegen(zeilen)     # Iterable von Werte-Tupeln
+    ansicht.leeren()
+"""
+
+from collections import deque
+from itertools import islice
+from typing import Callable, Iterable, List, Optional
+
+
+class ErgebnisAnsicht:
+    """
+    View-Model für einen Treeview mit beliebig vielen Zeilen
+
+    Args:
+        tree: ``ttk.Treeview`` mit ``show='headings'``
+        scrollbar: Vertikale ``ttk.Scrollbar``; ihr ``command`` wird übernommen
+        batch_groesse: Zeilen, die pro ``after()``-Durchlauf übernommen werden
+        intervall_ms: Pause zwischen zwei Stapeln
+        bei_aenderung: Optionaler Callback ``(anzahl)`` nach jeder Übernahme
+    """
+
+    # Schätzung bis zur ersten Messung einer echten Zeile
+    ZEILENHOEHE = 20
+    KOPFHOEHE = 24
+
+    def __init__(self, tree, scrollbar=None, batch_groesse=2000, intervall_ms=5,
+                 bei_aenderung: Optional[Callable[[int], None]] = None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.batch_groesse = batch_groesse
+        self.intervall_ms = intervall_ms
+        self.bei_aenderung = bei_aenderung
+
+        self._zeilen: List[tuple] = []
+        self._ausstehend = deque()
+        self._ausgewaehlt = set()
+        self._start = 0
+        self._sichtbar = max(1, int(str(tree.cget('height'))))
+        self._zeilenhoehe = None
+        self._kopfhoehe = None
+        self._nachladen_id = None
+        self._zeichnen_id = None
+
+        if scrollbar is not None:
+            scrollbar.configure(command=self._scrollbar_befehl)
+        tree.configure(yscrollcommand='')
+        tree.bind('<Configure>', self._groesse_geaendert, add='+')
+        tree.bind('<MouseWheel>', self._mausrad, add='+')
+        tree.bind('<Button-4>', lambda e: self._scrolle(-3), add='+')
+        tree.bind('<Button-5>', lambda e: self._scrolle(3), add='+')
+        tree.bind('<<TreeviewSelect>>', self._auswahl_geaendert, add='+')
+        for taste, schritt in (('<Up>', -1), ('<Down>', 1)):
+            tree.bind(taste, lambda e, s=schritt: self._taste(s), add='+')
+        tree.bind('<Prior>', lambda e: self._scrolle(-self._sichtbar) or 'break', add='+')
+        tree.bind('<Next>', lambda e: self._scrolle(self._sichtbar) or 'break', add='+')
+
+    def __len__(self):
+        return len(self._zeilen)
+
+    @property
+    def zeilen(self) -> List[tuple]:
+        """Alle übernommenen Zeilen (nicht kopiert)"""
+        return self._zeilen
+
+    @property
+    def sichtbarer_bereich(self):
+        """Index der ersten und hinter der letzten sichtbaren Zeile"""
+        return self._start, min(self._start + self._sichtbar, len(self._zeilen))
+
+    @property
+    def laedt(self) -> bool:
+        """Noch nicht übernommene Zeilen vorhanden"""
+        return bool(self._ausstehend)
+
+    def ausgewaehlte_zeilen(self) -> List[tuple]:
+        """Ausgewählte Zeilen, auch wenn sie gerade nicht sichtbar sind"""
+        return [self._zeilen[i] for i in sorted(self._ausgewaehlt)]
+
+    # Daten
+
+    def hinzufuegen(self, zeilen: Iterable[tuple]):
+        """
+        Hängt Zeilen an
+
+        Die Zeilen werden stapelweise im Tk-Hauptthread übernommen; ein
+        Generator wird also erst nach und nach ausgewertet.
+        """
+        self._ausstehend.append(iter(zeilen))
+        if self._nachladen_id is None:
+            self._nachladen_id = self.tree.after(0, self._uebernehme_stapel)
+
+    def _uebernehme_stapel(self):
+        self._nachladen_id = None
+        rest = self.batch_groesse
+        while self._ausstehend and rest > 0:
+            vorher = len(self._zeilen)
+            self._zeilen.extend(map(tuple, islice(self._ausstehend[0], rest)))
+            uebernommen = len(self._zeilen) - vorher
+            if uebernommen < rest:
+                self._ausstehend.popleft()
+            rest -= uebernommen
+
+        self._zeichne_spaeter()
+        if self.bei_aenderung is not None:
+            self.bei_aenderung(len(self._zeilen))
+        if self._ausstehend:
+            self._nachladen_id = self.tree.after(self.intervall_ms, self._uebernehme_stapel)
+
+    def leeren(self):
+        """Entfernt alle Zeilen und bricht ausstehende Übernahmen ab"""
+        if self._nachladen_id is not None:
+            self.tree.after_cancel(self._nachladen_id)
+            self._nachladen_id = None
+        self._ausstehend.clear()
+        self._zeilen = []
+        self._ausgewaehlt.clear()
+        self._start = 0
+        self._zeichne()
+        if self.bei_aenderung is not None:
+            self.bei_aenderung(0)
+
+    # Darstellung
+
+    def _zeichne_spaeter(self):
+        """Fasst mehrere Änderungen zu einem Neuzeichnen zusammen"""
+        if self._zeichnen_id is None:
+            self._zeichnen_id = self.tree.after_idle(self._zeichne)
+
+    def _zeichne(self):
+        """Baut die sichtbaren Treeview-Zeilen für den aktuellen Ausschnitt neu auf"""
+        if self._zeichnen_id is not None:
+            self.tree.after_cancel(self._zeichnen_id)
+            self._zeichnen_id = None
+
+        self._start = max(0, min(self._start, len(self._zeilen) - self._sichtbar))
+        start, ende = self.sichtbarer_bereich
+
+        tree = self.tree
+        vorhanden = tree.get_children()
+        if vorhanden:
+            tree.delete(*vorhanden)
+        for index in range(start, ende):
+            tree.insert('', 'end', iid=str(index), values=self._zeilen[index])
+
+        auswahl = [str(i) for i in self._ausgewaehlt if start <= i < ende]
+        if auswahl:
+            tree.selection_set(auswahl)
+
+        if self._zeilenhoehe is None and ende > start:
+            self._miss_zeilen()
+        self._aktualisiere_scrollbar()
+
+    def _miss_zeilen(self):
+        """Misst Zeilen- und Kopfhöhe an der ersten sichtbaren Zeile"""
+        box = self.tree.bbox(str(self._start))
+        if box:
+            _, y, _, hoehe = box
+            self._zeilenhoehe, self._kopfhoehe = hoehe, y
+            self._groesse_geaendert()
+
+    def _aktualisiere_scrollbar(self):
+        if self.scrollbar is None:
+            return
+        anzahl = len(self._zeilen)
+        if anzahl == 0:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            start, ende = self.sichtbarer_bereich
+            self.scrollbar.set(start / anzahl, ende / anzahl)
+
+    def _groesse_geaendert(self, event=None):
+        hoehe = self.tree.winfo_height()
+        if hoehe <= 1:
+            return
+        zeilenhoehe = self._zeilenhoehe or self.ZEILENHOEHE
+        kopfhoehe = self._kopfhoehe if self._kopfhoehe is not None else self.KOPFHOEHE
+        sichtbar = max(1, (hoehe - kopfhoehe) // zeilenhoehe)
+        if sichtbar != self._sichtbar:
+            self._sichtbar = sichtbar
+            self._zeichne_spaeter()
+
+    # Navigation
+
+    def gehe_zu(self, index):
+        """Scrollt so, dass ``index`` die erste sichtbare Zeile ist"""
+        alt = self._start
+        self._start = max(0, min(index, len(self._zeilen) - self._sichtbar))
+        if self._start != alt:
+            self._zeichne()
+
+    def _scrolle(self, zeilen):
+        self.gehe_zu(self._start + zeilen)
+
+    def _scrollbar_befehl(self, aktion, *args):
+        if aktion == 'moveto':
+            self.gehe_zu(int(float(args[0]) * len(self._zeilen)))
+        elif aktion == 'scroll':
+            anzahl, einheit = int(args[0]), args[1]
+            self._scrolle(anzahl * (self._sichtbar if einheit == 'pages' else 1))
+
+    def _mausrad(self, event):
+        # Windows liefert Vielfache von 120, macOS kleine Werte
+        schritt = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self._scrolle(-3 * schritt if schritt else 0)
+        return 'break'
+
+    def _taste(self, richtung):
+        """Pfeiltasten am Rand des Ausschnitts scrollen weiter"""
+        fokus = self.tree.focus()
+        if not fokus:
+            return None
+        index = int(fokus) + richtung
+        start, ende = self.sichtbarer_bereich
+        if start <= index < ende or not 0 <= index < len(self._zeilen):
+            return None
+        self._scrolle(richtung)
+        self._ausgewaehlt = {index}
+        self.tree.selection_set(str(index))
+        self.tree.focus(str(index))
+        return 'break'
+
+    def _auswahl_geaendert(self, event=None):
+        start, ende = self.sichtbarer_bereich
+        sichtbar_ausgewaehlt = {int(iid) for iid in self.tree.selection()}
+        # Auswahl außerhalb des Ausschnitts bleibt erhalten
+        self._ausgewaehlt = {i for i in self._ausgewaehlt if not start <= i < ende} | sichtbar_ausgewaehlt
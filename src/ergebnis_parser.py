@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Ergebnis-Parser
+=======================================
+
+Wandelt Suchergebnisseiten in ``DienstleistungsAnzeige``-Objekte um.
+
+- Nutzt lxml mit vorkompilierten XPath-Ausdrücken
+- Parst nur den Teilbaum der Anzeigenliste statt der ganzen Seite
+- Fällt auf BeautifulSoup zurück, wenn lxml nicht installiert ist
+- Liest Beschreibung und Kontakt von Detailseiten (``parse_detailseite``)
+"""
+
+import re
+from typing import Callable, List, Tuple, Union
+from urllib.parse import urljoin
+
+try:
+    from lxml import etree
+    LXML_VERFUEGBAR = True
+except ImportError:
+    LXML_VERFUEGBAR = False
+
+try:
+    from .kleinanzeigen_scraper import DienstleistungsAnzeige, NichtGeladen
+except ImportError:
+    from kleinanzeigen_scraper import DienstleistungsAnzeige, NichtGeladen
+
+# Beginn und Ende der Anzeigenliste im HTML
+_LISTE_START = re.compile(r'<ul[^>]*\bid="srchrslt-adtable"', re.I)
+_UL_TAG = re.compile(r'<(/?)ul\b', re.I)
+
+# CSS-Klassen der einzelnen Felder
+KLASSE_BESCHREIBUNG = 'aditem-main--middle--description'
+KLASSE_PREIS = 'aditem-main--middle--price-shipping--price'
+KLASSE_ORT = 'aditem-main--top--left'
+KLASSE_DATUM = 'aditem-main--top--right'
+
+# Felder der Detailseite
+ID_DETAIL_BESCHREIBUNG = 'viewad-description-text'
+ID_DETAIL_KONTAKT = 'viewad-contact'
+KLASSE_DETAIL_NAME = 'userprofile-vip'
+STANDARD_KONTAKT = "Siehe Anzeige"
+
+
+def schneide_anzeigenliste(html: str) -> str:
+    """
+    Schneidet die Anzeigenliste aus dem Seiten-HTML
+
+    Gibt das komplette HTML zurück, wenn keine Liste gefunden wird.
+    """
+    start = _LISTE_START.search(html)
+    if start is None:
+        return html
+
+    tiefe = 0
+    for tag in _UL_TAG.finditer(html, start.start()):
+        tiefe += -1 if tag.group(1) else 1
+        if tiefe == 0:
+            return html[start.start():html.index('>', tag.end()) + 1]
+    return html[start.start():]
+
+
+def _text(element):
+    return ' '.join(' '.join(element.itertext()).split())
+
+
+# Feldname je CSS-Klasse
+_FELD_KLASSEN = {
+    KLASSE_BESCHREIBUNG: 'beschreibung',
+    KLASSE_PREIS: 'preis',
+    KLASSE_ORT: 'ort',
+    KLASSE_DATUM: 'datum',
+}
+
+if LXML_VERFUEGBAR:
+    _XP_ARTIKEL = etree.XPath('//article[contains(concat(" ", normalize-space(@class), " "), " aditem ")]')
+    _XP_TITEL = etree.XPath('.//h2//a[1]')
+    _HTML_PARSER = etree.HTMLParser(encoding='utf-8', remove_comments=True, no_network=True)
+
+
+def parse_detailseite(html: Union[str, bytes]) -> dict:
+    """
+    Liest Beschreibung und Kontaktnamen aus einer Anzeigen-Detailseite
+
+    Fehlende Felder werden nicht zurückgegeben.
+    """
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    details = {}
+
+    if LXML_VERFUEGBAR:
+        wurzel = etree.fromstring(html.encode('utf-8'), _HTML_PARSER) if html.strip() else None
+        if wurzel is None:
+            return details
+        beschreibung = wurzel.xpath(f'//*[@id="{ID_DETAIL_BESCHREIBUNG}"]')
+        name = wurzel.xpath(f'//*[@id="{ID_DETAIL_KONTAKT}"]//*[contains(concat(" ", '
+                            f'normalize-space(@class), " "), " {KLASSE_DETAIL_NAME} ")]')
+        if beschreibung:
+            details['beschreibung'] = _text(beschreibung[0])
+        if name:
+            details['kontakt'] = _text(name[0])
+        return details
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    beschreibung = soup.find(id=ID_DETAIL_BESCHREIBUNG)
+    kontakt = soup.find(id=ID_DETAIL_KONTAKT)
+    name = kontakt.select_one(f'.{KLASSE_DETAIL_NAME}') if kontakt else None
+    if beschreibung:
+        details['beschreibung'] = ' '.join(beschreibung.get_text(' ').split())
+    if name:
+        details['kontakt'] = ' '.join(name.get_text(' ').split())
+    return details
+
+
+class ErgebnisParser:
+    """
+    Parser für Suchergebnisseiten
+
+    Args:
+        base_url: Basis für relative Anzeigen-Links
+        kategorisiere: Funktion, die aus Titel und Beschreibung
+            ``(kategorie, tags)`` bestimmt
+        backend: ``'auto'`` (lxml falls verfügbar), ``'lxml'`` oder ``'bs4'``
+    """
+
+    def __init__(self, base_url, kategorisiere: Callable[[str], Tuple[str, List[str]]],
+                 backend='auto'):
+        if backend == 'auto':
+            backend = 'lxml' if LXML_VERFUEGBAR else 'bs4'
+        if backend == 'lxml' and not LXML_VERFUEGBAR:
+            raise ImportError("lxml ist nicht installiert: pip install lxml")
+        if backend not in ('lxml', 'bs4'):
+            raise ValueError(f"Unbekanntes Parser-Backend: {backend}")
+
+        self.base_url = base_url
+        self.kategorisiere = kategorisiere
+        self.backend = backend
+
+    def parse(self, html: Union[str, bytes]) -> List[DienstleistungsAnzeige]:
+        """Extrahiert alle Anzeigen einer Suchergebnisseite"""
+        if isinstance(html, bytes):
+            html = html.decode('utf-8', errors='replace')
+        teilbaum = schneide_anzeigenliste(html)
+        if self.backend == 'lxml':
+            return self._parse_lxml(teilbaum)
+        return self._parse_bs4(teilbaum)
+
+    def _anzeige(self, titel, beschreibung, preis, ort, datum, href):
+        kategorie, tags = self.kategorisiere(f"{titel} {beschreibung}")
+        return DienstleistungsAnzeige(
+            titel=titel,
+            # Vollständige Beschreibung und Kontakt stehen erst auf der Detailseite
+            beschreibung=NichtGeladen(beschreibung),
+            preis=preis or None,
+            ort=ort,
+            kategorie=kategorie,
+            kontakt=NichtGeladen(STANDARD_KONTAKT),
+            url=urljoin(self.base_url, href),
+            datum=datum or None,
+            tags=[kategorie] + [tag for tag in tags if tag != kategorie],
+        )
+
+    def _parse_lxml(self, html):
+        if not html.strip():
+            return []
+        wurzel = etree.fromstring(html.encode('utf-8'), _HTML_PARSER)
+        if wurzel is None:
+            return []
+
+        anzeigen = []
+        for artikel in _XP_ARTIKEL(wurzel):
+            titel_tags = _XP_TITEL(artikel)
+            if not titel_tags:
+                continue
+            felder = dict.fromkeys(_FELD_KLASSEN.values(), '')
+            # Ein Durchlauf über den Artikel statt einer Suche pro Feld
+            for element in artikel.iter():
+                klassen = element.get('class')
+                if not klassen:
+                    continue
+                for klasse in klassen.split():
+                    feld = _FELD_KLASSEN.get(klasse)
+                    if feld is not None and not felder[feld]:
+                        felder[feld] = _text(element)
+
+            anzeigen.append(self._anzeige(
+                titel=_text(titel_tags[0]),
+                href=artikel.get('data-href') or titel_tags[0].get('href', ''),
+                **felder,
+            ))
+        return anzeigen
+
+    def _parse_bs4(self, html):
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('article'))
+        anzeigen = []
+
+        for artikel in soup.select('article.aditem'):
+            titel_tag = artikel.select_one('h2 a')
+            if titel_tag is None:
+                continue
+            felder = {}
+            for klasse, feld in _FELD_KLASSEN.items():
+                treffer = artikel.select_one(f'.{klasse}')
+                felder[feld] = ' '.join(treffer.get_text(' ').split()) if treffer else ''
+
+            anzeigen.append(self._anzeige(
+                titel=' '.join(titel_tag.get_text(' ').split()),
+                href=artikel.get('data-href') or titel_tag.get('href', ''),
+                **felder,
+            ))
+        return anzeigen
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Export
+==============================
+
+Streamende Exporter für Anzeigen: CSV, JSON Lines, JSON, Text und
+optional Parquet (mit ``pyarrow``).
+
+Die Exporter lesen einen Iterator von ``DienstleistungsAnzeige`` (oder
+Dicts) und schreiben in Stücken fester Größe. Auch Millionen Anzeigen
+aus einem ``AnzeigenSpeicher`` werden so mit konstantem Speicher
+exportiert. Optional wird mit gzip oder zstd (mit ``zstandard``)
+komprimiert; die Kompression folgt sonst der Dateiendung
+(``.csv.gz``, ``.jsonl.zst``).
+
+Verwendung:
+    exportiere(speicher.filtere(kategorie='it'), 'it.jsonl.gz')
+
+    python src/export.py anzeigen.db export.csv --kategorie it
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+# Standardfelder für den Export vollständiger Anzeigen
+FELDER = ('titel', 'beschreibung', 'preis', 'preis_betrag', 'preis_einheit', 'ort',
+          'kategorie', 'kontakt', 'url', 'datum', 'tags')
+
+# Anzeigen pro geschriebenem Stück
+STUECK_GROESSE = 1000
+
+_KOMPRESSION_ENDUNGEN = {'.gz': 'gzip', '.zst': 'zstd'}
+
+
+def als_dict(anzeige, felder: Sequence[str] = FELDER) -> dict:
+    """Wandelt eine Anzeige (oder ein Dict) in ein Dict mit ``felder`` um"""
+    if isinstance(anzeige, dict):
+        return {feld: anzeige.get(feld) for feld in felder}
+    zeile = {}
+    for feld in felder:
+        if feld == 'preis_betrag':
+            zeile[feld] = anzeige.preis_info.betrag
+        elif feld == 'preis_einheit':
+            zeile[feld] = anzeige.preis_info.einheit
+        elif feld in ('beschreibung', 'kontakt'):
+            # Kein Nachladen beim Export; vorher ggf. reichere_an() aufrufen
+            zeile[feld] = str(anzeige.roher_wert(feld))
+        else:
+            zeile[feld] = getattr(anzeige, feld)
+    return zeile
+
+
+def erkenne_format(pfad) -> tuple:
+    """Liefert ``(format, kompression)`` anhand der Dateiendung"""
+    basis, endung = os.path.splitext(pfad.lower())
+    kompression = _KOMPRESSION_ENDUNGEN.get(endung)
+    if kompression:
+        basis, endung = os.path.splitext(basis)
+    return endung.lstrip('.') or 'csv', kompression
+
+
+def _stuecke(anzeigen: Iterable, felder, groesse) -> Iterator[List[dict]]:
+    anzeigen = iter(anzeigen)
+    while True:
+        stueck = [als_dict(anzeige, felder) for anzeige in islice(anzeigen, groesse)]
+        if not stueck:
+            return
+        yield stueck
+
+
+def oeffne_ausgabe(pfad, kompression=None):
+    """Öffnet eine binäre Ausgabedatei, optional komprimiert"""
+    if kompression is None:
+        return open(pfad, 'wb')
+    if kompression == 'gzip':
+        return gzip.open(pfad, 'wb', compresslevel=6)
+    if kompression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstd-Kompression benötigt das Paket 'zstandard'")
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(pfad, 'wb'), closefd=True)
+    raise ValueError(f"Unbekannte Kompression: {kompression}")
+
+
+def _text_spalte(wert):
+    if isinstance(wert, list):
+        return ', '.join(str(w) for w in wert)
+    return '' if wert is None else wert
+
+
+def _schreibe_csv(datei, stuecke, felder):
+    writer = csv.writer(datei)
+    writer.writerow(felder)
+    anzahl = 0
+    for stueck in stuecke:
+        writer.writerows([_text_spalte(zeile[feld]) for feld in felder] for zeile in stueck)
+        anzahl += len(stueck)
+    return anzahl
+
+
+def _schreibe_jsonl(datei, stuecke, felder):
+    anzahl = 0
+    for stueck in stuecke:
+        datei.write(''.join(json.dumps(zeile, ensure_ascii=False) + '\n' for zeile in stueck))
+        anzahl += len(stueck)
+    return anzahl
+
+
+def _schreibe_json(datei, stuecke, felder):
+    """JSON-Array, Element für Element geschrieben statt als ein Dokument"""
+    anzahl = 0
+    datei.write('[')
+    for stueck in stuecke:
+        teile = []
+        for zeile in stueck:
+            element = json.dumps(zeile, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+            teile.append(('\n  ' if anzahl == 0 else ',\n  ') + element)
+            anzahl += 1
+        datei.write(''.join(teile))
+    datei.write('\n]\n' if anzahl else ']\n')
+    return anzahl
+
+
+def _schreibe_txt(datei, stuecke, felder):
+    datei.write("Kleinanzeigen Export\n")
+    datei.write("=" * 30 + "\n\n")
+    anzahl = 0
+    for stueck in stuecke:
+        teile = []
+        for zeile in stueck:
+            anzahl += 1
+            teile.append(f"Anzeige {anzahl}:\n")
+            teile.extend(f"  {feld.replace('_', ' ').capitalize()}: {_text_spalte(zeile[feld])}\n"
+                         for feld in felder)
+            teile.append("\n")
+        datei.write(''.join(teile))
+    return anzahl
+
+
+_TEXT_EXPORTER = {
+    'csv': _schreibe_csv,
+    'jsonl': _schreibe_jsonl,
+    'json': _schreibe_json,
+    'txt': _schreibe_txt,
+}
+
+FORMATE = tuple(_TEXT_EXPORTER) + ('parquet',)
+
+
+def _schreibe_parquet(pfad, stuecke, felder, kompression):
+    """Parquet mit einer Row Group pro Stück"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet-Export benötigt das Paket 'pyarrow'")
+
+    typen = {'preis_betrag': pa.float64(), 'tags': pa.list_(pa.string())}
+    schema = pa.schema([(feld, typen.get(feld, pa.string())) for feld in felder])
+    anzahl = 0
+    with pq.ParquetWriter(pfad, schema, compression=kompression or 'snappy') as writer:
+        for stueck in stuecke:
+            writer.write_batch(pa.RecordBatch.from_pylist(stueck, schema=schema))
+            anzahl += len(stueck)
+    return anzahl
+
+
+def _duplikat_index(eindeutig):
+    try:
+        from .duplikate import DuplikatIndex
+    except ImportError:
+        from duplikate import DuplikatIndex
+    return eindeutig if isinstance(eindeutig, DuplikatIndex) else DuplikatIndex()
+
+
+def exportiere(anzeigen: Iterable, pfad, format: Optional[str] = None, felder: Sequence[str] = FELDER,
+               kompression: Optional[str] = None, stueck_groesse=STUECK_GROESSE, eindeutig=False) -> int:
+    """
+    Exportiert Anzeigen streamend in eine Datei
+
+    Args:
+        anzeigen: Iterator von Anzeigen oder Dicts
+        format: csv, jsonl, json, txt oder parquet (sonst aus der Endung)
+        felder: Zu exportierende Felder in dieser Reihenfolge
+        kompression: None, 'gzip' oder 'zstd' (sonst aus der Endung);
+            bei Parquet der interne Codec
+        stueck_groesse: Anzeigen pro geschriebenem Stück
+        eindeutig: Nur eine Anzeige pro Duplikat-Cluster exportieren; auch
+            ein ``DuplikatIndex``, der dann weiterverwendet wird
+
+    Returns:
+        Anzahl exportierter Anzeigen
+    """
+    erkannt, erkannte_kompression = erkenne_format(pfad)
+    format = (format or erkannt).lower()
+    kompression = kompression or erkannte_kompression
+    felder = tuple(felder)
+    # Ein leerer DuplikatIndex ist falsy (__len__), zählt hier aber als Wunsch
+    if eindeutig is not False and eindeutig is not None:
+        anzeigen = _duplikat_index(eindeutig).repraesentanten(anzeigen)
+    stuecke = _stuecke(anzeigen, felder, stueck_groesse)
+
+    if format == 'parquet':
+        return _schreibe_parquet(pfad, stuecke, felder, kompression)
+    if format not in _TEXT_EXPORTER:
+        raise ValueError(f"Unbekanntes Exportformat: {format}")
+
+    # Der TextIOWrapper schließt beim Verlassen auch die (komprimierte) Datei
+    datei = io.TextIOWrapper(oeffne_ausgabe(pfad, kompression), encoding='utf-8',
+                             newline='' if format == 'csv' else None)
+    with datei:
+        return _TEXT_EXPORTER[format](datei, stuecke, felder)
+
+
+def main(argv=None):
+    """Exportiert Anzeigen aus einem ``AnzeigenSpeicher``"""
+    parser = argparse.ArgumentParser(description="Exportiert gespeicherte Anzeigen (CSV, JSONL, JSON, TXT, Parquet)")
+    parser.add_argument('datenbank', help="SQLite-Datei des AnzeigenSpeichers")
+    parser.add_argument('ziel', help="Zieldatei, z. B. export.csv oder export.jsonl.gz")
+    parser.add_argument('--format', choices=FORMATE)
+    parser.add_argument('--kompression', choices=('gzip', 'zstd'))
+    parser.add_argument('--kategorie')
+    parser.add_argument('--ort')
+    parser.add_argument('--min-preis', type=float)
+    parser.add_argument('--max-preis', type=float)
+    parser.add_argument('--text', help="Volltextsuche in Titel und Beschreibung")
+    parser.add_argument('--eindeutig', action='store_true', help="Mehrfach eingestellte Anzeigen nur einmal")
+    parser.add_argument('--profil', metavar='VERZEICHNIS',
+                        help="CPU- und Speicherprofil des Exports in VERZEICHNIS schreiben")
+    args = parser.parse_args(argv)
+
+    # Erst nach dem Parsen: --help lädt weder sqlite3 noch den Speicher
+    try:
+        from .speicher import AnzeigenSpeicher
+        from .profil import profiliere
+    except ImportError:
+        from speicher import AnzeigenSpeicher
+        from profil import profiliere
+
+    if not os.path.exists(args.datenbank):
+        print(f"❌ Datenbank nicht gefunden: {args.datenbank}")
+        return 1
+
+    with profiliere('export', args.profil), AnzeigenSpeicher(args.datenbank) as speicher:
+        anzeigen = speicher.filtere(kategorie=args.kategorie, ort=args.ort, min_preis=args.min_preis,
+                                    max_preis=args.max_preis, text=args.text)
+        try:
+            anzahl = exportiere(anzeigen, args.ziel, format=args.format, kompression=args.kompression,
+                                eindeutig=args.eindeutig)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+    print(f"💾 {anzahl} Anzeigen exportiert: {args.ziel}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
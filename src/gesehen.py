@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Gesehene Anzeigen
+=========================================
+
+Persistenter Speicher bereits gesehener Anzeigen für Neu-Alarme.
+
+- SQLite ist die Quelle der Wahrheit und übersteht Neustarts
+- Ein Bloom-Filter im Speicher beantwortet "noch nie gesehen" ohne
+  Datenbankzugriff; nur mögliche Treffer werden in SQLite geprüft
+- Batch-Abfragen für eine ganze Ergebnisseite
+- Optional getrennte Bereiche (z. B. pro Alarm): dieselbe Anzeige ist
+  dann für jeden Bereich einmal neu
+- Alte Einträge können ausgealtert werden
+
+Verwendung:
+    with GesehenSpeicher("gesehen.db") as gesehen:
+        neue = gesehen.neue(anzeigen)
+"""
+
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+# Anzeigen-ID in Kleinanzeigen-URLs: /s-anzeige/<titel>/<id>-<kategorie>-<ort>
+_ANZEIGEN_ID = re.compile(r'/s-anzeige/(?:[^/]*/)?(\d+)(?:-\d+-\d+)?/?$')
+# Schneller Weg für vollständige Anzeigen-URLs ohne urlparse
+_ANZEIGEN_URL = re.compile(
+    r'(?:https?://)?(?:www\.)?([^/?#]+)/s-anzeige/(?:[^/?#]*/)?(\d+)(?:-\d+-\d+)?/?(?:[?#].*)?$', re.I)
+_TRACKING_PARAMETER = ('utm_', 'fbclid', 'gclid')
+
+# SQLite begrenzt die Anzahl gebundener Parameter pro Anweisung
+_BATCH = 500
+
+
+def _mit_bereich(schluessel, bereich):
+    return f"{bereich}|{schluessel}" if bereich else schluessel
+
+
+def normalisiere_url(url):
+    """
+    Normalisiert eine Anzeigen-URL zu einem stabilen Schlüssel
+
+    Kleinanzeigen-Anzeigen werden auf ihre ID reduziert, sodass geänderte
+    Titel im Pfad dieselbe Anzeige bleiben. Sonst werden Schema,
+    ``www.``, Fragment, Tracking-Parameter und abschließende ``/`` entfernt.
+    """
+    url = url.strip()
+    schnell = _ANZEIGEN_URL.match(url)
+    if schnell:
+        return f"{schnell.group(1).lower()}/s-anzeige/{schnell.group(2)}"
+
+    teile = urlparse(url)
+    host = teile.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+
+    treffer = _ANZEIGEN_ID.search(teile.path)
+    if treffer:
+        return f"{host}/s-anzeige/{treffer.group(1)}"
+
+    parameter = sorted((k, v) for k, v in parse_qsl(teile.query)
+                       if not k.startswith(_TRACKING_PARAMETER))
+    schluessel = host + (teile.path.rstrip('/') or '/')
+    if parameter:
+        schluessel += '?' + urlencode(parameter)
+    return schluessel
+
+
+class BloomFilter:
+    """
+    Bloom-Filter mit Double-Hashing
+
+    Args:
+        kapazitaet: Erwartete Anzahl Einträge
+        fehlerrate: Gewünschte Falsch-Positiv-Rate bei voller Kapazität
+    """
+
+    def __init__(self, kapazitaet, fehlerrate=0.01):
+        self.kapazitaet = max(1, kapazitaet)
+        self.fehlerrate = fehlerrate
+        self.bits = max(64, int(-self.kapazitaet * math.log(fehlerrate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / self.kapazitaet * math.log(2)))
+        self.anzahl = 0
+        self._daten = bytearray((self.bits + 7) // 8)
+
+    def _positionen(self, schluessel):
+        digest = hashlib.blake2b(schluessel.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def hinzufuegen(self, schluessel):
+        for position in self._positionen(schluessel):
+            self._daten[position >> 3] |= 1 << (position & 7)
+        self.anzahl += 1
+
+    def __contains__(self, schluessel):
+        daten = self._daten
+        return all(daten[position >> 3] & (1 << (position & 7))
+                   for position in self._positionen(schluessel))
+
+
+class GesehenSpeicher:
+    """
+    Persistente Menge gesehener Anzeigen mit Bloom-Filter davor
+
+    Args:
+        pfad: SQLite-Datei (``':memory:'`` für flüchtige Nutzung)
+        erwartete_anzahl: Startkapazität des Bloom-Filters; er wird
+            automatisch vergrößert, wenn mehr Einträge hinzukommen
+        fehlerrate: Falsch-Positiv-Rate des Bloom-Filters
+    """
+
+    def __init__(self, pfad='gesehen.db', erwartete_anzahl=100_000, fehlerrate=0.01):
+        self.pfad = pfad
+        self.fehlerrate = fehlerrate
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(pfad, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS gesehen (
+                schluessel TEXT PRIMARY KEY,
+                zuerst REAL NOT NULL,
+                zuletzt REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._db.execute('CREATE INDEX IF NOT EXISTS gesehen_zuletzt ON gesehen (zuletzt)')
+        self._db.commit()
+
+        self._anzahl = self._db.execute('SELECT COUNT(*) FROM gesehen').fetchone()[0]
+        self._bloom = self._baue_bloom(max(erwartete_anzahl, self._anzahl * 2))
+
+    def _baue_bloom(self, kapazitaet):
+        bloom = BloomFilter(kapazitaet, self.fehlerrate)
+        for (schluessel,) in self._db.execute('SELECT schluessel FROM gesehen'):
+            bloom.hinzufuegen(schluessel)
+        return bloom
+
+    def __len__(self):
+        return self._anzahl
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.schliessen()
+
+    def schliessen(self):
+        """Schließt die Datenbank"""
+        with self._lock:
+            self._db.close()
+
+    def enthaelt(self, url, bereich=None) -> bool:
+        """Prüft, ob eine URL bereits gesehen wurde"""
+        return self.enthaelt_viele([url], bereich)[0]
+
+    def enthaelt_viele(self, urls: Sequence[str], bereich=None) -> List[bool]:
+        """
+        Prüft viele URLs auf einmal
+
+        Nur URLs, die der Bloom-Filter nicht ausschließt, werden mit
+        einer gemeinsamen Abfrage in SQLite nachgeschlagen.
+        """
+        schluessel = [_mit_bereich(normalisiere_url(url), bereich) for url in urls]
+        with self._lock:
+            vorhanden = self._vorhandene(schluessel)
+        return [s in vorhanden for s in schluessel]
+
+    def _vorhandene(self, schluessel: Iterable[str]) -> set:
+        """Schlüssel, die in SQLite stehen (Lock gehalten)"""
+        moeglich = list({s for s in schluessel if s in self._bloom})
+        vorhanden = set()
+        for start in range(0, len(moeglich), _BATCH):
+            teil = moeglich[start:start + _BATCH]
+            platzhalter = ','.join('?' * len(teil))
+            vorhanden.update(zeile[0] for zeile in self._db.execute(
+                f'SELECT schluessel FROM gesehen WHERE schluessel IN ({platzhalter})', teil))
+        return vorhanden
+
+    def markiere(self, urls: Iterable[str], zeitpunkt: Optional[float] = None, bereich=None):
+        """Markiert URLs als gesehen und aktualisiert ihren Zeitstempel"""
+        zeitpunkt = time.time() if zeitpunkt is None else zeitpunkt
+        schluessel = {_mit_bereich(normalisiere_url(url), bereich) for url in urls}
+        if not schluessel:
+            return
+
+        with self._lock:
+            self._trage_ein(schluessel, zeitpunkt)
+
+    def vergiss(self, urls: Iterable[str], bereich=None) -> int:
+        """
+        Entfernt URLs wieder, z. B. wenn eine Meldung nicht zugestellt wurde
+
+        Der Bloom-Filter behält die Einträge; er liefert dann nur einen
+        möglichen Treffer, den SQLite verneint. Liefert die Anzahl
+        entfernter Einträge.
+        """
+        schluessel = {_mit_bereich(normalisiere_url(url), bereich) for url in urls}
+        with self._lock:
+            with self._db:
+                geloescht = sum(self._db.execute('DELETE FROM gesehen WHERE schluessel = ?', (s,)).rowcount
+                                for s in schluessel)
+            self._anzahl -= geloescht
+        return geloescht
+
+    def _trage_ein(self, schluessel: Iterable[str], zeitpunkt) -> set:
+        """
+        Fügt Schlüssel ein und liefert die bisher unbekannten (Lock gehalten)
+
+        ``INSERT OR IGNORE`` entscheidet pro Schlüssel anhand der
+        geänderten Zeilen, ob er neu ist; Prüfen und Eintragen sind so ein
+        Schritt. Bekannte Schlüssel bekommen einen neuen ``zuletzt``-Wert.
+        """
+        neu = set()
+        with self._db:
+            for s in schluessel:
+                if self._db.execute('INSERT OR IGNORE INTO gesehen (schluessel, zuerst, zuletzt) '
+                                    'VALUES (?, ?, ?)', (s, zeitpunkt, zeitpunkt)).rowcount:
+                    neu.add(s)
+            self._db.executemany('UPDATE gesehen SET zuletzt = ? WHERE schluessel = ?',
+                                 ((zeitpunkt, s) for s in schluessel if s not in neu))
+        self._anzahl += len(neu)
+
+        if self._anzahl > self._bloom.kapazitaet:
+            self._bloom = self._baue_bloom(self._anzahl * 2)
+        else:
+            for s in neu:
+                self._bloom.hinzufuegen(s)
+        return neu
+
+    def neue(self, anzeigen, markieren=True, bereich=None) -> list:
+        """
+        Liefert die noch nicht gesehenen Anzeigen einer Ergebnisseite
+
+        Doppelte Anzeigen innerhalb der Seite werden nur einmal geliefert.
+        Mit ``markieren`` werden Prüfen und Markieren unter einem Lock
+        erledigt; parallele Aufrufe liefern eine Anzeige also nur einmal.
+
+        Args:
+            markieren: Die neuen Anzeigen gleich als gesehen speichern
+            bereich: Getrennter Namensraum, z. B. der Name eines Alarms
+        """
+        anzeigen = list(anzeigen)
+        schluessel = [_mit_bereich(normalisiere_url(anzeige.url), bereich) for anzeige in anzeigen]
+        if markieren:
+            with self._lock:
+                unbekannt = self._trage_ein(dict.fromkeys(schluessel), time.time())
+        else:
+            with self._lock:
+                vorhanden = self._vorhandene(schluessel)
+            unbekannt = set(schluessel) - vorhanden
+
+        neue = []
+        for anzeige, s in zip(anzeigen, schluessel):
+            if s in unbekannt:
+                unbekannt.discard(s)
+                neue.append(anzeige)
+        return neue
+
+    def altere_aus(self, max_alter_sekunden) -> int:
+        """
+        Entfernt Einträge, die länger als ``max_alter_sekunden`` nicht gesehen wurden
+
+        Der Bloom-Filter wird danach neu aufgebaut. Liefert die Anzahl
+        gelöschter Einträge.
+        """
+        grenze = time.time() - max_alter_sekunden
+        with self._lock:
+            with self._db:
+                geloescht = self._db.execute('DELETE FROM gesehen WHERE zuletzt < ?', (grenze,)).rowcount
+            if geloescht:
+                self._anzahl -= geloescht
+                self._bloom = self._baue_bloom(max(self._bloom.kapazitaet, self._anzahl * 2))
+        return geloescht
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Hintergrundsuche
+========================================
+
+Führt Suchaufträge außerhalb des GUI-Threads aus.
+
+Der Arbeiter lädt die Ergebnisseiten in einem eigenen Thread und legt
+jede geparste Seite sofort als Meldung in eine threadsichere Queue.
+Die GUI leert die Queue per Timer (``after``) und zeigt Ergebnisse so
+bereits nach der ersten Seite an. Laufende Aufträge können abgebrochen
+werden; der Abbruch greift vor der nächsten Seite.
+
+Verwendung:
+    arbeiter = HintergrundArbeiter(scraper)
+    arbeiter.starte("Handwerker", "Berlin", max_seiten=3)
+    for meldung in arbeiter.hole_meldungen():
+        ...
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from itertools import count
+from typing import Callable, Iterable, List, Optional
+
+# Meldungsarten
+MELDUNG_ANZEIGEN = 'anzeigen'
+MELDUNG_FERTIG = 'fertig'
+MELDUNG_ABGEBROCHEN = 'abgebrochen'
+MELDUNG_FEHLER = 'fehler'
+
+
+@dataclass
+class Fortschritt:
+    """Stand eines Suchauftrags"""
+    seiten_fertig: int = 0
+    seiten_gesamt: int = 0
+    anzeigen: int = 0
+    start: float = field(default_factory=time.monotonic)
+    ende: Optional[float] = None
+
+    @property
+    def dauer(self):
+        return (self.ende or time.monotonic()) - self.start
+
+    @property
+    def anzeigen_pro_sekunde(self):
+        dauer = self.dauer
+        return self.anzeigen / dauer if dauer > 0 else 0.0
+
+
+@dataclass
+class Meldung:
+    """Nachricht aus dem Arbeiter-Thread an die GUI"""
+    auftrag: int
+    art: str
+    anzeigen: List = field(default_factory=list)
+    fortschritt: Optional[Fortschritt] = None
+    fehler: Optional[BaseException] = None
+
+
+class Suchauftrag:
+    """
+    Ein laufender Auftrag in seinem eigenen Thread
+
+    Args:
+        nummer: Laufende Nummer zur Zuordnung der Meldungen
+        seiten: Callable, das einen Iterator über Anzeigen pro Seite liefert
+        seiten_gesamt: Erwartete Seitenzahl für die Fortschrittsanzeige
+        ausgang: Queue für die Meldungen
+    """
+
+    def __init__(self, nummer, seiten: Callable[[], Iterable[list]], seiten_gesamt, ausgang: queue.Queue):
+        self.nummer = nummer
+        self._seiten = seiten
+        self._ausgang = ausgang
+        self._abbruch = threading.Event()
+        self.fortschritt = Fortschritt(seiten_gesamt=seiten_gesamt)
+        self._thread = threading.Thread(target=self._lauf, name=f'suchauftrag-{nummer}', daemon=True)
+
+    def starte(self):
+        self._thread.start()
+        return self
+
+    def abbrechen(self):
+        """Fordert den Abbruch an; der Thread endet vor der nächsten Seite"""
+        self._abbruch.set()
+
+    @property
+    def abgebrochen(self):
+        return self._abbruch.is_set()
+
+    @property
+    def laeuft(self):
+        return self._thread.is_alive()
+
+    def warte(self, timeout=None):
+        self._thread.join(timeout)
+
+    def _melde(self, art, **daten):
+        # Kopie des Fortschritts, damit die GUI keinen halb aktualisierten Stand liest
+        self._ausgang.put(Meldung(self.nummer, art, fortschritt=replace(self.fortschritt), **daten))
+
+    def _lauf(self):
+        fortschritt = self.fortschritt
+        try:
+            for anzeigen in self._seiten():
+                if self.abgebrochen:
+                    break
+                fortschritt.seiten_fertig += 1
+                fortschritt.anzeigen += len(anzeigen)
+                self._melde(MELDUNG_ANZEIGEN, anzeigen=list(anzeigen))
+        except Exception as e:
+            fortschritt.ende = time.monotonic()
+            self._melde(MELDUNG_FEHLER, fehler=e)
+            return
+
+        fortschritt.ende = time.monotonic()
+        self._melde(MELDUNG_ABGEBROCHEN if self.abgebrochen else MELDUNG_FERTIG)
+
+
+class HintergrundArbeiter:
+    """
+    Startet Suchaufträge im Hintergrund und sammelt ihre Meldungen
+
+    Es läuft immer höchstens ein Auftrag; ein neuer Start bricht den
+    vorherigen ab. Meldungen abgebrochener Aufträge werden beim Abholen
+    verworfen.
+    """
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self._meldungen: queue.Queue = queue.Queue()
+        self._nummern = count(1)
+        self.auftrag: Optional[Suchauftrag] = None
+
+    @property
+    def laeuft(self):
+        return self.auftrag is not None and self.auftrag.laeuft
+
+    def starte(self, suchbegriff, ort="", max_seiten=3, demo=False) -> Suchauftrag:
+        """
+        Startet eine Suche
+
+        Args:
+            demo: Beispieldaten statt echter Anfragen (eine Seite)
+        """
+        if demo:
+            def seiten():
+                yield self.scraper.demo_extrahiere_anzeigen(suchbegriff, ort, max_seiten)
+            seiten_gesamt = 1
+        else:
+            def seiten():
+                return self.scraper.iter_seiten(suchbegriff, ort, max_seiten)
+            seiten_gesamt = max_seiten
+        return self.starte_auftrag(seiten, seiten_gesamt)
+
+    def starte_auftrag(self, seiten: Callable[[], Iterable[list]], seiten_gesamt=0) -> Suchauftrag:
+        """Startet einen Auftrag mit beliebiger Seitenquelle"""
+        self.abbrechen()
+        self.auftrag = Suchauftrag(next(self._nummern), seiten, seiten_gesamt, self._meldungen).starte()
+        return self.auftrag
+
+    def abbrechen(self):
+        """Bricht den laufenden Auftrag ab"""
+        if self.auftrag is not None:
+            self.auftrag.abbrechen()
+
+    def hole_meldungen(self, max_anzahl=100) -> List[Meldung]:
+        """
+        Holt wartende Meldungen, ohne zu blockieren
+
+        Für den GUI-Timer gedacht; ``max_anzahl`` begrenzt die Arbeit
+        pro Aufruf.
+        """
+        meldungen = []
+        aktuell = self.auftrag.nummer if self.auftrag is not None else None
+        while len(meldungen) < max_anzahl:
+            try:
+                meldung = self._meldungen.get_nowait()
+            except queue.Empty:
+                break
+            if meldung.auftrag == aktuell:
+                meldungen.append(meldung)
+        return meldungen
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - HTTP-Cache
+==================================
+
+Festplatten-Cache für bedingte HTTP-Anfragen unter der Scraper-Session.
+
+- Speichert Antworten mit ``ETag`` bzw. ``Last-Modified``, außer bei
+  ``Cache-Control: no-store``; ``private`` ist erlaubt, der Cache gehört
+  nur diesem Scraper
+- Sendet ``If-None-Match``/``If-Modified-Since`` bei erneutem Abruf
+- Beantwortet ``304 Not Modified`` aus dem Cache
+- Begrenzt Größe und Anzahl der Einträge mit LRU-Verdrängung
+- Zählt Treffer, Revalidierungen und Fehlschläge
+
+Verwendung:
+    cache = HttpCache("~/.cache/kleinanzeigen", max_bytes=200 * 1024 * 1024)
+    scraper = KleinanzeigenScraper(http_cache=cache)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Header, die zusammen mit dem Inhalt gespeichert werden
+GESPEICHERTE_HEADER = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date')
+
+# Direktiven in Cache-Control; verankert, damit s-maxage nicht als max-age zählt
+_MAX_AGE = re.compile(r'(?:^|,)\s*max-age=(\d+)', re.I)
+_NO_CACHE = re.compile(r'(?:^|,)\s*no-cache\b', re.I)
+_NO_STORE = re.compile(r'(?:^|,)\s*no-store\b', re.I)
+
+
+@dataclass
+class CacheStatistik:
+    """Zähler des HTTP-Caches"""
+    treffer: int = 0
+    revalidierungen: int = 0
+    fehlschlaege: int = 0
+    gesparte_bytes: int = 0
+    verdraengt: int = 0
+
+    def als_dict(self):
+        return asdict(self)
+
+
+class HttpCache:
+    """
+    HTTP-Cache auf der Festplatte mit bedingten Anfragen
+
+    Args:
+        verzeichnis: Ablageort der Cache-Dateien
+        max_bytes: Maximale Gesamtgröße der gespeicherten Inhalte
+        max_eintraege: Maximale Anzahl gespeicherter URLs
+    """
+
+    def __init__(self, verzeichnis, max_bytes=100 * 1024 * 1024, max_eintraege=10000):
+        self.verzeichnis = os.path.expanduser(verzeichnis)
+        self.max_bytes = max_bytes
+        self.max_eintraege = max_eintraege
+        self.statistik = CacheStatistik()
+        self._lock = threading.Lock()
+        # Schlüssel -> Größe, älteste Nutzung zuerst
+        self._lru: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+
+        os.makedirs(self.verzeichnis, exist_ok=True)
+        self._lade_index()
+
+    def _lade_index(self):
+        """Baut den LRU-Index aus den vorhandenen Metadaten auf"""
+        eintraege = []
+        for name in os.listdir(self.verzeichnis):
+            if not name.endswith('.json'):
+                continue
+            schluessel = name[:-5]
+            try:
+                stat = os.stat(self._pfad(schluessel, '.body'))
+            except OSError:
+                continue
+            eintraege.append((stat.st_mtime, schluessel, stat.st_size))
+
+        for _, schluessel, groesse in sorted(eintraege):
+            self._lru[schluessel] = groesse
+            self._bytes += groesse
+
+    def _pfad(self, schluessel, endung):
+        return os.path.join(self.verzeichnis, schluessel + endung)
+
+    @staticmethod
+    def _schluessel(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _lies(self, schluessel):
+        try:
+            with open(self._pfad(schluessel, '.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(self._pfad(schluessel, '.body'), 'rb') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    @staticmethod
+    def _schreibe_atomar(pfad, daten):
+        tmp = f"{pfad}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(daten)
+        os.replace(tmp, pfad)
+
+    def hole(self, session, url, timeout=None):
+        """
+        Lädt eine URL über den Cache
+
+        Die zurückgegebene ``requests.Response`` hat zusätzlich das
+        Attribut ``cache_status`` (``'treffer'``, ``'revalidiert'`` oder
+        ``'fehlschlag'``). Antworten aus dem Cache haben Status 200.
+        """
+        schluessel = self._schluessel(url)
+        with self._lock:
+            bekannt = schluessel in self._lru
+        meta, body = self._lies(schluessel) if bekannt else (None, None)
+
+        if meta is not None and self._ist_frisch(meta):
+            self._beruehre(schluessel)
+            with self._lock:
+                self.statistik.treffer += 1
+                self.statistik.gesparte_bytes += len(body)
+            return self._antwort(url, meta, body, 'treffer')
+
+        headers = {}
+        if meta is not None:
+            if meta['headers'].get('ETag'):
+                headers['If-None-Match'] = meta['headers']['ETag']
+            if meta['headers'].get('Last-Modified'):
+                headers['If-Modified-Since'] = meta['headers']['Last-Modified']
+
+        response = session.get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and meta is not None:
+            for name in GESPEICHERTE_HEADER:
+                if name in response.headers:
+                    meta['headers'][name] = response.headers[name]
+            meta['gespeichert'] = time.time()
+            self._speichere_meta(schluessel, meta)
+            self._beruehre(schluessel)
+            with self._lock:
+                self.statistik.revalidierungen += 1
+                self.statistik.gesparte_bytes += len(body)
+            return self._antwort(url, meta, body, 'revalidiert')
+
+        with self._lock:
+            self.statistik.fehlschlaege += 1
+        if _NO_STORE.search(response.headers.get('Cache-Control', '')):
+            if meta is not None:
+                self._entferne(schluessel)
+        elif response.status_code == 200 and (
+                response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            self._speichere(schluessel, url, response)
+        response.cache_status = 'fehlschlag'
+        return response
+
+    @staticmethod
+    def _ist_frisch(meta):
+        cache_control = meta['headers'].get('Cache-Control', '')
+        treffer = _MAX_AGE.search(cache_control)
+        if not treffer or _NO_CACHE.search(cache_control):
+            return False
+        return time.time() - meta['gespeichert'] < int(treffer.group(1))
+
+    @staticmethod
+    def _antwort(url, meta, body, cache_status):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.encoding = meta.get('encoding')
+        response._content = body
+        response.cache_status = cache_status
+        return response
+
+    def _speichere_meta(self, schluessel, meta):
+        self._schreibe_atomar(self._pfad(schluessel, '.json'),
+                              json.dumps(meta).encode('utf-8'))
+
+    def _speichere(self, schluessel, url, response):
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+        meta = {
+            'url': url,
+            'encoding': response.encoding,
+            'gespeichert': time.time(),
+            'headers': {name: response.headers[name]
+                        for name in GESPEICHERTE_HEADER if name in response.headers},
+        }
+        self._schreibe_atomar(self._pfad(schluessel, '.body'), body)
+        self._speichere_meta(schluessel, meta)
+
+        with self._lock:
+            self._bytes += len(body) - self._lru.pop(schluessel, 0)
+            self._lru[schluessel] = len(body)
+            verdraengt = self._verdraenge()
+        for alt in verdraengt:
+            self._loesche_dateien(alt)
+
+    def _beruehre(self, schluessel):
+        """Markiert einen Eintrag als zuletzt genutzt"""
+        with self._lock:
+            if schluessel in self._lru:
+                self._lru.move_to_end(schluessel)
+        try:
+            os.utime(self._pfad(schluessel, '.body'))
+        except OSError:
+            pass
+
+    def _verdraenge(self):
+        """Entfernt die ältesten Einträge bis die Limits eingehalten sind (Lock gehalten)"""
+        verdraengt = []
+        while self._lru and (self._bytes > self.max_bytes or len(self._lru) > self.max_eintraege):
+            schluessel, groesse = self._lru.popitem(last=False)
+            self._bytes -= groesse
+            self.statistik.verdraengt += 1
+            verdraengt.append(schluessel)
+        return verdraengt
+
+    def _entferne(self, schluessel):
+        """Entfernt einen Eintrag aus Index und Verzeichnis"""
+        with self._lock:
+            self._bytes -= self._lru.pop(schluessel, 0)
+        self._loesche_dateien(schluessel)
+
+    def _loesche_dateien(self, schluessel):
+        for endung in ('.json', '.body'):
+            try:
+                os.remove(self._pfad(schluessel, endung))
+            except OSError:
+                pass
+
+    def leeren(self):
+        """Löscht alle Einträge"""
+        with self._lock:
+            schluessel = list(self._lru)
+            self._lru.clear()
+            self._bytes = 0
+        for eintrag in schluessel:
+            self._loesche_dateien(eintrag)
+
+    @property
+    def groesse(self):
+        """Aktuelle Gesamtgröße der Inhalte in Bytes"""
+        return self._bytes
+
+    def __len__(self):
+        return len(self._lru)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Kategorisierung
+=======================================
+
+Kompilierter Mehrfach-Keyword-Matcher für die Kategoriebestimmung.
+
+Alle Keywords werden einmal zu einem Trie-förmigen regulären Ausdruck
+zusammengefasst. Ein einziger Durchlauf über den Text findet alle
+Treffer; Kategorie und Tags ergeben sich daraus ohne verschachtelte
+Schleifen über die Keyword-Liste.
+"""
+
+import re
+from itertools import accumulate
+from typing import Dict, Iterable, List, Tuple
+
+STANDARD_KATEGORIE = 'sonstige'
+
+# Trennt Texte im Batch-Modus; kann in keinem Keyword vorkommen
+_TRENNER = '\x00'
+
+
+def _trie_muster(woerter):
+    """Baut aus einer Wortliste ein Regex-Muster mit gemeinsamen Präfixen"""
+    trie = {}
+    for wort in woerter:
+        knoten = trie
+        for zeichen in wort:
+            knoten = knoten.setdefault(zeichen, {})
+        knoten[''] = True
+
+    def muster(knoten):
+        ende = '' in knoten
+        zweige = [re.escape(zeichen) + muster(kind)
+                  for zeichen, kind in sorted(knoten.items()) if zeichen]
+        if not zweige:
+            return ''
+        if len(zweige) == 1 and not ende:
+            return zweige[0]
+        gruppe = '(?:' + '|'.join(zweige) + ')'
+        # Längere Treffer zuerst, das Wortende ist optional
+        return gruppe + '?' if ende else gruppe
+
+    return muster(trie)
+
+
+class Kategorisierer:
+    """
+    Bestimmt Kategorie und Tags eines Textes in einem Durchlauf
+
+    Die Kategorie entspricht der ersten Kategorie (in Reihenfolge von
+    ``kategorien``), von der mindestens ein Keyword im Text vorkommt.
+
+    Args:
+        kategorien: Zuordnung Kategorie -> Keywords
+        standard: Kategorie, wenn kein Keyword gefunden wird
+    """
+
+    def __init__(self, kategorien: Dict[str, List[str]], standard=STANDARD_KATEGORIE):
+        self.standard = standard
+        self._kategorien: List[str] = list(kategorien)
+
+        # Keyword -> Rang der Kategorien, in denen es vorkommt
+        raenge: Dict[str, List[int]] = {}
+        for rang, keywords in enumerate(kategorien.values()):
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword:
+                    raenge.setdefault(keyword, []).append(rang)
+
+        # Der Regex liefert pro Position nur den längsten Treffer;
+        # kürzere Keywords mit gleichem Anfang werden hier ergänzt
+        self._treffer: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+        for keyword in raenge:
+            enthalten = [k for k in raenge if keyword.startswith(k)]
+            bester_rang = min(r for k in enthalten for r in raenge[k])
+            self._treffer[keyword] = (bester_rang, tuple(sorted(enthalten, key=len)))
+
+        if raenge:
+            self._regex = re.compile('(?=(' + _trie_muster(raenge) + '))')
+        else:
+            self._regex = None
+
+    def _auswerten(self, gefunden: Iterable[str]) -> Tuple[str, List[str]]:
+        bester_rang = len(self._kategorien)
+        tags: Dict[str, None] = {}
+        for keyword in gefunden:
+            rang, enthalten = self._treffer[keyword]
+            if rang < bester_rang:
+                bester_rang = rang
+            for tag in enthalten:
+                tags[tag] = None
+
+        if bester_rang == len(self._kategorien):
+            return self.standard, []
+        return self._kategorien[bester_rang], list(tags)
+
+    def finde(self, text) -> Tuple[str, List[str]]:
+        """Liefert ``(kategorie, gefundene_keywords)`` für einen Text"""
+        if self._regex is None:
+            return self.standard, []
+        return self._auswerten(m.group(1) for m in self._regex.finditer(text.lower()))
+
+    def kategorie(self, text) -> str:
+        """Liefert nur die Kategorie eines Textes"""
+        return self.finde(text)[0]
+
+    def finde_viele(self, texte: Iterable[str]) -> List[Tuple[str, List[str]]]:
+        """
+        Kategorisiert viele Texte auf einmal
+
+        Die Texte werden verbunden und in einem einzigen Regex-Durchlauf
+        durchsucht; die Treffer werden anschließend den Texten zugeordnet.
+        """
+        texte = [text.replace(_TRENNER, ' ').lower() for text in texte]
+        if self._regex is None:
+            return [(self.standard, []) for _ in texte]
+
+        enden = list(accumulate(len(text) + 1 for text in texte))
+        gefunden: List[List[str]] = [[] for _ in texte]
+
+        # Treffer kommen in Textreihenfolge, daher genügt ein Zeiger
+        index = 0
+        for m in self._regex.finditer(_TRENNER.join(texte)):
+            start = m.start()
+            while start >= enden[index]:
+                index += 1
+            gefunden[index].append(m.group(1))
+
+        return [self._auswerten(treffer) if treffer else (self.standard, [])
+                for treffer in gefunden]
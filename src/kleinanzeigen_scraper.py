@@ -9,17 +9,115 @@ Dieses Modul demonstriert die Grundstruktur des Scrapers.
 Für die vollständige Funktionalität sind zusätzliche Module erforderlich.
 """
 
-import requests
-from bs4 import BeautifulSoup
+import queue
+import threading
 import time
-import re
-from urllib.parse import urljoin
+import sys
+from collections import OrderedDict
+from urllib.parse import quote
 from dataclasses import dataclass
 from typing import List, Optional
 
-@dataclass
+try:
+    from .rate_limiter import RateLimiter
+    from .robots import RobotsCache, RobotsVerbot
+    from .kategorisierung import Kategorisierer
+    from .preise import PreisIndex, parse_preis
+    from .abfrage import Abfrage
+    from .ortsindex import OrtsIndex
+    from .metriken import Metriken
+    from .profil import aktiviere, mit_profil
+    from .transport import Transport
+except ImportError:
+    from rate_limiter import RateLimiter
+    from robots import RobotsCache, RobotsVerbot
+    from kategorisierung import Kategorisierer
+    from preise import PreisIndex, parse_preis
+    from abfrage import Abfrage
+    from ortsindex import OrtsIndex
+    from metriken import Metriken
+    from profil import aktiviere, mit_profil
+    from transport import Transport
+
+# Felder, die vollständig erst auf der Detailseite stehen
+DETAIL_FELDER = ('beschreibung', 'kontakt')
+ANZEIGE_FELDER = ('titel', 'beschreibung', 'preis', 'ort', 'kategorie', 'kontakt', 'url', 'datum', 'tags')
+# Mögliche Modulnamen von speicher.py (Paket- oder Skriptimport)
+_SPEICHER_MODULE = (f"{__package__}.speicher", 'speicher') if __package__ else ('speicher',)
+
+
+def _ist_speicher(objekt):
+    """
+    ``isinstance(objekt, AnzeigenSpeicher)``, ohne speicher.py zu importieren
+
+    Solange das Modul (und damit sqlite3) nicht geladen ist, kann es
+    keinen ``AnzeigenSpeicher`` geben.
+    """
+    for name in _SPEICHER_MODULE:
+        modul = sys.modules.get(name)
+        if modul is not None and isinstance(objekt, getattr(modul, 'AnzeigenSpeicher', ())):
+            return True
+    return False
+
+
+class NichtGeladen(str):
+    """
+    Platzhalter für ein noch nicht geladenes Detailfeld
+
+    Enthält den Wert aus der Ergebnisliste (z. B. den Beschreibungsanfang)
+    und verhält sich überall wie dieser Text.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"NichtGeladen({str.__repr__(self)})"
+
+
+class _Detailfeld:
+    """Lädt ein Detailfeld beim ersten Zugriff über den gebundenen Lader nach"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, anzeige, klasse=None):
+        if anzeige is None:
+            return self
+        wert = anzeige.__dict__[self.name]
+        if type(wert) is NichtGeladen:
+            lader = anzeige.__dict__.get('_details_lader')
+            if lader is not None:
+                lader(anzeige)
+                wert = anzeige.__dict__[self.name]
+        return wert
+
+    def __set__(self, anzeige, wert):
+        anzeige.__dict__[self.name] = wert
+
+
+class _PreisFeld:
+    """``preis`` mit ``preis_info``, das bei jeder Zuweisung neu geparst wird"""
+
+    def __get__(self, anzeige, klasse=None):
+        if anzeige is None:
+            return self
+        return anzeige.__dict__['preis']
+
+    def __set__(self, anzeige, wert):
+        anzeige.__dict__['preis'] = wert
+        anzeige.__dict__['preis_info'] = parse_preis(wert)
+
+
+@dataclass(repr=False)
 class DienstleistungsAnzeige:
-    """Datenklasse für eine Dienstleistungsanzeige"""
+    """
+    Datenklasse für eine Dienstleistungsanzeige
+
+    ``beschreibung`` und ``kontakt`` können ``NichtGeladen`` sein; sie
+    werden dann beim ersten Zugriff von der Detailseite nachgeladen,
+    sofern ein Scraper die Anzeige erzeugt hat. Schlägt das fehl, bleibt
+    der Listenwert stehen und ``details_fehler`` enthält den Fehler.
+    """
     titel: str
     beschreibung: str
     preis: Optional[str]
@@ -29,28 +127,92 @@ class DienstleistungsAnzeige:
     url: str
     datum: Optional[str]
     tags: List[str]
+    # preis_info (``Preis``) wird bei jeder Zuweisung an ``preis`` geparst
+    # Fehlermeldung, wenn das Nachladen der Detailseite fehlgeschlagen ist
+    details_fehler = None
+
+    def roher_wert(self, feld):
+        """Feldwert ohne Nachladen (ggf. der ``NichtGeladen``-Platzhalter)"""
+        return self.__dict__[feld]
+
+    @property
+    def details_geladen(self):
+        return not any(type(self.__dict__[feld]) is NichtGeladen for feld in DETAIL_FELDER)
+
+    def __getstate__(self):
+        # Der Lader hängt am Scraper (Session, Locks) und wird nicht mitkopiert
+        zustand = dict(self.__dict__)
+        zustand.pop('_details_lader', None)
+        return zustand
+
+    def _rohe_werte(self):
+        return tuple(self.__dict__[name] for name in ANZEIGE_FELDER)
+
+    def __eq__(self, anderes):
+        # Ohne Nachladen; verglichen werden die Rohwerte
+        if anderes.__class__ is not self.__class__:
+            return NotImplemented
+        return self._rohe_werte() == anderes._rohe_werte()
+
+    __hash__ = None
+
+    def __repr__(self):
+        # Ohne Nachladen, damit Debug-Ausgaben keine Anfragen auslösen
+        werte = ', '.join(f"{name}={wert!r}" for name, wert in zip(ANZEIGE_FELDER, self._rohe_werte()))
+        return f"DienstleistungsAnzeige({werte})"
+
+
+for _feld in DETAIL_FELDER:
+    setattr(DienstleistungsAnzeige, _feld, _Detailfeld(_feld))
+DienstleistungsAnzeige.preis = _PreisFeld()
+
 
 class KleinanzeigenScraper:
     """
     Hauptklasse für das Scraping von Kleinanzeigen
     
     Diese Klasse implementiert respektvolle Scraping-Praktiken:
-    - Wartezeiten zwischen Anfragen
+    - Adaptive Wartezeiten zwischen Anfragen (Token-Bucket pro Host)
     - Beachtung von robots.txt
     - User-Agent-Header
     - Fehlerbehandlung
     """
     
-    def __init__(self, base_url="https://www.kleinanzeigen.de"):
+    # Anzahl geparster Ergebnisseiten, die für 304-Antworten vorgehalten werden
+    MAX_GEPARSTE_SEITEN = 256
+    # Seiten, die iter_seiten lädt, während die vorherige geparst wird
+    VORAUSLADEN = 1
+    # Anzeigen auf einer vollen Ergebnisseite; weniger heißt: letzte Seite
+    VOLLE_SEITE = 25
+    # Anzahl Detailseiten-Ergebnisse im Speicher
+    MAX_DETAILS = 4096
+
+    def __init__(self, base_url="https://www.kleinanzeigen.de", timeout=10, rate_limiter=None,
+                 http_cache=None, parser_backend='auto', parse_prozesse=0, metriken=None,
+                 transport=None):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; KleinanzeigenScraper/1.0)',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'de-DE,de;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter(standard_intervall=2.0)
+        self.http_cache = http_cache
+        self._geparste_seiten = OrderedDict()
+        self.parser_backend = parser_backend
+        self._ergebnis_parser = None
+        self.parse_prozesse = parse_prozesse
+        self._parse_pool = None
+        self._details = OrderedDict()
+        self._details_laufend = {}
+        self._details_lock = threading.Lock()
+        self._kategorisierer = None
+        self._duplikate = None
+        # Stufen-Zeiten, Bytes und Statuscodes (statistik() / prometheus())
+        self.metriken = metriken or Metriken()
+        self.robots = RobotsCache(self._lade_robots_txt, user_agent='KleinanzeigenScraper',
+                                  nach_laden=self._uebernehme_crawl_delay)
+        # Verbindungspools und HTTP-Version (transport.py); ohne eigene
+        # Metriken zählt der Transport in die des Scrapers
+        if transport is not None and transport.metriken is None:
+            transport.metriken = self.metriken
+        self._transport = transport
         
         # Dienstleistungskategorien
         self.kategorien = {
@@ -64,18 +226,421 @@ class KleinanzeigenScraper:
             'it': ['computer', 'programmierung', 'website', 'technik'],
         }
 
+    @property
+    def transport(self):
+        """
+        HTTP-Transport (wird beim ersten Zugriff angelegt)
+
+        ``requests`` wird erst mit der ersten Session importiert, damit
+        ``import`` und ``--help`` kurzlebiger Skripte nicht dafür bezahlen.
+        """
+        if self._transport is None:
+            self._transport = Transport(metriken=self.metriken)
+        return self._transport
+
+    @property
+    def session(self):
+        """HTTP-Session des Transports"""
+        return self.transport.session
+
+    @session.setter
+    def session(self, session):
+        self._transport = Transport(metriken=self.metriken, session=session)
+
     def respektiere_robots_txt(self, url):
-        """Einfache robots.txt Überprüfung"""
+        """
+        Prüft eine URL gegen die gecachten robots.txt-Regeln ihres Hosts
+
+        Als Stufe ``robots`` zählt nur die Prüfung. Das Laden fehlender
+        Regeln zählt bereits zu ``rate_limit`` und ``abruf`` und läuft
+        deshalb vorher, damit die Anteile zusammen höchstens 100 % ergeben.
+        """
+        self.robots.regeln(url)
+        with self.metriken.stufe('robots'):
+            return self.robots.erlaubt(url)
+
+    def pruefe_robots_txt(self, url):
+        """Wirft ``RobotsVerbot``, wenn robots.txt die URL verbietet"""
+        if not self.respektiere_robots_txt(url):
+            raise RobotsVerbot(f"robots.txt verbietet {url}")
+
+    def _lade_robots_txt(self, robots_url):
+        """Lädt robots.txt für den RobotsCache"""
+        self.warte_zwischen_anfragen(url=robots_url)
+        response = self._sende(robots_url, timeout=5)
+        return response.status_code, response.text
+
+    def _uebernehme_crawl_delay(self, host_url, regeln):
+        """Gibt den Crawl-delay aus robots.txt an den Rate-Limiter weiter"""
+        if regeln.crawl_delay:
+            self.rate_limiter.setze_crawl_delay(host_url, regeln.crawl_delay)
+
+    def warte_zwischen_anfragen(self, sekunden=None, url=None):
+        """
+        Wartezeit zwischen Anfragen für respektvolles Scraping
+
+        Zieht ein Token aus dem Rate-Limiter für den Host der URL
+        (Standard: base_url). ``sekunden`` erzwingt zusätzlich einen
+        festen Mindestabstand zur vorherigen Anfrage.
+        """
+        with self.metriken.stufe('rate_limit'):
+            return self.rate_limiter.warte(url or self.base_url, min_abstand=sekunden)
+
+    def _sende(self, url, timeout=None):
+        """Führt eine GET-Anfrage aus und meldet das Ergebnis an Rate-Limiter und Metriken"""
+        import requests
+        start = time.monotonic()
         try:
-            robots_url = urljoin(url, '/robots.txt')
-            response = self.session.get(robots_url, timeout=5)
-            return 'Disallow: /' not in response.text
-        except:
-            return True
+            if self.http_cache is not None:
+                response = self.http_cache.hole(self.session, url, timeout=timeout or self.timeout)
+            else:
+                response = self.session.get(url, timeout=timeout or self.timeout)
+        except requests.RequestException:
+            dauer = time.monotonic() - start
+            self.rate_limiter.melde_antwort(url, None, dauer)
+            self.metriken.beobachte_stufe('abruf', dauer)
+            self.metriken.zaehle('fehler_total')
+            raise
+
+        dauer = time.monotonic() - start
+        cache_status = getattr(response, 'cache_status', None)
+        if cache_status == 'treffer':
+            # Ohne Netzverkehr: weder Antwort noch Abruf noch Rückmeldung an den Rate-Limiter
+            self.metriken.zaehle('cache_total', status=cache_status)
+            return response
+        if cache_status == 'revalidiert':
+            # Über die Leitung kam nur ein 304 ohne Inhalt
+            self.metriken.zaehle('cache_total', status=cache_status)
+            status, anzahl_bytes = 304, 0
+        else:
+            status, anzahl_bytes = response.status_code, len(response.content)
+        self.rate_limiter.melde_antwort(url, status, dauer, response.headers.get('Retry-After'))
+        self.metriken.beobachte_stufe('abruf', dauer)
+        self.metriken.antwort(status, anzahl_bytes)
+        return response
+
+    def baue_such_url(self, suchbegriff, ort="", seite=1):
+        """Baut die URL einer Suchergebnisseite"""
+        teile = []
+        if ort:
+            teile.append(quote(ort.strip().lower().replace(' ', '-')))
+        if seite > 1:
+            teile.append(f"seite:{seite}")
+        begriff = quote(suchbegriff.strip().lower().replace(' ', '-'))
+        return f"{self.base_url}/s-{'/'.join(teile + [begriff])}/k0"
+
+    def _hole(self, url):
+        """
+        Prüft robots.txt, wartet auf den Rate-Limiter und lädt eine URL
+
+        Die Regeln des Hosts (und sein ``Crawl-delay``) werden dabei vor
+        der ersten Anfrage geladen.
+        """
+        self.pruefe_robots_txt(url)
+        self.warte_zwischen_anfragen(url=url)
+        response = self._sende(url)
+        response.raise_for_status()
+        return response
+
+    def hole_seite(self, url):
+        """Lädt eine Seite und gibt den HTML-Text zurück"""
+        return self._hole(url).text
+
+    def lade_ergebnisseite(self, url):
+        """Lädt und parst eine Suchergebnisseite"""
+        return self._parse_antwort(url, self._hole(url))
+
+    def _parse_antwort(self, url, response):
+        """
+        Parst eine Ergebnisseite oder nutzt das gemerkte Ergebnis
+
+        Bei unveränderten Seiten aus dem HTTP-Cache wird das zuletzt
+        geparste Ergebnis wiederverwendet, ohne das HTML erneut zu parsen.
+        """
+        gemerkt = self._gemerkte_seite(url, response)
+        if gemerkt is not None:
+            self.metriken.seite(len(gemerkt))
+            return gemerkt
+        with self.metriken.stufe('parsen'):
+            if self.parse_pool is not None:
+                anzeigen = self.parse_pool.parse(response.content)
+            else:
+                anzeigen = self.parse_ergebnisseite(response.text)
+        self.metriken.seite(len(anzeigen))
+        return self._merke_seite(url, response, anzeigen)
+
+    def _gemerkte_seite(self, url, response):
+        """Gemerktes Parse-Ergebnis für eine unveränderte Seite aus dem HTTP-Cache"""
+        if getattr(response, 'cache_status', None) in ('treffer', 'revalidiert'):
+            validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+            gemerkt = self._geparste_seiten.get(url)
+            if gemerkt is not None and gemerkt[0] == validator:
+                self._geparste_seiten.move_to_end(url)
+                return list(gemerkt[1])
+        return None
+
+    def _merke_seite(self, url, response, anzeigen):
+        """Bindet den Detail-Lader und merkt ein Parse-Ergebnis, wenn die Seite einen Validator hat"""
+        for anzeige in anzeigen:
+            anzeige._details_lader = self._lade_details_beim_zugriff
+        validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+        if self.http_cache is not None and validator:
+            self._geparste_seiten[url] = (validator, anzeigen)
+            self._geparste_seiten.move_to_end(url)
+            while len(self._geparste_seiten) > self.MAX_GEPARSTE_SEITEN:
+                self._geparste_seiten.popitem(last=False)
+            anzeigen = list(anzeigen)
+        return anzeigen
+
+    def lade_details(self, anzeige):
+        """
+        Lädt Beschreibung und Kontakt einer Anzeige von ihrer Detailseite
+
+        Ergebnisse werden pro URL zwischengespeichert; gleichzeitige
+        Aufrufe für dieselbe URL teilen sich eine Anfrage.
+        """
+        with self._details_lock:
+            details = self._details.get(anzeige.url)
+            if details is not None:
+                self._details.move_to_end(anzeige.url)
+                laufend = None
+            else:
+                laufend = self._details_laufend.get(anzeige.url)
+                eigene = laufend is None
+                if eigene:
+                    laufend = self._details_laufend[anzeige.url] = threading.Event()
 
-    def warte_zwischen_anfragen(self, sekunden=2):
-        """Wartezeit zwischen Anfragen für respektvolles Scraping"""
-        time.sleep(sekunden)
+        if details is None and not eigene:
+            laufend.wait()
+            with self._details_lock:
+                details = self._details.get(anzeige.url)
+            if details is None:
+                # Die andere Anfrage ist fehlgeschlagen; selbst versuchen
+                return self.lade_details(anzeige)
+
+        if details is None:
+            try:
+                try:
+                    from .ergebnis_parser import parse_detailseite
+                except ImportError:
+                    from ergebnis_parser import parse_detailseite
+                details = parse_detailseite(self._hole(anzeige.url).content)
+                with self._details_lock:
+                    self._details[anzeige.url] = details
+                    while len(self._details) > self.MAX_DETAILS:
+                        self._details.popitem(last=False)
+            finally:
+                with self._details_lock:
+                    del self._details_laufend[anzeige.url]
+                laufend.set()
+
+        nachholen = anzeige.details_fehler is not None
+        for feld in DETAIL_FELDER:
+            wert = anzeige.roher_wert(feld)
+            if type(wert) is NichtGeladen or nachholen:
+                # Ohne Treffer auf der Detailseite bleibt der Listenwert, gilt aber als geladen
+                setattr(anzeige, feld, details.get(feld) or str(wert))
+        anzeige.details_fehler = None
+        return anzeige
+
+    def _lade_details_beim_zugriff(self, anzeige):
+        """
+        Lader für den ersten Feldzugriff
+
+        Bei einem Fehler bleibt der Listenwert als geladen stehen, damit
+        nicht jeder weitere Zugriff erneut anfragt (und wartet). Der
+        Fehler steht in ``anzeige.details_fehler`` und wird als
+        ``details_fehler_total`` gezählt; ``lade_details`` holt nach.
+        """
+        import requests
+        try:
+            self.lade_details(anzeige)
+        except (requests.RequestException, RobotsVerbot) as e:
+            for feld in DETAIL_FELDER:
+                wert = anzeige.roher_wert(feld)
+                if type(wert) is NichtGeladen:
+                    setattr(anzeige, feld, str(wert))
+            anzeige.details_fehler = str(e)
+            self.metriken.zaehle('details_fehler_total')
+
+    def reichere_an(self, anzeigen, felder=DETAIL_FELDER, max_parallel=4):
+        """
+        Lädt Detailfelder vieler Anzeigen mit begrenzter Parallelität
+
+        Nur Anzeigen, bei denen eines der ``felder`` noch nicht geladen
+        ist, kosten eine Anfrage. Am besten erst nach dem Filtern aufrufen.
+
+        Args:
+            felder: Benötigte Felder aus ``DETAIL_FELDER``
+            max_parallel: Höchstens so viele Detailanfragen gleichzeitig
+        """
+        anzeigen = list(anzeigen)
+        offen = [anzeige for anzeige in anzeigen
+                 if anzeige.details_fehler is not None
+                 or any(type(anzeige.roher_wert(feld)) is NichtGeladen for feld in felder)]
+        if len(offen) == 1 or max_parallel <= 1:
+            for anzeige in offen:
+                self.lade_details(anzeige)
+        elif offen:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix='kleinanzeigen-details') as pool:
+                list(pool.map(self.lade_details, offen))
+        return anzeigen
+
+    # Englischer Alias
+    def enrich(self, anzeigen, fields=DETAIL_FELDER, max_parallel=4):
+        return self.reichere_an(anzeigen, felder=fields, max_parallel=max_parallel)
+
+    @property
+    def parse_pool(self):
+        """
+        Prozesspool für das Parsen, wenn ``parse_prozesse`` gesetzt ist
+
+        Mit ``parse_prozesse=0`` (Standard) wird im aufrufenden Thread
+        geparst; eine positive Zahl startet so viele Worker-Prozesse.
+        """
+        if self._parse_pool is None and self.parse_prozesse:
+            try:
+                from .parse_prozesse import ParseProzesse
+            except ImportError:
+                from parse_prozesse import ParseProzesse
+            self._parse_pool = ParseProzesse(self.base_url, self._kategorien, self.parse_prozesse,
+                                             backend=self.parser_backend).aufwaermen()
+        return self._parse_pool
+
+    def _schliesse_parse_pool(self):
+        if self._parse_pool is not None:
+            self._parse_pool.schliessen()
+            self._parse_pool = None
+
+    @property
+    def ergebnis_parser(self):
+        """Parser für Suchergebnisseiten (lxml, sonst BeautifulSoup)"""
+        if self._ergebnis_parser is None:
+            try:
+                from .ergebnis_parser import ErgebnisParser
+            except ImportError:
+                from ergebnis_parser import ErgebnisParser
+            self._ergebnis_parser = ErgebnisParser(self.base_url, self.bestimme_kategorie_und_tags,
+                                                   backend=self.parser_backend)
+        return self._ergebnis_parser
+
+    def parse_ergebnisseite(self, html):
+        """Extrahiert alle Anzeigen einer Suchergebnisseite"""
+        return self.ergebnis_parser.parse(html)
+
+    def iter_seiten(self, suchbegriff, ort="", max_seiten=3, vorausladen=None):
+        """
+        Liefert die Anzeigen einer Suche Seite für Seite
+
+        Ein Lade-Thread wartet die Pause des Rate-Limiters für Seite N+1
+        ab, während Seite N geparst wird, und lädt sie, während der
+        Aufrufer Seite N verarbeitet; eine begrenzte Queue (``vorausladen``
+        Seiten) liegt zwischen beiden Stufen. Eine leere oder nicht volle
+        Seite beendet die Suche: Der Lade-Thread fragt Seite N+1 erst an,
+        wenn Seite N geparst und voll ist.
+
+        Args:
+            vorausladen: Seiten, die vorab geladen werden dürfen
+                (Standard: ``VORAUSLADEN``; 0 lädt streng nacheinander)
+        """
+        vorausladen = self.VORAUSLADEN if vorausladen is None else vorausladen
+        urls = [self.baue_such_url(suchbegriff, ort, seite) for seite in range(1, max_seiten + 1)]
+        freigabe = None
+        if vorausladen <= 0 or max_seiten <= 1:
+            antworten = ((url, self._hole(url)) for url in urls)
+        else:
+            freigabe = threading.Semaphore(0)
+            antworten = self._lade_voraus(urls, vorausladen, freigabe)
+
+        volle_seite = None
+        try:
+            for url, response in antworten:
+                seiten_anzeigen = self._parse_antwort(url, response)
+                if not seiten_anzeigen:
+                    return
+                if volle_seite is None:
+                    volle_seite = len(seiten_anzeigen)
+                letzte = len(seiten_anzeigen) < volle_seite
+                if freigabe is not None and not letzte:
+                    freigabe.release()
+                yield seiten_anzeigen
+                if letzte:
+                    return
+        finally:
+            antworten.close()
+
+    def _lade_voraus(self, urls, vorausladen, freigabe=None):
+        """
+        Lädt ``urls`` in einem Hintergrund-Thread in eine begrenzte Queue
+
+        Liefert ``(url, response)``-Paare in Reihenfolge. Mit ``freigabe``
+        (Semaphore) wird jede weitere Anfrage erst nach einem ``release()``
+        des Verbrauchers gesendet. Wird der Generator geschlossen, stoppt
+        der Lade-Thread vor der nächsten Anfrage.
+        """
+        fertig = object()
+        puffer = queue.Queue(maxsize=vorausladen)
+        stopp = threading.Event()
+
+        def ablegen(eintrag):
+            while not stopp.is_set():
+                try:
+                    puffer.put(eintrag, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def freigegeben():
+            while not stopp.is_set():
+                if freigabe.acquire(timeout=0.1):
+                    return True
+            return False
+
+        def laden():
+            try:
+                for nummer, url in enumerate(urls):
+                    self.pruefe_robots_txt(url)
+                    self.warte_zwischen_anfragen(url=url)
+                    if nummer and freigabe is not None and not freigegeben():
+                        return
+                    if stopp.is_set():
+                        return
+                    response = self._sende(url)
+                    response.raise_for_status()
+                    if not ablegen((url, response)):
+                        return
+            except Exception as e:
+                ablegen(e)
+                return
+            ablegen(fertig)
+
+        lader = threading.Thread(target=laden, name='seiten-vorausladen', daemon=True)
+        lader.start()
+        try:
+            while True:
+                eintrag = puffer.get()
+                if eintrag is fertig:
+                    return
+                if isinstance(eintrag, Exception):
+                    raise eintrag
+                yield eintrag
+        finally:
+            stopp.set()
+
+    def extrahiere_anzeigen(self, suchbegriff, ort="", max_seiten=3):
+        """
+        Extrahiert Anzeigen seitenweise von der Ergebnisliste
+
+        Die Seiten werden nacheinander geladen; der Rate-Limiter sorgt
+        für die Wartezeit zwischen zwei Anfragen. Eine leere Seite
+        beendet die Suche.
+        """
+        anzeigen = []
+        for seiten_anzeigen in self.iter_seiten(suchbegriff, ort, max_seiten):
+            anzeigen.extend(seiten_anzeigen)
+        return anzeigen
 
     def demo_extrahiere_anzeigen(self, suchbegriff, ort="", max_seiten=3):
         """
@@ -168,58 +733,141 @@ class KleinanzeigenScraper:
         print(f"✅ Demo abgeschlossen: {len(demo_anzeigen)} Anzeigen gefunden")
         return demo_anzeigen
 
+    @property
+    def kategorien(self):
+        """Kategorien mit ihren Keywords"""
+        return self._kategorien
+
+    @kategorien.setter
+    def kategorien(self, kategorien):
+        self._kategorien = kategorien
+        self._kategorisierer = None
+        # Worker-Prozesse haben die alten Kategorien geladen
+        self._schliesse_parse_pool()
+
+    @property
+    def kategorisierer(self):
+        """
+        Kompilierter Matcher für ``kategorien``
+
+        Wird bei einer Zuweisung an ``kategorien`` neu gebaut. Nach
+        Änderungen am bestehenden Dictionary ``kategorien_geaendert()`` aufrufen.
+        """
+        if self._kategorisierer is None:
+            self._kategorisierer = Kategorisierer(self._kategorien)
+        return self._kategorisierer
+
+    def kategorien_geaendert(self):
+        """Verwirft den kompilierten Matcher nach Änderungen an ``kategorien``"""
+        self._kategorisierer = None
+        self._schliesse_parse_pool()
+
     def bestimme_kategorie(self, text):
         """Bestimmt die Kategorie basierend auf dem Text"""
-        text_lower = text.lower()
-        
-        for kategorie, keywords in self.kategorien.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return kategorie
-        
-        return 'sonstige'
+        return self.kategorisierer.kategorie(text)
+
+    def bestimme_kategorie_und_tags(self, text):
+        """Bestimmt Kategorie und gefundene Keywords in einem Durchlauf"""
+        return self.kategorisierer.finde(text)
+
+    def bestimme_kategorien(self, texte):
+        """Batch-Variante: liefert ``(kategorie, tags)`` für jeden Text"""
+        return self.kategorisierer.finde_viele(texte)
+
+    def kategorisiere_anzeigen(self, anzeigen: List[DienstleistungsAnzeige]):
+        """Setzt Kategorie und Tags vieler Anzeigen anhand von Titel und Beschreibung"""
+        with self.metriken.stufe('kategorisieren'):
+            ergebnisse = self.bestimme_kategorien(f"{a.titel} {a.roher_wert('beschreibung')}" for a in anzeigen)
+            for anzeige, (kategorie, tags) in zip(anzeigen, ergebnisse):
+                anzeige.kategorie = kategorie
+                anzeige.tags = [kategorie] + [tag for tag in tags if tag != kategorie]
+        return anzeigen
+
+    @property
+    def duplikate(self):
+        """Duplikat-Index über alle hier entdoppelten Anzeigen (wird bei Bedarf angelegt)"""
+        if self._duplikate is None:
+            try:
+                from .duplikate import DuplikatIndex
+            except ImportError:
+                from duplikate import DuplikatIndex
+            self._duplikate = DuplikatIndex()
+        return self._duplikate
+
+    def entferne_duplikate(self, anzeigen) -> List[DienstleistungsAnzeige]:
+        """Behält je Duplikat-Cluster nur die erste Anzeige"""
+        return list(self.duplikate.repraesentanten(anzeigen))
+
+    def abfrage(self, anzeigen):
+        """
+        Startet eine verkettbare Filter-Abfrage
+
+        Beispiel:
+            scraper.abfrage(anzeigen).kategorie('it').ort('berlin').preis(max=60).limit(10)
+
+        ``eindeutig()`` nutzt den Duplikat-Index des Scrapers.
+        """
+        # Der Index (und damit sqlite3) wird erst mit eindeutig() angelegt
+        return Abfrage(anzeigen, duplikate=lambda: self.duplikate)
+
+    # Englischer Alias
+    query = abfrage
 
     def filtere_nach_kategorie(self, anzeigen: List[DienstleistungsAnzeige], kategorie: str):
-        """Filtert Anzeigen nach Kategorie"""
-        return [anzeige for anzeige in anzeigen if anzeige.kategorie == kategorie]
+        """Filtert Anzeigen nach Kategorie (auch direkt in einem ``AnzeigenSpeicher``)"""
+        with self.metriken.stufe('filtern'):
+            if _ist_speicher(anzeigen):
+                return anzeigen.filtere_nach_kategorie(kategorie)
+            return [anzeige for anzeige in anzeigen if anzeige.kategorie == kategorie]
 
     def filtere_nach_ort(self, anzeigen: List[DienstleistungsAnzeige], ort: str):
-        """Filtert Anzeigen nach Ort"""
-        return [anzeige for anzeige in anzeigen if ort.lower() in anzeige.ort.lower()]
+        """
+        Filtert Anzeigen nach Ort
 
-    def filtere_nach_preisspanne(self, anzeigen: List[DienstleistungsAnzeige], min_preis=None, max_preis=None):
-        """Filtert Anzeigen nach Preisspanne"""
-        if min_preis is None and max_preis is None:
-            return anzeigen
-        
-        gefilterte_anzeigen = []
-        
-        for anzeige in anzeigen:
-            preis_text = anzeige.preis
-            # Extrahiere Preis aus Text
-            preis_match = re.search(r'(\d+(?:,\d+)?)', preis_text.replace('.', ''))
-            
-            if preis_match:
-                try:
-                    preis = float(preis_match.group(1).replace(',', '.'))
-                    
-                    if min_preis is not None and preis < min_preis:
-                        continue
-                    if max_preis is not None and preis > max_preis:
-                        continue
-                    
-                    gefilterte_anzeigen.append(anzeige)
-                except ValueError:
-                    # Wenn Preis nicht konvertierbar, trotzdem hinzufügen
-                    gefilterte_anzeigen.append(anzeige)
-            else:
-                # Wenn kein Preis erkennbar, hinzufügen
-                gefilterte_anzeigen.append(anzeige)
-        
-        return gefilterte_anzeigen
+        Listen werden einmal durchlaufen. Für wiederholte Abfragen über
+        dieselben Anzeigen einen ``OrtsIndex(anzeigen)`` anlegen und
+        übergeben (oder einen ``AnzeigenSpeicher``).
+        """
+        with self.metriken.stufe('filtern'):
+            if _ist_speicher(anzeigen):
+                return anzeigen.filtere_nach_ort(ort)
+            if isinstance(anzeigen, OrtsIndex):
+                return anzeigen.filtere(ort)
+            ort_klein = ort.lower()
+            return [anzeige for anzeige in anzeigen if ort_klein in anzeige.ort.lower()]
+
+    def filtere_nach_preisspanne(self, anzeigen: List[DienstleistungsAnzeige], min_preis=None, max_preis=None,
+                                 ohne_preis_behalten=True):
+        """
+        Filtert Anzeigen nach Preisspanne
+
+        Listen werden einmal durchlaufen. Für wiederholte Abfragen über
+        dieselben Anzeigen einen ``PreisIndex(anzeigen)`` anlegen und
+        übergeben (oder einen ``AnzeigenSpeicher``).
+
+        Args:
+            ohne_preis_behalten: Anzeigen ohne erkennbaren Betrag
+                (z. B. "Auf Anfrage") behalten
+        """
+        with self.metriken.stufe('filtern'):
+            if _ist_speicher(anzeigen):
+                return anzeigen.filtere_nach_preisspanne(min_preis, max_preis, ohne_preis_behalten)
+            if min_preis is None and max_preis is None:
+                return anzeigen
+
+            if isinstance(anzeigen, PreisIndex):
+                return anzeigen.bereich(min_preis, max_preis, ohne_preis_behalten)
+            return [
+                anzeige for anzeige in anzeigen
+                if (anzeige.preis_info.betrag is None and ohne_preis_behalten)
+                or (anzeige.preis_info.betrag is not None
+                    and (min_preis is None or anzeige.preis_info.betrag >= min_preis)
+                    and (max_preis is None or anzeige.preis_info.betrag <= max_preis))
+            ]
 
 # Demo-Funktion
-def main():
+@mit_profil('scraper')
+def demo():
     """Demo der Scraper-Funktionalität"""
     print("🔍 Kleinanzeigen Scraper - Demo")
     print("=" * 40)
@@ -252,5 +900,16 @@ def main():
     print(f"\n💡 Hinweis: Dies ist eine Demo-Version!")
     print(f"   Für echtes Scraping installieren Sie die Vollversion.")
 
+def main(argv=None):
+    """Einstiegspunkt der Demo (``--profil VERZEICHNIS`` schaltet Profiling ein)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Kleinanzeigen Scraper - Demo")
+    parser.add_argument('--profil', metavar='VERZEICHNIS', help="CPU- und Speicherprofil in VERZEICHNIS schreiben")
+    args = parser.parse_args(argv)
+    if args.profil:
+        aktiviere(args.profil)
+    demo()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
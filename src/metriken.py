@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Metriken
+================================
+
+Zeitmessungen und Zähler für die Stufen eines Scrape-Laufs.
+
+- Stufen: ``robots``, ``rate_limit``, ``abruf``, ``parsen``,
+  ``kategorisieren``, ``filtern``, ``speichern`` (Dauer als Histogramm)
+- Zähler: übertragene Bytes und HTTP-Antworten nach Statuscode, neu
+  aufgebaute Verbindungen pro Host und Bytes auf der Leitung
+  (komprimiert, vom Transport gezählt); Antworten aus dem HTTP-Cache
+  werden getrennt gezählt und nicht als Netzverkehr
+- Anzeigen pro Ergebnisseite als Histogramm
+
+Abrufbar als Dictionary (``statistik()``) oder im Textformat von
+Prometheus (``prometheus()``, optional per HTTP über ``starte_server``).
+So lässt sich ablesen, ob ein Lauf am Netz, am Rate-Limiter oder an der
+CPU hängt.
+
+Verwendung:
+    with metriken.stufe('parsen'):
+        anzeigen = parser.parse(html)
+    metriken.zaehle('bytes', len(html))
+    print(metriken.statistik()['stufen']['parsen']['p95_s'])
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence, Tuple
+
+STUFEN = ('robots', 'rate_limit', 'abruf', 'parsen', 'kategorisieren', 'filtern', 'speichern')
+
+# Obere Bucket-Grenzen (inklusive) wie bei Prometheus-Histogrammen
+GRENZEN_SEKUNDEN = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+GRENZEN_ANZEIGEN = (0, 1, 5, 10, 15, 20, 25, 30, 50, 100)
+
+PRAEFIX = 'kleinanzeigen_'
+_BESCHREIBUNG = {
+    'stufe_sekunden': 'Dauer der Scraper-Stufen in Sekunden',
+    'anzeigen_pro_seite': 'Anzahl Anzeigen pro Ergebnisseite',
+    'bytes_total': 'Übertragene Bytes (Antwortinhalt, entpackt)',
+    'bytes_netz_total': 'Empfangene Bytes auf der Leitung (komprimiert)',
+    'verbindungen_neu_total': 'Neu aufgebaute Verbindungen pro Host',
+    'http_version_total': 'HTTP-Antworten nach Protokollversion',
+    'http_antworten_total': 'HTTP-Antworten nach Statuscode',
+    'fehler_total': 'Fehlgeschlagene Anfragen',
+    'cache_total': 'Antworten aus dem HTTP-Cache (treffer: ohne Anfrage, revalidiert: 304)',
+    'details_fehler_total': 'Detailseiten, die beim Zugriff nicht geladen werden konnten',
+}
+
+
+class Histogramm:
+    """Zählt Beobachtungen in festen Buckets, dazu Summe und Maximum"""
+
+    __slots__ = ('grenzen', 'buckets', 'anzahl', 'summe', 'maximum')
+
+    def __init__(self, grenzen: Sequence[float] = GRENZEN_SEKUNDEN):
+        self.grenzen = tuple(grenzen)
+        # Letzter Bucket: über der höchsten Grenze (+Inf)
+        self.buckets = [0] * (len(self.grenzen) + 1)
+        self.anzahl = 0
+        self.summe = 0.0
+        self.maximum = 0.0
+
+    def beobachte(self, wert):
+        self.buckets[bisect_left(self.grenzen, wert)] += 1
+        self.anzahl += 1
+        self.summe += wert
+        if wert > self.maximum:
+            self.maximum = wert
+
+    def quantil(self, q) -> Optional[float]:
+        """
+        Schätzt ein Quantil durch lineare Interpolation im Bucket
+
+        Wie ``histogram_quantile`` bei Prometheus; im obersten Bucket
+        wird bis zum beobachteten Maximum interpoliert.
+        """
+        if not self.anzahl:
+            return None
+        rang = q * self.anzahl
+        kumuliert = 0
+        for i, anzahl in enumerate(self.buckets):
+            if anzahl and kumuliert + anzahl >= rang:
+                unten = self.grenzen[i - 1] if i else 0.0
+                oben = self.grenzen[i] if i < len(self.grenzen) else self.maximum
+                oben = min(oben, self.maximum)
+                return unten + (oben - unten) * max(rang - kumuliert, 0) / anzahl
+            kumuliert += anzahl
+        return self.maximum
+
+    def als_dict(self, einheit='') -> dict:
+        mittel = self.summe / self.anzahl if self.anzahl else None
+        return {
+            'anzahl': self.anzahl,
+            f'summe{einheit}': self.summe,
+            f'mittel{einheit}': mittel,
+            f'p50{einheit}': self.quantil(0.5),
+            f'p95{einheit}': self.quantil(0.95),
+            f'max{einheit}': self.maximum if self.anzahl else None,
+        }
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...], **zusatz) -> str:
+    paare = list(labels) + list(zusatz.items())
+    if not paare:
+        return ''
+    return '{' + ','.join(f'{name}="{_maskiere(wert)}"' for name, wert in paare) + '}'
+
+
+def _maskiere(wert) -> str:
+    return str(wert).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _zahl(wert) -> str:
+    return repr(float(wert)) if isinstance(wert, float) else str(wert)
+
+
+class Metriken:
+    """
+    Thread-sichere Sammlung von Stufen-Zeiten, Histogrammen und Zählern
+
+    Eine Instanz pro Scraper (``scraper.metriken``); mehrere Scraper
+    können sich eine Instanz teilen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histogramme: Dict[Tuple[str, tuple], Histogramm] = {}
+        self._zaehler: Dict[Tuple[str, tuple], float] = {}
+        self.seit = time.time()
+
+    @contextmanager
+    def stufe(self, name):
+        """Misst die Dauer des ``with``-Blocks als Stufe ``name``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.beobachte_stufe(name, time.perf_counter() - start)
+
+    def beobachte_stufe(self, name, sekunden):
+        self.beobachte('stufe_sekunden', sekunden, stufe=name)
+
+    def beobachte(self, metrik, wert, grenzen: Sequence[float] = GRENZEN_SEKUNDEN, **labels):
+        """Trägt einen Wert in das Histogramm ``metrik`` (mit ``labels``) ein"""
+        schluessel = (metrik, tuple(sorted(labels.items())))
+        with self._lock:
+            histogramm = self._histogramme.get(schluessel)
+            if histogramm is None:
+                histogramm = self._histogramme[schluessel] = Histogramm(grenzen)
+            histogramm.beobachte(wert)
+
+    def zaehle(self, metrik, wert=1, **labels):
+        """Erhöht den Zähler ``metrik`` (mit ``labels``) um ``wert``"""
+        schluessel = (metrik, tuple(sorted(labels.items())))
+        with self._lock:
+            self._zaehler[schluessel] = self._zaehler.get(schluessel, 0) + wert
+
+    def antwort(self, status, anzahl_bytes):
+        """Zählt eine HTTP-Antwort mit Statuscode und Inhaltsgröße"""
+        self.zaehle('http_antworten_total', status=status)
+        self.zaehle('bytes_total', anzahl_bytes)
+
+    def seite(self, anzahl_anzeigen):
+        """Trägt die Anzahl Anzeigen einer Ergebnisseite ein"""
+        self.beobachte('anzeigen_pro_seite', anzahl_anzeigen, grenzen=GRENZEN_ANZEIGEN)
+
+    def zuruecksetzen(self):
+        with self._lock:
+            self._histogramme.clear()
+            self._zaehler.clear()
+            self.seit = time.time()
+
+    def statistik(self) -> dict:
+        """
+        Momentaufnahme aller Werte
+
+        ``stufen`` enthält je Stufe Anzahl, Summe, Mittel, p50, p95 und
+        Maximum in Sekunden; ``anteile`` den Anteil jeder Stufe an der
+        gemessenen Gesamtzeit. ``wiederverwendung`` ist der Anteil der
+        Antworten über eine bereits offene Verbindung.
+        """
+        with self._lock:
+            stufen = {dict(labels)['stufe']: h.als_dict('_s')
+                      for (metrik, labels), h in self._histogramme.items() if metrik == 'stufe_sekunden'}
+            seiten = self._histogramme.get(('anzeigen_pro_seite', ()))
+            status = {dict(labels)['status']: int(wert)
+                      for (metrik, labels), wert in self._zaehler.items() if metrik == 'http_antworten_total'}
+            bytes_gesamt = self._zaehler.get(('bytes_total', ()), 0)
+            fehler = self._zaehler.get(('fehler_total', ()), 0)
+            bytes_netz = self._zaehler.get(('bytes_netz_total', ()), 0)
+            cache = {dict(labels)['status']: int(wert)
+                     for (metrik, labels), wert in self._zaehler.items() if metrik == 'cache_total'}
+            verbindungen = sum(wert for (metrik, _), wert in self._zaehler.items()
+                               if metrik == 'verbindungen_neu_total')
+
+        gesamt = sum(werte['summe_s'] for werte in stufen.values())
+        return {
+            'laufzeit_s': time.time() - self.seit,
+            'stufen': stufen,
+            'anteile': {name: werte['summe_s'] / gesamt for name, werte in stufen.items()} if gesamt else {},
+            'bytes': int(bytes_gesamt),
+            'status': status,
+            'fehler': int(fehler),
+            'bytes_netz': int(bytes_netz),
+            'cache': cache,
+            'verbindungen_neu': int(verbindungen),
+            'wiederverwendung': max(0.0, 1 - verbindungen / sum(status.values())) if status else None,
+            'anzeigen_pro_seite': seiten.als_dict() if seiten else Histogramm(GRENZEN_ANZEIGEN).als_dict(),
+        }
+
+    def prometheus(self) -> str:
+        """Alle Werte im Textformat von Prometheus (Version 0.0.4)"""
+        zeilen = []
+        with self._lock:
+            histogramme = sorted(self._histogramme.items())
+            zaehler = sorted(self._zaehler.items())
+
+        bekannt = set()
+        for (metrik, labels), wert in zaehler:
+            name = PRAEFIX + metrik
+            if name not in bekannt:
+                bekannt.add(name)
+                zeilen.append(f'# HELP {name} {_BESCHREIBUNG.get(metrik, metrik)}')
+                zeilen.append(f'# TYPE {name} counter')
+            zeilen.append(f'{name}{_labels(labels)} {_zahl(wert)}')
+
+        for (metrik, labels), histogramm in histogramme:
+            name = PRAEFIX + metrik
+            if name not in bekannt:
+                bekannt.add(name)
+                zeilen.append(f'# HELP {name} {_BESCHREIBUNG.get(metrik, metrik)}')
+                zeilen.append(f'# TYPE {name} histogram')
+            kumuliert = 0
+            for grenze, anzahl in zip(histogramm.grenzen, histogramm.buckets):
+                kumuliert += anzahl
+                zeilen.append(f'{name}_bucket{_labels(labels, le=_zahl(grenze))} {kumuliert}')
+            zeilen.append(f'{name}_bucket{_labels(labels, le="+Inf")} {histogramm.anzahl}')
+            zeilen.append(f'{name}_sum{_labels(labels)} {_zahl(histogramm.summe)}')
+            zeilen.append(f'{name}_count{_labels(labels)} {histogramm.anzahl}')
+        return '\n'.join(zeilen) + '\n'
+
+    def starte_server(self, port=9464, adresse='127.0.0.1'):
+        """
+        Stellt ``prometheus()`` unter ``/metrics`` per HTTP bereit
+
+        Läuft in einem Daemon-Thread; liefert den Server (``shutdown()``
+        beendet ihn).
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metriken = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                inhalt = metriken.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(inhalt)))
+                self.end_headers()
+                self.wfile.write(inhalt)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((adresse, port), Handler)
+        threading.Thread(target=server.serve_forever, name='metriken-server', daemon=True).start()
+        return server
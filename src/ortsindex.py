@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Ortsindex
+=================================
+
+Invertierter Trigramm-Index für Ortsabfragen.
+
+Orte werden normalisiert (Kleinschreibung, Umlaute gefaltet: ä -> ae,
+ö -> oe, ü -> ue, ß -> ss). Jeder unterschiedliche Ort wird einmal in
+Trigramme zerlegt; die Postings verweisen auf Orte, und jeder Ort auf
+die Nummern seiner Anzeigen. Teilstring- und Präfixabfragen prüfen
+damit nur Kandidaten statt aller Anzeigen. Neue Anzeigen werden
+einfach angehängt.
+"""
+
+from itertools import chain
+from typing import Dict, Iterable, List, Set
+
+_UMLAUTE = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+
+
+def falte_ort(text):
+    """Normalisiert einen Ortsnamen für den Vergleich"""
+    return ' '.join(text.lower().translate(_UMLAUTE).split())
+
+
+def _trigramme(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class OrtsIndex:
+    """
+    Trigramm-Index über die Orte einer Anzeigenliste
+
+    Anzeigen werden intern über ihre Einfügeposition identifiziert;
+    Ergebnisse kommen immer in Einfügereihenfolge zurück.
+    """
+
+    def __init__(self, anzeigen: Iterable = ()):
+        self._anzeigen: List = []
+        self._ort_ids: Dict[str, int] = {}
+        self._gefaltet: List[str] = []
+        self._klein: List[str] = []
+        self._anzeigen_je_ort: List[List[int]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self.erweitere(anzeigen)
+
+    def __len__(self):
+        return len(self._anzeigen)
+
+    @property
+    def letzte(self):
+        """Zuletzt hinzugefügte Anzeige"""
+        return self._anzeigen[-1] if self._anzeigen else None
+
+    @property
+    def anzahl_orte(self):
+        """Anzahl unterschiedlicher Orte im Index"""
+        return len(self._gefaltet)
+
+    def hinzufuegen(self, anzeige) -> int:
+        """Fügt eine Anzeige hinzu und liefert ihre Nummer"""
+        nummer = len(self._anzeigen)
+        self._anzeigen.append(anzeige)
+
+        ort_id = self._ort_ids.get(anzeige.ort)
+        if ort_id is None:
+            ort_id = len(self._gefaltet)
+            self._ort_ids[anzeige.ort] = ort_id
+            gefaltet = falte_ort(anzeige.ort)
+            self._gefaltet.append(gefaltet)
+            self._klein.append(anzeige.ort.lower())
+            self._anzeigen_je_ort.append([])
+            for trigramm in _trigramme(gefaltet):
+                self._postings.setdefault(trigramm, set()).add(ort_id)
+
+        self._anzeigen_je_ort[ort_id].append(nummer)
+        return nummer
+
+    def erweitere(self, anzeigen: Iterable):
+        """Fügt viele Anzeigen hinzu"""
+        for anzeige in anzeigen:
+            self.hinzufuegen(anzeige)
+
+    def _kandidaten(self, gefaltet) -> Iterable[int]:
+        """Orte, die alle Trigramme der Anfrage enthalten"""
+        if len(gefaltet) < 3:
+            return range(len(self._gefaltet))
+
+        listen = []
+        for trigramm in _trigramme(gefaltet):
+            posting = self._postings.get(trigramm)
+            if not posting:
+                return ()
+            listen.append(posting)
+        listen.sort(key=len)
+        return set.intersection(*listen) if len(listen) > 1 else listen[0]
+
+    def _anzeigen_zu(self, ort_ids) -> List:
+        listen = [self._anzeigen_je_ort[ort_id] for ort_id in ort_ids]
+        if len(listen) == 1:
+            nummern = listen[0]
+        else:
+            # Sortieren in C ist schneller als ein heapq.merge in Python
+            nummern = sorted(chain.from_iterable(listen))
+        anzeigen = self._anzeigen
+        return [anzeigen[nummer] for nummer in nummern]
+
+    def suche(self, ort, praefix=False) -> List:
+        """
+        Anzeigen, deren normalisierter Ort ``ort`` enthält
+
+        Args:
+            praefix: Nur Orte, die mit ``ort`` beginnen
+        """
+        gefaltet = falte_ort(ort)
+        if praefix:
+            ort_ids = [i for i in self._kandidaten(gefaltet) if self._gefaltet[i].startswith(gefaltet)]
+        else:
+            ort_ids = [i for i in self._kandidaten(gefaltet) if gefaltet in self._gefaltet[i]]
+        return self._anzeigen_zu(ort_ids)
+
+    def filtere(self, ort) -> List:
+        """
+        Wie ``KleinanzeigenScraper.filtere_nach_ort``
+
+        Vergleicht ohne Umlaut-Faltung (nur Kleinschreibung); der
+        Trigramm-Index liefert dafür eine Obermenge an Kandidaten.
+        """
+        klein = ort.lower()
+        kandidaten = self._kandidaten(falte_ort(ort))
+        return self._anzeigen_zu([i for i in kandidaten if klein in self._klein[i]])
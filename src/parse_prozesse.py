@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Parse-Prozesse
+======================================
+
+Parst Suchergebnisseiten in einem Prozesspool auf mehreren Kernen.
+
+HTML-Parsing ist CPU-gebunden und wird in Threads durch den GIL
+begrenzt. Hier bekommen Worker-Prozesse die rohen Seitenbytes und
+liefern kompakte Tupel zurück, aus denen der Hauptprozess die
+``DienstleistungsAnzeige``-Objekte baut. Jeder Worker baut Parser und
+Kategorisierer einmal beim Start und parst eine Aufwärmseite, damit
+die erste echte Seite nicht die Importe bezahlt.
+
+Verwendung:
+    with ParseProzesse(base_url, kategorien, prozesse=8) as pool:
+        anzeigen = pool.parse(html_bytes)
+"""
+
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
+
+try:
+    from .kategorisierung import Kategorisierer
+except ImportError:
+    from kategorisierung import Kategorisierer
+
+# Reihenfolge entspricht den Init-Argumenten von DienstleistungsAnzeige
+FELDER = ('titel', 'beschreibung', 'preis', 'ort', 'kategorie', 'kontakt', 'url', 'datum', 'tags')
+
+_AUFWAERM_SEITE = (
+    '<ul id="srchrslt-adtable"><li><article class="aditem" data-href="/s-anzeige/x/1">'
+    '<h2><a href="/s-anzeige/x/1">Aufwärmen</a></h2>'
+    '<p class="aditem-main--middle--description">Text</p>'
+    '<p class="aditem-main--middle--price-shipping--price">1 €</p>'
+    '</article></li></ul>'
+)
+
+# Parser des Worker-Prozesses, gesetzt von _initialisiere
+_parser = None
+
+
+def _initialisiere(base_url, kategorien, backend):
+    """Initializer der Worker: Parser bauen und einmal benutzen"""
+    global _parser
+    try:
+        from .ergebnis_parser import ErgebnisParser
+    except ImportError:
+        from ergebnis_parser import ErgebnisParser
+    _parser = ErgebnisParser(base_url, Kategorisierer(kategorien).finde, backend=backend)
+    _parser.parse(_AUFWAERM_SEITE)
+
+
+def _parse_seite(html) -> List[tuple]:
+    """Parst eine Seite im Worker und liefert Anzeigen als Tupel"""
+    return [(a.titel, a.beschreibung, a.preis, a.ort, a.kategorie, a.kontakt, a.url, a.datum, a.tags)
+            for a in _parser.parse(html)]
+
+
+def _bereit(_):
+    return os.getpid()
+
+
+class ParseProzesse:
+    """
+    Prozesspool für den Ergebnis-Parser
+
+    Args:
+        base_url: Basis für relative Anzeigen-Links
+        kategorien: Kategorien mit Keywords (wie ``KleinanzeigenScraper.kategorien``)
+        prozesse: Anzahl Worker (Standard: Anzahl CPU-Kerne)
+        backend: Parser-Backend der Worker ('auto', 'lxml' oder 'bs4')
+    """
+
+    def __init__(self, base_url, kategorien: Dict[str, List[str]], prozesse: Optional[int] = None,
+                 backend='auto'):
+        try:
+            from .kleinanzeigen_scraper import DienstleistungsAnzeige
+        except ImportError:
+            from kleinanzeigen_scraper import DienstleistungsAnzeige
+        self._anzeige_klasse = DienstleistungsAnzeige
+
+        self.prozesse = prozesse or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=self.prozesse, initializer=_initialisiere,
+                                         initargs=(base_url, dict(kategorien), backend))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.schliessen()
+
+    def aufwaermen(self):
+        """Startet alle Worker sofort statt bei der ersten Seite"""
+        list(self._pool.map(_bereit, range(self.prozesse * 2)))
+        return self
+
+    def einreichen(self, html: Union[str, bytes]) -> Future:
+        """Reicht eine Seite ein; das Future liefert Anzeigen-Tupel"""
+        return self._pool.submit(_parse_seite, html)
+
+    def zu_anzeigen(self, tupel: Iterable[tuple]) -> list:
+        """Baut ``DienstleistungsAnzeige``-Objekte aus Worker-Tupeln"""
+        klasse = self._anzeige_klasse
+        return [klasse(*werte) for werte in tupel]
+
+    def parse(self, html: Union[str, bytes]) -> list:
+        """Parst eine Seite im Pool und wartet auf das Ergebnis"""
+        return self.zu_anzeigen(self.einreichen(html).result())
+
+    def parse_viele(self, seiten: Iterable[Union[str, bytes]]) -> Iterable[list]:
+        """Parst viele Seiten parallel; Ergebnisse in Eingabereihenfolge"""
+        for tupel in self._pool.map(_parse_seite, seiten):
+            yield self.zu_anzeigen(tupel)
+
+    def schliessen(self):
+        """Beendet die Worker-Prozesse"""
+        self._pool.shutdown(wait=True)
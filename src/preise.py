@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Preismodell
+===================================
+
+Strukturierte Preise für Dienstleistungsanzeigen.
+
+Der Preistext einer Anzeige wird einmal beim Erstellen geparst
+(Betrag, Einheit, Status). Preisabfragen laufen danach über einen
+sortierten Index mit binärer Suche statt über einen Regex pro Anzeige.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+# Einheiten
+EINHEIT_FESTPREIS = 'festpreis'
+EINHEIT_STUNDE = 'stunde'
+EINHEIT_VB = 'vb'
+EINHEIT_AUF_ANFRAGE = 'auf_anfrage'
+EINHEIT_ZU_VERSCHENKEN = 'zu_verschenken'
+EINHEIT_UNBEKANNT = 'unbekannt'
+
+# Parse-Status
+STATUS_OK = 'ok'
+STATUS_OHNE_BETRAG = 'ohne_betrag'
+STATUS_FEHLT = 'fehlt'
+
+_BETRAG = re.compile(r'(\d+(?:,\d+)?)')
+_STUNDE = re.compile(r'(/\s*(h|std)\b|pro\s+stunde|stundenlohn|je\s+stunde)', re.I)
+_VB = re.compile(r'\bvb\b|verhandlungsbasis', re.I)
+
+
+@dataclass(frozen=True)
+class Preis:
+    """Geparster Preis einer Anzeige"""
+    betrag: Optional[float]
+    einheit: str
+    status: str
+
+    @property
+    def hat_betrag(self):
+        return self.betrag is not None
+
+
+@lru_cache(maxsize=4096)
+def parse_preis(text: Optional[str]) -> Preis:
+    """
+    Parst einen Preistext wie ``"45 €/h"``, ``"350 € VB"`` oder ``"Auf Anfrage"``
+
+    Tausenderpunkte werden entfernt, das Komma gilt als Dezimaltrenner.
+    """
+    if not text or not text.strip():
+        return Preis(None, EINHEIT_UNBEKANNT, STATUS_FEHLT)
+
+    klein = text.lower()
+    if 'verschenken' in klein:
+        return Preis(0.0, EINHEIT_ZU_VERSCHENKEN, STATUS_OK)
+    if 'anfrage' in klein:
+        return Preis(None, EINHEIT_AUF_ANFRAGE, STATUS_OHNE_BETRAG)
+
+    if _STUNDE.search(klein):
+        einheit = EINHEIT_STUNDE
+    elif _VB.search(klein):
+        einheit = EINHEIT_VB
+    else:
+        einheit = EINHEIT_FESTPREIS
+
+    treffer = _BETRAG.search(text.replace('.', ''))
+    if not treffer:
+        return Preis(None, einheit if einheit != EINHEIT_FESTPREIS else EINHEIT_UNBEKANNT,
+                     STATUS_OHNE_BETRAG)
+    return Preis(float(treffer.group(1).replace(',', '.')), einheit, STATUS_OK)
+
+
+class PreisIndex:
+    """
+    Sortierter Preisindex über eine Anzeigenliste
+
+    Bereichsabfragen nutzen ``bisect``; neue Anzeigen werden
+    einsortiert, ohne den Index neu aufzubauen.
+    """
+
+    def __init__(self, anzeigen: Iterable = ()):
+        self._anzeigen: List = []
+        self._betraege: List[float] = []
+        self._positionen: List[int] = []
+        self._ohne_betrag: List[int] = []
+        self.erweitere(anzeigen)
+
+    def __len__(self):
+        return len(self._anzeigen)
+
+    @property
+    def letzte(self):
+        """Zuletzt hinzugefügte Anzeige"""
+        return self._anzeigen[-1] if self._anzeigen else None
+
+    def hinzufuegen(self, anzeige):
+        """Fügt eine Anzeige hinzu"""
+        position = len(self._anzeigen)
+        self._anzeigen.append(anzeige)
+        betrag = anzeige.preis_info.betrag
+        if betrag is None:
+            self._ohne_betrag.append(position)
+        else:
+            stelle = bisect_right(self._betraege, betrag)
+            self._betraege.insert(stelle, betrag)
+            self._positionen.insert(stelle, position)
+
+    def erweitere(self, anzeigen: Iterable):
+        """Fügt viele Anzeigen hinzu; große Mengen werden gesammelt sortiert"""
+        neue = list(anzeigen)
+        if len(neue) < max(16, len(self._betraege) // 8):
+            for anzeige in neue:
+                self.hinzufuegen(anzeige)
+            return
+
+        start = len(self._anzeigen)
+        self._anzeigen.extend(neue)
+        paare = list(zip(self._betraege, self._positionen))
+        for position, anzeige in enumerate(neue, start):
+            betrag = anzeige.preis_info.betrag
+            if betrag is None:
+                self._ohne_betrag.append(position)
+            else:
+                paare.append((betrag, position))
+        paare.sort()
+        self._betraege = [betrag for betrag, _ in paare]
+        self._positionen = [position for _, position in paare]
+
+    def bereich(self, min_preis=None, max_preis=None, ohne_preis_behalten=True):
+        """
+        Liefert alle Anzeigen im Preisbereich in Einfügereihenfolge
+
+        Args:
+            ohne_preis_behalten: Anzeigen ohne erkennbaren Betrag
+                (z. B. "Auf Anfrage") ebenfalls zurückgeben
+        """
+        von = 0 if min_preis is None else bisect_left(self._betraege, min_preis)
+        bis = len(self._betraege) if max_preis is None else bisect_right(self._betraege, max_preis)
+
+        positionen = self._positionen[von:bis]
+        if ohne_preis_behalten:
+            positionen += self._ohne_betrag
+        positionen.sort()
+        return [self._anzeigen[position] for position in positionen]
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Profiling
+=================================
+
+Eingebauter Profiling-Modus für Scraper, GUI und Kommandozeile.
+
+Eingeschaltet wird er über die Umgebungsvariable ``KLEINANZEIGEN_PROFIL``
+(Zielverzeichnis; ``1`` schreibt nach ``./profile``) oder das Flag
+``--profil VERZEICHNIS`` der Einstiegspunkte. Pro Lauf entstehen:
+
+- ``<name>-<zeit>.prof``: CPU-Profil (cProfile, lesbar mit ``pstats``
+  oder snakeviz) bzw. ``.stacks`` im Sampling-Modus (gefaltete Stacks
+  für Flamegraphs)
+- ``<name>-<zeit>.tracemalloc``: Speicher-Snapshot
+  (``tracemalloc.Snapshot.load``)
+- ``<name>-<zeit>.txt``: Zusammenfassung mit den teuersten Funktionen
+  und Allokationsstellen
+
+cProfile misst nur den Thread, der den Lauf startet. Der Sampling-Modus
+(``KLEINANZEIGEN_PROFIL_MODUS=sampling``) erfasst alle Threads, also
+auch Hintergrund-Suchen der GUI. Ausgeschaltet kostet der Modus eine
+Abfrage der Umgebungsvariable pro Lauf.
+
+Verwendung:
+    with profiliere('suche'):
+        scraper.extrahiere_anzeigen('Handwerker')
+
+    @mit_profil('gui')
+    def main():
+        ...
+"""
+
+import functools
+import io
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+PROFIL_VARIABLE = 'KLEINANZEIGEN_PROFIL'
+MODUS_VARIABLE = 'KLEINANZEIGEN_PROFIL_MODUS'
+STANDARD_VERZEICHNIS = 'profile'
+MODI = ('cprofile', 'sampling')
+
+# Abstand zwischen zwei Stichproben im Sampling-Modus
+SAMPLING_INTERVALL = 0.005
+# Aufrufrahmen pro Allokation, die tracemalloc festhält
+TRACEMALLOC_RAHMEN = 10
+
+
+def profil_verzeichnis(verzeichnis: Optional[str] = None) -> Optional[str]:
+    """Zielverzeichnis aus Argument oder Umgebung (``None``: Profiling aus)"""
+    if verzeichnis is None:
+        verzeichnis = os.environ.get(PROFIL_VARIABLE, '').strip()
+        if verzeichnis.lower() in ('', '0', 'nein', 'false'):
+            return None
+        if verzeichnis.lower() in ('1', 'ja', 'true'):
+            verzeichnis = STANDARD_VERZEICHNIS
+    return verzeichnis
+
+
+def aktiviere(verzeichnis: str, modus: Optional[str] = None):
+    """Schaltet Profiling für diesen Prozess ein (z. B. aus einem ``--profil``-Flag)"""
+    os.environ[PROFIL_VARIABLE] = verzeichnis
+    if modus:
+        os.environ[MODUS_VARIABLE] = modus
+
+
+class _Sampler:
+    """Zählt in einem Hintergrund-Thread die Stacks aller anderen Threads"""
+
+    def __init__(self, intervall=SAMPLING_INTERVALL):
+        self.intervall = intervall
+        self.stacks = Counter()
+        self.proben = 0
+        self._stopp = threading.Event()
+        self._thread = threading.Thread(target=self._laufe, name='profil-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stopp(self):
+        self._stopp.set()
+        self._thread.join()
+
+    def _laufe(self):
+        eigene = threading.get_ident()
+        while not self._stopp.wait(self.intervall):
+            self.proben += 1
+            for thread_id, rahmen in sys._current_frames().items():
+                if thread_id == eigene:
+                    continue
+                stack = []
+                while rahmen is not None:
+                    code = rahmen.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    rahmen = rahmen.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def schreibe(self, pfad):
+        with open(pfad, 'w', encoding='utf-8') as datei:
+            for stack, anzahl in self.stacks.most_common():
+                datei.write(f"{stack} {anzahl}\n")
+
+    def zusammenfassung(self, top) -> str:
+        selbst, inklusive = Counter(), Counter()
+        for stack, anzahl in self.stacks.items():
+            funktionen = stack.split(';')
+            selbst[funktionen[-1]] += anzahl
+            for funktion in set(funktionen):
+                inklusive[funktion] += anzahl
+        gesamt = sum(self.stacks.values()) or 1
+        zeilen = [f"{self.proben} Stichproben à {self.intervall * 1000:.0f} ms", "",
+                  "Eigene Zeit:"]
+        zeilen += [f"  {anzahl / gesamt:6.1%}  {funktion}" for funktion, anzahl in selbst.most_common(top)]
+        zeilen += ["", "Inklusive aufgerufener Funktionen:"]
+        zeilen += [f"  {anzahl / gesamt:6.1%}  {funktion}" for funktion, anzahl in inklusive.most_common(top)]
+        return '\n'.join(zeilen)
+
+
+def _cprofile_zusammenfassung(profil, top) -> str:
+    import pstats
+
+    puffer = io.StringIO()
+    statistik = pstats.Stats(profil, stream=puffer)
+    statistik.sort_stats('cumulative').print_stats(top)
+    statistik.sort_stats('tottime').print_stats(top)
+    return puffer.getvalue().strip()
+
+
+def _speicher_zusammenfassung(snapshot, spitze, top) -> str:
+    zeilen = [f"Spitze: {spitze / 2 ** 20:.1f} MiB", "", f"Top {top} Allokationsstellen:"]
+    for eintrag in snapshot.statistics('lineno')[:top]:
+        rahmen = eintrag.traceback[0]
+        zeilen.append(f"  {eintrag.size / 1024:10.1f} KiB  {eintrag.count:8d}x  "
+                      f"{rahmen.filename}:{rahmen.lineno}")
+    return '\n'.join(zeilen)
+
+
+@contextmanager
+def profiliere(name, verzeichnis: Optional[str] = None, modus: Optional[str] = None, top=25):
+    """
+    Profiliert den ``with``-Block, wenn Profiling eingeschaltet ist
+
+    Args:
+        name: Präfix der Ausgabedateien
+        verzeichnis: Zielverzeichnis (Standard: ``KLEINANZEIGEN_PROFIL``)
+        modus: 'cprofile' oder 'sampling' (Standard: ``KLEINANZEIGEN_PROFIL_MODUS``
+            bzw. 'cprofile')
+        top: Anzahl Einträge pro Liste in der Zusammenfassung
+    """
+    verzeichnis = profil_verzeichnis(verzeichnis)
+    if verzeichnis is None:
+        yield None
+        return
+
+    import tracemalloc
+
+    modus = modus or os.environ.get(MODUS_VARIABLE) or 'cprofile'
+    if modus not in MODI:
+        raise ValueError(f"Unbekannter Profiling-Modus: {modus} (erlaubt: {', '.join(MODI)})")
+    os.makedirs(verzeichnis, exist_ok=True)
+    basis = os.path.join(verzeichnis, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+
+    tracemalloc_lief = tracemalloc.is_tracing()
+    if not tracemalloc_lief:
+        tracemalloc.start(TRACEMALLOC_RAHMEN)
+    if modus == 'sampling':
+        profil = _Sampler()
+        profil.start()
+    else:
+        import cProfile
+        profil = cProfile.Profile()
+        profil.enable()
+    start = time.perf_counter()
+    try:
+        yield basis
+    finally:
+        dauer = time.perf_counter() - start
+        if modus == 'sampling':
+            profil.stopp()
+        else:
+            profil.disable()
+        # Snapshot vor dem Auswerten, damit pstats & Co. nicht darin auftauchen
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        _, spitze = tracemalloc.get_traced_memory()
+        if not tracemalloc_lief:
+            tracemalloc.stop()
+        snapshot.dump(basis + '.tracemalloc')
+
+        if modus == 'sampling':
+            profil.schreibe(basis + '.stacks')
+            cpu = profil.zusammenfassung(top)
+        else:
+            profil.dump_stats(basis + '.prof')
+            cpu = _cprofile_zusammenfassung(profil, top)
+
+        with open(basis + '.txt', 'w', encoding='utf-8') as datei:
+            datei.write(f"Profil '{name}' ({modus}), Laufzeit {dauer:.2f} s\n\n")
+            datei.write(cpu + '\n\n')
+            datei.write(_speicher_zusammenfassung(snapshot, spitze, top) + '\n')
+        print(f"🩺 Profil geschrieben: {basis}.txt", file=sys.stderr)
+
+
+def mit_profil(name):
+    """Dekorator: profiliert jeden Aufruf, wenn Profiling eingeschaltet ist"""
+    def dekorator(funktion):
+        @functools.wraps(funktion)
+        def wrapper(*args, **kwargs):
+            if profil_verzeichnis() is None:
+                return funktion(*args, **kwargs)
+            with profiliere(name):
+                return funktion(*args, **kwargs)
+        return wrapper
+    return dekorator
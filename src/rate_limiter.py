@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Rate-Limiter
+====================================
+
+Adaptiver Token-Bucket pro Host für respektvolles Scraping.
+
+Der Limiter ersetzt die feste Wartezeit zwischen Anfragen:
+- Jeder Host bekommt einen eigenen Token-Bucket
+- ``Crawl-delay`` aus robots.txt begrenzt die maximale Rate
+- ``Retry-After`` sperrt den Host bis zum angegebenen Zeitpunkt
+- Die Rate steigt bei schnellen Antworten und sinkt bei hoher Latenz,
+  Fehlern und 429/503-Antworten (AIMD)
+
+Wartezeiten werden unter einem Lock reserviert und danach außerhalb
+des Locks abgewartet. Dadurch funktioniert derselbe Limiter sowohl
+über Threads (``warte``) als auch über asyncio-Tasks (``warte_async``).
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+UNBEGRENZT = float('inf')
+
+
+def _host(url):
+    return urlparse(url).netloc or url
+
+
+def parse_retry_after(wert) -> Optional[float]:
+    """Wandelt einen Retry-After-Header in Sekunden um"""
+    if not wert:
+        return None
+    try:
+        return max(0.0, float(wert))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        zeitpunkt = parsedate_to_datetime(wert)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, zeitpunkt.timestamp() - time.time())
+
+
+@dataclass
+class HostStatus:
+    """Momentaufnahme eines Token-Buckets"""
+    rate: float
+    obergrenze: float
+    crawl_delay: Optional[float]
+    latenz: Optional[float]
+    fehlerquote: float
+    gesperrt_fuer: float
+
+
+class TokenBucket:
+    """
+    Token-Bucket mit adaptiver Rate für einen einzelnen Host
+
+    Die Rate wird in Anfragen pro Sekunde angegeben.
+    """
+
+    def __init__(self, rate, rate_min, rate_max, kapazitaet=1.0, ziel_latenz=1.0):
+        self.rate = rate
+        self.rate_min = rate_min
+        self.rate_max = rate_max
+        self.obergrenze = rate_max
+        self.schritt = rate * 0.1 if rate != UNBEGRENZT else 0.0
+        self.kapazitaet = kapazitaet
+        self.ziel_latenz = ziel_latenz
+
+        self.tokens = kapazitaet
+        self.letzte_auffuellung = time.monotonic()
+        self.letzte_vergabe = 0.0
+        self.gesperrt_bis = 0.0
+        self.crawl_delay: Optional[float] = None
+        self.latenz: Optional[float] = None
+        self.fehlerquote = 0.0
+        self._lock = threading.Lock()
+
+    def reserviere(self, min_abstand=None) -> float:
+        """Reserviert ein Token und liefert die nötige Wartezeit in Sekunden"""
+        with self._lock:
+            jetzt = time.monotonic()
+            start = max(jetzt, self.gesperrt_bis)
+
+            if self.rate != UNBEGRENZT:
+                self.tokens = min(self.kapazitaet,
+                                  self.tokens + (jetzt - self.letzte_auffuellung) * self.rate)
+                self.letzte_auffuellung = jetzt
+                # Negative Tokens sind bereits vergebene Reservierungen
+                self.tokens -= 1.0
+                if self.tokens < 0:
+                    start = max(start, jetzt - self.tokens / self.rate)
+
+            if min_abstand:
+                start = max(start, self.letzte_vergabe + min_abstand)
+
+            self.letzte_vergabe = max(self.letzte_vergabe, start)
+            return start - jetzt
+
+    def melde(self, status, latenz, retry_after=None):
+        """Passt die Rate anhand einer beobachteten Antwort an"""
+        with self._lock:
+            fehler = status is None or status == 429 or status >= 500
+            self.fehlerquote = 0.8 * self.fehlerquote + 0.2 * (1.0 if fehler else 0.0)
+
+            if retry_after is not None:
+                self.gesperrt_bis = max(self.gesperrt_bis, time.monotonic() + retry_after)
+
+            if status in (429, 503):
+                self._setze_rate(self._endliche_rate() * 0.5)
+            elif fehler:
+                self._setze_rate(self._endliche_rate() * 0.75)
+            else:
+                self.latenz = latenz if self.latenz is None else 0.8 * self.latenz + 0.2 * latenz
+                if self.rate == UNBEGRENZT:
+                    return
+                if self.latenz <= self.ziel_latenz:
+                    self._setze_rate(self.rate + self.schritt)
+                else:
+                    self._setze_rate(self.rate * 0.9)
+
+    def setze_crawl_delay(self, sekunden):
+        """Begrenzt die Rate auf höchstens eine Anfrage pro ``sekunden``"""
+        with self._lock:
+            self.crawl_delay = sekunden
+            self.obergrenze = min(self.rate_max, 1.0 / sekunden) if sekunden else self.rate_max
+            if not self.schritt and self.obergrenze != UNBEGRENZT:
+                self.schritt = self.obergrenze * 0.1
+            self._setze_rate(self.rate)
+
+    def _endliche_rate(self):
+        # Ohne Limit startet die Drosselung bei einer Anfrage pro Sekunde
+        if self.rate != UNBEGRENZT:
+            return self.rate
+        if not self.schritt:
+            self.schritt = 0.1
+        return 1.0
+
+    def _setze_rate(self, rate):
+        self.rate = max(self.rate_min, min(rate, self.obergrenze))
+
+    def status(self) -> HostStatus:
+        with self._lock:
+            return HostStatus(
+                rate=self.rate,
+                obergrenze=self.obergrenze,
+                crawl_delay=self.crawl_delay,
+                latenz=self.latenz,
+                fehlerquote=self.fehlerquote,
+                gesperrt_fuer=max(0.0, self.gesperrt_bis - time.monotonic()),
+            )
+
+
+class RateLimiter:
+    """
+    Gemeinsamer Rate-Limiter für alle Abrufpfade des Scrapers
+
+    Args:
+        standard_intervall: Startabstand zwischen Anfragen in Sekunden
+            (0 bedeutet unbegrenzt, bis der Server drosselt)
+        min_intervall: Kleinster erlaubter Abstand (Standard: halbes Startintervall)
+        max_intervall: Größter Abstand bei anhaltenden Fehlern
+        ziel_latenz: Antwortzeit, ab der die Rate reduziert wird
+    """
+
+    def __init__(self, standard_intervall=2.0, min_intervall=None, max_intervall=60.0,
+                 ziel_latenz=1.0):
+        if min_intervall is None:
+            min_intervall = standard_intervall / 2
+        self.standard_intervall = standard_intervall
+        self.min_intervall = min_intervall
+        self.max_intervall = max_intervall
+        self.ziel_latenz = ziel_latenz
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url) -> TokenBucket:
+        """Liefert den Token-Bucket für den Host der URL"""
+        host = _host(url)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    bucket = TokenBucket(
+                        rate=1.0 / self.standard_intervall if self.standard_intervall else UNBEGRENZT,
+                        rate_min=1.0 / self.max_intervall,
+                        rate_max=1.0 / self.min_intervall if self.min_intervall else UNBEGRENZT,
+                        ziel_latenz=self.ziel_latenz,
+                    )
+                    self._buckets[host] = bucket
+        return bucket
+
+    def warte(self, url, min_abstand=None) -> float:
+        """Blockiert den aktuellen Thread bis zur nächsten erlaubten Anfrage"""
+        wartezeit = self.bucket(url).reserviere(min_abstand)
+        if wartezeit > 0:
+            time.sleep(wartezeit)
+        return wartezeit
+
+    async def warte_async(self, url, min_abstand=None) -> float:
+        """Wartet bis zur nächsten erlaubten Anfrage, ohne die Event-Loop zu blockieren"""
+        wartezeit = self.bucket(url).reserviere(min_abstand)
+        if wartezeit > 0:
+            # Erst hier importiert: synchrone Nutzer laden asyncio nicht
+            import asyncio
+            await asyncio.sleep(wartezeit)
+        return wartezeit
+
+    def melde_antwort(self, url, status, latenz, retry_after=None):
+        """
+        Meldet das Ergebnis einer Anfrage
+
+        Args:
+            status: HTTP-Statuscode oder ``None`` bei Verbindungsfehlern
+            latenz: Antwortzeit in Sekunden
+            retry_after: Wert des Retry-After-Headers (Sekunden oder HTTP-Datum)
+        """
+        self.bucket(url).melde(status, latenz, parse_retry_after(retry_after))
+
+    def setze_crawl_delay(self, url, sekunden):
+        """Übernimmt den Crawl-delay aus robots.txt für den Host der URL"""
+        self.bucket(url).setze_crawl_delay(sekunden)
+
+    def statistik(self) -> Dict[str, HostStatus]:
+        """Aktueller Zustand aller Hosts"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {host: bucket.status() for host, bucket in buckets.items()}
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - robots.txt Cache
+========================================
+
+Zwischenspeicher für robots.txt-Regeln pro Host nach RFC 9309.
+
+- Regeln werden einmal geladen, geparst und mit TTL gecacht
+- ``Allow``/``Disallow`` mit ``*`` und ``$``, längste Regel gewinnt
+- ``Crawl-delay`` wird für den Rate-Limiter bereitgestellt
+- Gleichzeitige Erstabfragen für denselben Host lösen nur einen Abruf aus
+- Der Scraper prüft jede URL vor dem Abruf; verbotene URLs lösen
+  ``RobotsVerbot`` aus
+"""
+
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlparse
+
+# Zeichen, die beim Normalisieren nicht kodiert werden
+_SICHERE_ZEICHEN = "/?=&;:@!,'()+~*$%"
+
+
+class RobotsVerbot(PermissionError):
+    """robots.txt verbietet den Abruf einer URL"""
+
+
+def _normalisiere(pfad):
+    return quote(unquote(pfad), safe=_SICHERE_ZEICHEN)
+
+
+class _Regel:
+    """Eine einzelne Allow- oder Disallow-Regel"""
+
+    __slots__ = ('erlaubt', 'muster', 'laenge', '_praefix', '_regex')
+
+    def __init__(self, erlaubt, muster):
+        self.erlaubt = erlaubt
+        self.muster = muster
+        self.laenge = len(muster)
+        if '*' in muster or muster.endswith('$'):
+            anker = muster.endswith('$')
+            teile = (muster[:-1] if anker else muster).split('*')
+            self._regex = re.compile('.*'.join(map(re.escape, teile)) + ('$' if anker else ''))
+            self._praefix = None
+        else:
+            self._regex = None
+            self._praefix = muster
+
+    def passt(self, pfad):
+        if self._praefix is not None:
+            return pfad.startswith(self._praefix)
+        return self._regex.match(pfad) is not None
+
+
+class RobotsRegeln:
+    """Geparste robots.txt-Regeln für einen User-Agent"""
+
+    def __init__(self, regeln: List[_Regel] = (), crawl_delay: Optional[float] = None,
+                 alles_verboten=False):
+        # Längste Regeln zuerst; bei gleicher Länge gewinnt Allow
+        self.regeln = sorted(regeln, key=lambda r: (-r.laenge, not r.erlaubt))
+        self.crawl_delay = crawl_delay
+        self.alles_verboten = alles_verboten
+
+    @classmethod
+    def parse(cls, text, user_agent):
+        """Parst robots.txt und wählt die Gruppe für ``user_agent``"""
+        gruppen: List[Tuple[List[str], List[_Regel], List[float]]] = []
+        agenten: List[str] = []
+        regeln: List[_Regel] = []
+        delays: List[float] = []
+        in_regeln = False
+
+        for zeile in text.splitlines():
+            zeile = zeile.split('#', 1)[0].strip()
+            if ':' not in zeile:
+                continue
+            schluessel, wert = zeile.split(':', 1)
+            schluessel = schluessel.strip().lower()
+            wert = wert.strip()
+
+            if schluessel == 'user-agent':
+                if in_regeln:
+                    gruppen.append((agenten, regeln, delays))
+                    agenten, regeln, delays = [], [], []
+                    in_regeln = False
+                agenten.append(wert.lower())
+            elif schluessel in ('allow', 'disallow'):
+                in_regeln = True
+                if wert:
+                    regeln.append(_Regel(schluessel == 'allow', _normalisiere(wert)))
+            elif schluessel == 'crawl-delay':
+                in_regeln = True
+                try:
+                    delays.append(float(wert))
+                except ValueError:
+                    pass
+        if agenten:
+            gruppen.append((agenten, regeln, delays))
+
+        # Gruppe des eigenen Produkt-Tokens (RFC 9309: exakt, ohne
+        # Groß-/Kleinschreibung), sonst '*'
+        token = user_agent.split('/', 1)[0].strip().lower()
+        ziel = token if any(token in agenten for agenten, _, _ in gruppen) else '*'
+
+        gewaehlt: List[_Regel] = []
+        crawl_delay = None
+        for agenten, regeln, delays in gruppen:
+            if ziel in agenten:
+                gewaehlt.extend(regeln)
+                if delays and crawl_delay is None:
+                    crawl_delay = delays[0]
+        return cls(gewaehlt, crawl_delay)
+
+    def erlaubt(self, pfad):
+        """Prüft, ob ``pfad`` (inkl. Query) abgerufen werden darf"""
+        if self.alles_verboten:
+            return False
+        if not self.regeln:
+            return True
+        pfad = _normalisiere(pfad or '/')
+        if pfad == '/robots.txt':
+            return True
+        for regel in self.regeln:
+            if regel.passt(pfad):
+                return regel.erlaubt
+        return True
+
+
+ALLES_ERLAUBT = RobotsRegeln()
+ALLES_VERBOTEN = RobotsRegeln(alles_verboten=True)
+
+
+class RobotsCache:
+    """
+    robots.txt-Cache pro Host mit TTL
+
+    Args:
+        laden: Funktion, die eine robots.txt-URL lädt und
+            ``(statuscode, text)`` liefert; Ausnahmen gelten als nicht erreichbar
+        user_agent: Produkt-Token des Scrapers
+        ttl: Gültigkeit erfolgreich geladener Regeln in Sekunden
+        fehler_ttl: Gültigkeit nach Serverfehlern (dann gilt alles als verboten)
+        nach_laden: Optionaler Callback ``(url, regeln)`` nach jedem Abruf
+    """
+
+    def __init__(self, laden: Callable[[str], Tuple[int, str]], user_agent,
+                 ttl=3600.0, fehler_ttl=300.0,
+                 nach_laden: Optional[Callable[[str, RobotsRegeln], None]] = None):
+        self._laden = laden
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.fehler_ttl = fehler_ttl
+        self.nach_laden = nach_laden
+        self._eintraege: Dict[str, Tuple[float, RobotsRegeln]] = {}
+        self._laufend: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def regeln(self, url) -> RobotsRegeln:
+        """Liefert die Regeln für den Host der URL, lädt sie bei Bedarf"""
+        teile = urlparse(url)
+        host = f"{teile.scheme}://{teile.netloc}"
+
+        while True:
+            with self._lock:
+                eintrag = self._eintraege.get(host)
+                if eintrag is not None and eintrag[0] > time.monotonic():
+                    return eintrag[1]
+                ereignis = self._laufend.get(host)
+                if ereignis is None:
+                    ereignis = threading.Event()
+                    self._laufend[host] = ereignis
+                    break
+            # Ein anderer Thread lädt bereits; auf dessen Ergebnis warten
+            ereignis.wait()
+
+        try:
+            regeln, gueltig = self._lade(host)
+            with self._lock:
+                self._eintraege[host] = (time.monotonic() + gueltig, regeln)
+        finally:
+            with self._lock:
+                del self._laufend[host]
+            ereignis.set()
+
+        if self.nach_laden:
+            self.nach_laden(host, regeln)
+        return regeln
+
+    def _lade(self, host):
+        try:
+            status, text = self._laden(f"{host}/robots.txt")
+        except Exception:
+            return ALLES_VERBOTEN, self.fehler_ttl
+
+        if 200 <= status < 300:
+            return RobotsRegeln.parse(text, self.user_agent), self.ttl
+        if 400 <= status < 500:
+            return ALLES_ERLAUBT, self.ttl
+        return ALLES_VERBOTEN, self.fehler_ttl
+
+    def erlaubt(self, url):
+        """Prüft eine URL gegen die gecachten Regeln ihres Hosts"""
+        teile = urlparse(url)
+        pfad = teile.path or '/'
+        if teile.query:
+            pfad = f"{pfad}?{teile.query}"
+        return self.regeln(url).erlaubt(pfad)
+
+    def crawl_delay(self, url) -> Optional[float]:
+        """Crawl-delay für den Host der URL (``None`` wenn nicht gesetzt)"""
+        return self.regeln(url).crawl_delay
+
+    def leeren(self):
+        """Verwirft alle gecachten Regeln"""
+        with self._lock:
+            self._eintraege.clear()
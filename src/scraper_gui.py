@@ -19,12 +19,19 @@ Features:
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
 import threading
-import json
-import csv
 from datetime import datetime
 import webbrowser
 import os
 
+try:
+    from .export import FORMATE, erkenne_format, exportiere
+    from .ergebnis_ansicht import ErgebnisAnsicht
+    from .profil import mit_profil
+except ImportError:
+    from export import FORMATE, erkenne_format, exportiere
+    from ergebnis_ansicht import ErgebnisAnsicht
+    from profil import mit_profil
+
 class ScraperGUI:
     def __init__(self, root):
         self.root = root
@@ -34,6 +41,7 @@ class ScraperGUI:
         
         self.aktuelle_ergebnisse = []
         self.scraping_aktiv = False
+        self.arbeiter = None
         
         self.setup_gui()
         
@@ -72,14 +80,25 @@ class ScraperGUI:
         self.ort_var = tk.StringVar()
         ttk.Entry(search_frame, textvariable=self.ort_var, width=30).grid(row=1, column=1, sticky=(tk.W, tk.E), pady=(10, 0))
         
+        # Seiten und Modus
+        ttk.Label(search_frame, text="Max. Seiten:").grid(row=2, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        self.max_seiten_var = tk.IntVar(value=3)
+        ttk.Spinbox(search_frame, from_=1, to=50, textvariable=self.max_seiten_var, width=5).grid(row=2, column=1, sticky=tk.W, pady=(10, 0))
+        
+        self.live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="Live-Suche (echte Anfragen)", variable=self.live_var).grid(row=3, column=1, sticky=tk.W, pady=(10, 0))
+        
     def create_control_section(self, parent):
         """Erstellt den Steuerungsbereich"""
         control_frame = ttk.Frame(parent)
         control_frame.grid(row=2, column=0, columnspan=3, pady=(0, 10))
         
-        self.start_button = ttk.Button(control_frame, text="🚀 Demo starten", command=self.demo_scraping)
+        self.start_button = ttk.Button(control_frame, text="🚀 Suche starten", command=self.start_scraping)
         self.start_button.pack(side=tk.LEFT, padx=(0, 10))
         
+        self.stop_button = ttk.Button(control_frame, text="⏹ Abbrechen", command=self.stop_scraping, state=tk.DISABLED)
+        self.stop_button.pack(side=tk.LEFT, padx=(0, 10))
+        
         self.export_button = ttk.Button(control_frame, text="💾 Demo Export", command=self.demo_export)
         self.export_button.pack(side=tk.LEFT, padx=(0, 10))
         
@@ -108,6 +127,9 @@ class ScraperGUI:
         self.results_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
+        # Daten liegen im View-Model; im Treeview stehen nur die sichtbaren Zeilen
+        self.ergebnisse = ErgebnisAnsicht(self.results_tree, scrollbar)
+        
     def create_status_section(self, parent):
         """Erstellt die Statusleiste"""
         status_frame = ttk.Frame(parent)
@@ -117,6 +139,75 @@ class ScraperGUI:
         self.status_var = tk.StringVar(value="Bereit - Demo-Version")
         ttk.Label(status_frame, textvariable=self.status_var).grid(row=0, column=0, sticky=tk.W)
         
+    def start_scraping(self):
+        """Startet die Demo oder eine Live-Suche im Hintergrund"""
+        if not self.live_var.get():
+            self.demo_scraping()
+            return
+        
+        suchbegriff = self.suchbegriff_var.get().strip()
+        if not suchbegriff:
+            messagebox.showwarning("Warnung", "Bitte einen Suchbegriff eingeben.")
+            return
+        
+        try:
+            if self.arbeiter is None:
+                try:
+                    from .kleinanzeigen_scraper import KleinanzeigenScraper
+                    from .hintergrund import HintergrundArbeiter
+                except ImportError:
+                    from kleinanzeigen_scraper import KleinanzeigenScraper
+                    from hintergrund import HintergrundArbeiter
+                self.arbeiter = HintergrundArbeiter(KleinanzeigenScraper())
+        except ImportError as e:
+            messagebox.showerror("Fehlende Module", f"Live-Suche nicht verfügbar:\n{e}\n\npip install -r requirements.txt")
+            return
+        
+        self.ergebnisse.leeren()
+        self.arbeiter.starte(suchbegriff, self.ort_var.get().strip(), max_seiten=self.max_seiten_var.get())
+        self.scraping_aktiv = True
+        self.start_button.configure(state=tk.DISABLED)
+        self.stop_button.configure(state=tk.NORMAL)
+        self.status_var.set(f"Suche nach '{suchbegriff}' läuft...")
+        self.root.after(100, self.pruefe_meldungen)
+        
+    def stop_scraping(self):
+        """Bricht die laufende Suche ab"""
+        if self.arbeiter is not None:
+            self.arbeiter.abbrechen()
+            self.status_var.set("Suche wird abgebrochen...")
+        
+    def pruefe_meldungen(self):
+        """Übernimmt Ergebnisse und Fortschritt aus dem Hintergrund-Thread"""
+        try:
+            from .hintergrund import MELDUNG_ANZEIGEN, MELDUNG_FERTIG, MELDUNG_ABGEBROCHEN
+        except ImportError:
+            from hintergrund import MELDUNG_ANZEIGEN, MELDUNG_FERTIG, MELDUNG_ABGEBROCHEN
+        
+        for meldung in self.arbeiter.hole_meldungen():
+            f = meldung.fortschritt
+            if meldung.art == MELDUNG_ANZEIGEN:
+                self.ergebnisse.hinzufuegen((a.titel, a.preis or "", a.ort, a.kategorie) for a in meldung.anzeigen)
+                self.status_var.set(f"Seite {f.seiten_fertig}/{f.seiten_gesamt} - {f.anzeigen} Anzeigen "
+                                    f"({f.anzeigen_pro_sekunde:.1f}/s)")
+                continue
+            
+            self.scraping_aktiv = False
+            if meldung.art == MELDUNG_FERTIG:
+                self.status_var.set(f"Suche abgeschlossen - {f.anzeigen} Anzeigen auf {f.seiten_fertig} Seiten "
+                                    f"in {f.dauer:.1f} s")
+            elif meldung.art == MELDUNG_ABGEBROCHEN:
+                self.status_var.set(f"Suche abgebrochen - {f.anzeigen} Anzeigen")
+            else:
+                self.status_var.set("Suche fehlgeschlagen")
+                messagebox.showerror("Fehler", f"Fehler bei der Suche:\n{meldung.fehler}")
+        
+        if self.scraping_aktiv:
+            self.root.after(100, self.pruefe_meldungen)
+        else:
+            self.start_button.configure(state=tk.NORMAL)
+            self.stop_button.configure(state=tk.DISABLED)
+        
     def demo_scraping(self):
         """Demo-Scraping mit Beispieldaten"""
         # Demo-Daten erstellen
@@ -128,73 +219,47 @@ class ScraperGUI:
             ("Gartenpflege", "25 €/h", "Frankfurt", "Garten")
         ]
         
-        # Alte Ergebnisse löschen
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-        
-        # Demo-Daten hinzufügen
-        for data in demo_daten:
-            self.results_tree.insert('', 'end', values=data)
+        # Alte Ergebnisse löschen und Demo-Daten hinzufügen
+        self.ergebnisse.leeren()
+        self.ergebnisse.hinzufuegen(demo_daten)
         
         self.status_var.set(f"Demo abgeschlossen - {len(demo_daten)} Anzeigen gefunden")
         messagebox.showinfo("Demo", f"Demo-Scraping abgeschlossen!\n\nGefunden: {len(demo_daten)} Anzeigen\n\nFür echtes Scraping benötigen Sie:\n- Die vollständigen Scraper-Module\n- Internetverbindung\n- API-Konfiguration")
         
     def demo_export(self):
         """Demo-Export Funktion"""
-        if not self.results_tree.get_children():
+        if not len(self.ergebnisse) and not self.ergebnisse.laedt:
             messagebox.showwarning("Warnung", "Keine Daten zum Exportieren!\nStarten Sie zuerst das Demo-Scraping.")
             return
         
         filename = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json"), ("Text files", "*.txt")],
+            filetypes=[("CSV files", "*.csv"), ("JSON Lines", "*.jsonl"), ("JSON files", "*.json"),
+                       ("Text files", "*.txt"), ("CSV (gzip)", "*.csv.gz"), ("JSON Lines (gzip)", "*.jsonl.gz")],
             title="Demo-Export speichern"
         )
         
         if filename:
             try:
-                # Daten sammeln
-                data = []
-                for item in self.results_tree.get_children():
-                    values = self.results_tree.item(item)['values']
-                    data.append({
-                        'titel': values[0],
-                        'preis': values[1],
-                        'ort': values[2],
-                        'kategorie': values[3]
-                    })
+                # Zeilen werden beim Schreiben gelesen, nicht vorher gesammelt
+                felder = ('titel', 'preis', 'ort', 'kategorie')
+                zeilen = (dict(zip(felder, werte)) for werte in self.ergebnisse.zeilen)
                 
-                # Export basierend auf Dateierweiterung
-                if filename.endswith('.csv'):
-                    with open(filename, 'w', newline='', encoding='utf-8') as f:
-                        writer = csv.DictWriter(f, fieldnames=['titel', 'preis', 'ort', 'kategorie'])
-                        writer.writeheader()
-                        writer.writerows(data)
-                elif filename.endswith('.json'):
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, ensure_ascii=False, indent=2)
-                else:  # .txt
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        f.write("Kleinanzeigen Demo-Export\n")
-                        f.write("=" * 30 + "\n\n")
-                        for i, item in enumerate(data, 1):
-                            f.write(f"Anzeige {i}:\n")
-                            f.write(f"  Titel: {item['titel']}\n")
-                            f.write(f"  Preis: {item['preis']}\n")
-                            f.write(f"  Ort: {item['ort']}\n")
-                            f.write(f"  Kategorie: {item['kategorie']}\n\n")
+                # Format und Kompression anhand der Dateiendung, sonst Text
+                format = None if erkenne_format(filename)[0] in FORMATE else 'txt'
+                anzahl = exportiere(zeilen, filename, format=format, felder=felder)
                 
-                messagebox.showinfo("Export erfolgreich", f"Demo-Daten erfolgreich exportiert:\n{filename}")
+                messagebox.showinfo("Export erfolgreich", f"{anzahl} Demo-Anzeigen erfolgreich exportiert:\n{filename}")
                 
             except Exception as e:
                 messagebox.showerror("Export-Fehler", f"Fehler beim Export:\n{str(e)}")
     
     def clear_results(self):
         """Löscht alle Ergebnisse"""
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+        self.ergebnisse.leeren()
         self.status_var.set("Ergebnisse gelöscht")
 
+@mit_profil('gui')
 def main():
     """Hauptfunktion zum Starten der GUI"""
     root = tk.Tk()
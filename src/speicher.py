@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Anzeigenspeicher
+========================================
+
+Persistente Ablage von ``DienstleistungsAnzeige`` in SQLite.
+
+- WAL-Modus, gebündelte Upserts mit der URL als Schlüssel
+- Indizes auf Kategorie, Ort und geparstem Preisbetrag
+- FTS5-Volltextindex über Titel und Beschreibung
+- Dieselben Filter wie ``filtere_nach_*``, aber als SQL ausgeführt
+- Ob Beschreibung und Kontakt von der Detailseite stammen, wird
+  mitgespeichert; ein erneutes Speichern der Ergebnisliste überschreibt
+  geladene Details nicht mit dem Listentext
+
+Orte liegen wie im ``OrtsIndex`` in einer eigenen Tabelle: die
+Teilstring-Suche prüft nur die wenigen unterschiedlichen Orte und
+holt die Anzeigen dann über den Index.
+
+Verwendung:
+    with AnzeigenSpeicher("anzeigen.db") as speicher:
+        speicher.speichere(anzeigen)
+        treffer = speicher.filtere(kategorie='it', ort='berlin', max_preis=60)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+_SPALTEN = ('url', 'titel', 'beschreibung', 'preis', 'ort', 'kategorie', 'kontakt', 'datum', 'tags',
+            'details_geladen')
+
+
+def fts5_verfuegbar() -> bool:
+    """Prüft, ob das eingebundene SQLite FTS5 unterstützt"""
+    db = sqlite3.connect(':memory:')
+    try:
+        db.execute('CREATE VIRTUAL TABLE t USING fts5(x)')
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        db.close()
+
+
+def _fts_anfrage(text):
+    """Macht aus Freitext eine FTS5-Anfrage, in der jedes Wort vorkommen muss"""
+    return ' '.join('"' + wort.replace('"', '""') + '"' for wort in text.split())
+
+
+class AnzeigenSpeicher:
+    """
+    SQLite-Speicher für Anzeigen
+
+    Args:
+        pfad: SQLite-Datei (``':memory:'`` für flüchtige Nutzung)
+        batch_groesse: Anzeigen pro Transaktion beim Speichern
+        metriken: Optionale ``Metriken`` (z. B. ``scraper.metriken``); jede
+            Transaktion zählt zur Stufe ``speichern``
+    """
+
+    def __init__(self, pfad='anzeigen.db', batch_groesse=5000, metriken=None):
+        try:
+            from .kleinanzeigen_scraper import DienstleistungsAnzeige, NichtGeladen
+        except ImportError:
+            from kleinanzeigen_scraper import DienstleistungsAnzeige, NichtGeladen
+        self._anzeige_klasse = DienstleistungsAnzeige
+        self._nicht_geladen = NichtGeladen
+
+        self.pfad = pfad
+        self.batch_groesse = batch_groesse
+        self.metriken = metriken
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(pfad, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        # Größerer Seitencache: Index-Seiten bleiben bei großen Upserts im Speicher
+        self._db.execute('PRAGMA cache_size=-65536')
+        self.volltext = fts5_verfuegbar()
+        self._erstelle_schema()
+        self._orte = dict(self._db.execute('SELECT klein, id FROM orte'))
+
+    def _erstelle_schema(self):
+        with self._db:
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS orte (
+                    id INTEGER PRIMARY KEY,
+                    klein TEXT NOT NULL UNIQUE
+                );
+                CREATE TABLE IF NOT EXISTS anzeigen (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL UNIQUE,
+                    titel TEXT NOT NULL,
+                    beschreibung TEXT NOT NULL,
+                    preis TEXT,
+                    preis_betrag REAL,
+                    ort TEXT NOT NULL,
+                    ort_id INTEGER NOT NULL REFERENCES orte (id),
+                    kategorie TEXT NOT NULL,
+                    kontakt TEXT NOT NULL,
+                    datum TEXT,
+                    tags TEXT NOT NULL,
+                    details_geladen INTEGER NOT NULL DEFAULT 1,
+                    zuerst REAL NOT NULL,
+                    zuletzt REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS anzeigen_kategorie ON anzeigen (kategorie);
+                CREATE INDEX IF NOT EXISTS anzeigen_ort ON anzeigen (ort_id);
+                CREATE INDEX IF NOT EXISTS anzeigen_preis ON anzeigen (preis_betrag);
+            """)
+            spalten = {zeile[1] for zeile in self._db.execute('PRAGMA table_info(anzeigen)')}
+            if 'details_geladen' not in spalten:
+                # Datenbanken älterer Versionen
+                self._db.execute('ALTER TABLE anzeigen ADD COLUMN details_geladen INTEGER NOT NULL DEFAULT 1')
+            if self.volltext:
+                # Externer Inhalt: der Volltextindex speichert keine Kopie der Texte
+                self._db.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS anzeigen_fts USING fts5 (
+                        titel, beschreibung, content='anzeigen', content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS anzeigen_fts_neu AFTER INSERT ON anzeigen BEGIN
+                        INSERT INTO anzeigen_fts (rowid, titel, beschreibung)
+                        VALUES (new.id, new.titel, new.beschreibung);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS anzeigen_fts_weg AFTER DELETE ON anzeigen BEGIN
+                        INSERT INTO anzeigen_fts (anzeigen_fts, rowid, titel, beschreibung)
+                        VALUES ('delete', old.id, old.titel, old.beschreibung);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS anzeigen_fts_neu_text
+                    AFTER UPDATE OF titel, beschreibung ON anzeigen BEGIN
+                        INSERT INTO anzeigen_fts (anzeigen_fts, rowid, titel, beschreibung)
+                        VALUES ('delete', old.id, old.titel, old.beschreibung);
+                        INSERT INTO anzeigen_fts (rowid, titel, beschreibung)
+                        VALUES (new.id, new.titel, new.beschreibung);
+                    END;
+                """)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM anzeigen').fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.schliessen()
+
+    def schliessen(self):
+        """Schließt die Datenbank"""
+        with self._lock:
+            self._db.close()
+
+    def _ort_id(self, ort, neue_orte: List[str]):
+        """ID eines Orts, legt ihn bei Bedarf an und merkt ihn in ``neue_orte`` (Lock gehalten)"""
+        klein = ort.lower()
+        ort_id = self._orte.get(klein)
+        if ort_id is None:
+            self._db.execute('INSERT OR IGNORE INTO orte (klein) VALUES (?)', (klein,))
+            ort_id = self._db.execute('SELECT id FROM orte WHERE klein = ?', (klein,)).fetchone()[0]
+            self._orte[klein] = ort_id
+            neue_orte.append(klein)
+        return ort_id
+
+    def speichere(self, anzeigen: Iterable, zeitpunkt: Optional[float] = None) -> int:
+        """
+        Speichert Anzeigen gebündelt; vorhandene URLs werden aktualisiert
+
+        Liefert die Anzahl verarbeiteter Anzeigen.
+        """
+        zeitpunkt = time.time() if zeitpunkt is None else zeitpunkt
+        anzeigen = iter(anzeigen)
+        anzahl = 0
+        while True:
+            batch = list(islice(anzeigen, self.batch_groesse))
+            if not batch:
+                return anzahl
+            start = time.perf_counter()
+            with self._lock:
+                neue_orte = []
+                try:
+                    with self._db:
+                        self._speichere_batch(batch, zeitpunkt, neue_orte)
+                except BaseException:
+                    # Nach dem Rollback gibt es die im Batch angelegten Orte nicht mehr
+                    for klein in neue_orte:
+                        del self._orte[klein]
+                    raise
+            if self.metriken is not None:
+                self.metriken.beobachte_stufe('speichern', time.perf_counter() - start)
+            anzahl += len(batch)
+
+    def _speichere_batch(self, batch, zeitpunkt, neue_orte):
+        """
+        Schreibt einen Batch (Lock und Transaktion gehalten)
+
+        Beschreibung und Kontakt einer vorhandenen Anzeige werden nur
+        ersetzt, wenn die neuen Werte von der Detailseite stammen oder die
+        gespeicherten es auch nicht tun.
+        """
+        zeilen = [
+            (a.url, a.titel, a.roher_wert('beschreibung'), a.preis, a.preis_info.betrag, a.ort,
+             self._ort_id(a.ort, neue_orte), a.kategorie, a.roher_wert('kontakt'), a.datum,
+             json.dumps(a.tags, ensure_ascii=False), a.details_geladen and a.details_fehler is None,
+             zeitpunkt, zeitpunkt)
+            for a in batch
+        ]
+        self._db.executemany("""
+            INSERT INTO anzeigen (url, titel, beschreibung, preis, preis_betrag, ort, ort_id,
+                                  kategorie, kontakt, datum, tags, details_geladen, zuerst, zuletzt)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (url) DO UPDATE SET
+                titel = excluded.titel,
+                beschreibung = CASE WHEN excluded.details_geladen OR NOT anzeigen.details_geladen
+                                    THEN excluded.beschreibung ELSE anzeigen.beschreibung END,
+                preis = excluded.preis, preis_betrag = excluded.preis_betrag,
+                ort = excluded.ort, ort_id = excluded.ort_id, kategorie = excluded.kategorie,
+                kontakt = CASE WHEN excluded.details_geladen OR NOT anzeigen.details_geladen
+                               THEN excluded.kontakt ELSE anzeigen.kontakt END,
+                datum = excluded.datum, tags = excluded.tags,
+                details_geladen = excluded.details_geladen OR anzeigen.details_geladen,
+                zuletzt = excluded.zuletzt
+        """, zeilen)
+
+    def _anzeige(self, zeile):
+        url, titel, beschreibung, preis, ort, kategorie, kontakt, datum, tags, details_geladen = zeile
+        if not details_geladen:
+            beschreibung, kontakt = self._nicht_geladen(beschreibung), self._nicht_geladen(kontakt)
+        return self._anzeige_klasse(
+            titel=titel, beschreibung=beschreibung, preis=preis, ort=ort,
+            kategorie=kategorie, kontakt=kontakt, url=url, datum=datum, tags=json.loads(tags),
+        )
+
+    def _abfrage(self, sql, parameter, stueck=1000) -> Iterator:
+        """Führt eine Abfrage aus und liefert Anzeigen stückweise"""
+        with self._lock:
+            cursor = self._db.execute(sql, parameter)
+        while True:
+            with self._lock:
+                zeilen = cursor.fetchmany(stueck)
+            if not zeilen:
+                return
+            for zeile in zeilen:
+                yield self._anzeige(zeile)
+
+    def filtere(self, kategorie=None, ort=None, min_preis=None, max_preis=None,
+                ohne_preis_behalten=True, text=None, limit=None) -> Iterator:
+        """
+        Kombinierte Abfrage, ausgewertet in SQLite
+
+        Die Bedingungen entsprechen ``filtere_nach_kategorie``,
+        ``filtere_nach_ort`` und ``filtere_nach_preisspanne``; ``text``
+        sucht im Volltextindex. Ergebnisse kommen in Einfügereihenfolge
+        und werden beim Iterieren stückweise geladen.
+        """
+        bedingungen = []
+        parameter = []
+        if kategorie is not None:
+            bedingungen.append('a.kategorie = ?')
+            parameter.append(kategorie)
+        if ort is not None:
+            bedingungen.append('a.ort_id IN (SELECT id FROM orte WHERE instr(klein, ?) > 0)')
+            parameter.append(ort.lower())
+        if min_preis is not None or max_preis is not None:
+            bereich = []
+            if min_preis is not None:
+                bereich.append('a.preis_betrag >= ?')
+                parameter.append(min_preis)
+            if max_preis is not None:
+                bereich.append('a.preis_betrag <= ?')
+                parameter.append(max_preis)
+            bereich = ' AND '.join(bereich)
+            if ohne_preis_behalten:
+                bereich = f'(a.preis_betrag IS NULL OR ({bereich}))'
+            bedingungen.append(bereich)
+        if text:
+            if self.volltext:
+                bedingungen.append('a.id IN (SELECT rowid FROM anzeigen_fts WHERE anzeigen_fts MATCH ?)')
+                parameter.append(_fts_anfrage(text))
+            else:
+                for wort in text.lower().split():
+                    bedingungen.append("instr(lower(a.titel || ' ' || a.beschreibung), ?) > 0")
+                    parameter.append(wort)
+
+        sql = 'SELECT ' + ', '.join('a.' + s for s in _SPALTEN) + ' FROM anzeigen a'
+        if bedingungen:
+            sql += ' WHERE ' + ' AND '.join(bedingungen)
+        sql += ' ORDER BY a.id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            parameter.append(limit)
+        return self._abfrage(sql, parameter)
+
+    def alle(self) -> Iterator:
+        """Alle Anzeigen in Einfügereihenfolge, stückweise geladen"""
+        return self.filtere()
+
+    def filtere_nach_kategorie(self, kategorie) -> List:
+        """Wie ``KleinanzeigenScraper.filtere_nach_kategorie``"""
+        return list(self.filtere(kategorie=kategorie))
+
+    def filtere_nach_ort(self, ort) -> List:
+        """Wie ``KleinanzeigenScraper.filtere_nach_ort``"""
+        return list(self.filtere(ort=ort))
+
+    def filtere_nach_preisspanne(self, min_preis=None, max_preis=None, ohne_preis_behalten=True) -> List:
+        """Wie ``KleinanzeigenScraper.filtere_nach_preisspanne``"""
+        return list(self.filtere(min_preis=min_preis, max_preis=max_preis,
+                                 ohne_preis_behalten=ohne_preis_behalten))
+
+    def suche(self, text, limit=None) -> List:
+        """
+        Volltextsuche über Titel und Beschreibung, beste Treffer zuerst
+
+        Alle Wörter müssen vorkommen. Ohne FTS5 wird per Teilstring
+        gesucht und in Einfügereihenfolge geliefert.
+        """
+        if not self.volltext:
+            return list(self.filtere(text=text, limit=limit))
+        sql = ('SELECT ' + ', '.join('a.' + s for s in _SPALTEN) +
+               ' FROM anzeigen_fts JOIN anzeigen a ON a.id = anzeigen_fts.rowid'
+               ' WHERE anzeigen_fts MATCH ? ORDER BY bm25(anzeigen_fts)')
+        parameter = [_fts_anfrage(text)]
+        if limit is not None:
+            sql += ' LIMIT ?'
+            parameter.append(limit)
+        return list(self._abfrage(sql, parameter))
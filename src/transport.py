@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Kleinanzeigen Scraper - Transport
+=================================
+
+HTTP-Schicht des Scrapers mit fest dimensionierten Verbindungspools.
+
+- ``Transport``: ``requests.Session`` mit eigenem Adapter; Pools pro
+  Host (``pool_pro_host``) und Anzahl gehaltener Host-Pools (``hosts``)
+  sind explizit gesetzt, damit parallele Threads keine Verbindungen
+  verwerfen und neu aufbauen
+- ``HTTP2Transport``: optional über httpx mit HTTP/2-Multiplexing
+  (``pip install httpx[http2]``); Antworten und Fehler werden in
+  ``requests``-Objekte übersetzt, der Rest des Scrapers bleibt gleich
+- ``Accept-Encoding`` enthält zusätzlich ``br`` und ``zstd``, wenn die
+  Bibliotheken zum Entpacken installiert sind (brotli, zstandard)
+- Mit ``metriken`` werden neu aufgebaute Verbindungen pro Host, Bytes
+  auf der Leitung (komprimiert) und die HTTP-Version gezählt; der
+  Anteil wiederverwendeter Verbindungen steht in ``metriken.statistik()``
+
+Verwendung:
+    scraper = KleinanzeigenScraper(transport=erstelle_transport(http2=True, pool_pro_host=8))
+"""
+
+import importlib.util
+import sys
+import threading
+
+# Standard-Header aller Anfragen (Accept-Encoding setzt der Transport)
+STANDARD_HEADER = {
+    'User-Agent': 'Mozilla/5.0 (compatible; KleinanzeigenScraper/1.0)',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'de-DE,de;q=0.5',
+    'Connection': 'keep-alive',
+}
+
+
+def _verfuegbar(*module) -> bool:
+    return any(importlib.util.find_spec(modul) is not None for modul in module)
+
+
+class Transport:
+    """
+    ``requests``-Transport mit dimensionierten Pools und Verbindungszählung
+
+    Args:
+        pool_pro_host: Verbindungen, die pro Host offen gehalten werden;
+            mindestens so groß wie die Zahl paralleler Anfragen wählen
+        hosts: Anzahl Hosts, deren Pools gleichzeitig gehalten werden
+        blockieren: Bei vollem Pool auf eine freie Verbindung warten,
+            statt eine zusätzliche zu öffnen und danach zu verwerfen
+        metriken: ``Metriken`` für Verbindungs- und Byte-Zähler
+        session: Vorhandene ``requests.Session``; wird unverändert
+            verwendet (ohne Pool-Dimensionierung und Zählung)
+    """
+
+    def __init__(self, pool_pro_host=10, hosts=10, blockieren=False, metriken=None, session=None):
+        self.pool_pro_host = pool_pro_host
+        self.hosts = hosts
+        self.blockieren = blockieren
+        self.metriken = metriken
+        self._session = session
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def kodierungen() -> str:
+        """Accept-Encoding, das urllib3 mit den installierten Bibliotheken entpacken kann"""
+        from urllib3.util.request import ACCEPT_ENCODING
+        return ACCEPT_ENCODING.replace(',', ', ')
+
+    @property
+    def session(self):
+        """``requests.Session`` des Transports (wird beim ersten Zugriff angelegt)"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._baue_session()
+        return self._session
+
+    def _baue_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        transport = self
+
+        def zaehlend(pool_klasse):
+            # connect() statt _new_conn(): urllib3 verbindet ein vom Server
+            # geschlossenes Verbindungsobjekt neu, ohne ein neues anzulegen
+            class Verbindung(pool_klasse.ConnectionCls):
+                def connect(self):
+                    transport._neue_verbindung(self.host)
+                    return super().connect()
+
+            class Pool(pool_klasse):
+                ConnectionCls = Verbindung
+            return Pool
+
+        pools = {'http': zaehlend(HTTPConnectionPool), 'https': zaehlend(HTTPSConnectionPool)}
+
+        class Adapter(HTTPAdapter):
+            def init_poolmanager(self, *args, **kwargs):
+                super().init_poolmanager(*args, **kwargs)
+                self.poolmanager.pool_classes_by_scheme = pools
+
+        class Session(requests.Session):
+            def send(self, request, **kwargs):
+                response = super().send(request, **kwargs)
+                # Ohne stream=True ist der Inhalt hier schon gelesen
+                if not kwargs.get('stream') and response.raw is not None:
+                    version = 'HTTP/1.0' if getattr(response.raw, 'version', 11) == 10 else 'HTTP/1.1'
+                    transport._antwort(response.raw.tell(), version)
+                return response
+
+        session = Session()
+        adapter = Adapter(pool_connections=self.hosts, pool_maxsize=self.pool_pro_host, pool_block=self.blockieren)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(STANDARD_HEADER)
+        session.headers['Accept-Encoding'] = self.kodierungen()
+        return session
+
+    def _neue_verbindung(self, host):
+        if self.metriken is not None:
+            self.metriken.zaehle('verbindungen_neu_total', host=host)
+
+    def _antwort(self, bytes_netz, version):
+        if self.metriken is not None:
+            self.metriken.zaehle('bytes_netz_total', bytes_netz)
+            self.metriken.zaehle('http_version_total', version=version)
+
+    def schliessen(self):
+        """Schließt alle offenen Verbindungen"""
+        if self._session is not None:
+            self._session.close()
+
+
+class HTTP2Transport(Transport):
+    """
+    Transport über httpx mit HTTP/2 (mehrere Anfragen pro Verbindung)
+
+    ``session`` liefert ein Objekt mit der von Scraper und HTTP-Cache
+    genutzten Teilmenge der ``requests.Session``-Schnittstelle
+    (``headers``, ``get``, ``close``). Benötigt ``httpx[http2]``.
+    """
+
+    def __init__(self, pool_pro_host=10, hosts=10, blockieren=False, metriken=None):
+        if not (_verfuegbar('httpx') and _verfuegbar('h2')):
+            raise ImportError("HTTP/2 benötigt das Paket 'httpx[http2]'")
+        super().__init__(pool_pro_host, hosts, blockieren, metriken)
+
+    @staticmethod
+    def kodierungen() -> str:
+        kodierungen = ['gzip', 'deflate']
+        if _verfuegbar('brotli', 'brotlicffi'):
+            kodierungen.append('br')
+        try:
+            from httpx._decoders import SUPPORTED_DECODERS
+            if 'zstd' in SUPPORTED_DECODERS and _verfuegbar('zstandard'):
+                kodierungen.append('zstd')
+        except ImportError:
+            pass
+        return ', '.join(kodierungen)
+
+    def _baue_session(self):
+        return _HttpxSession(self)
+
+
+class _HttpxSession:
+    """Teil der ``requests.Session``-Schnittstelle über einen ``httpx.Client``"""
+
+    def __init__(self, transport: HTTP2Transport):
+        import httpx
+
+        self._transport = transport
+        # Bei HTTP/2 teilen sich Anfragen an einen Host eine Verbindung;
+        # das Limit gilt für HTTP/1.1-Gegenstellen
+        grenzen = httpx.Limits(max_connections=transport.pool_pro_host * transport.hosts,
+                               max_keepalive_connections=transport.pool_pro_host)
+        self.client = httpx.Client(http2=True, limits=grenzen, follow_redirects=True)
+        self.client.headers.update(STANDARD_HEADER)
+        self.client.headers['Accept-Encoding'] = transport.kodierungen()
+
+    @property
+    def headers(self):
+        return self.client.headers
+
+    def _verfolge(self, ereignis, info):
+        if ereignis == 'connection.connect_tcp.complete':
+            stream = info.get('return_value')
+            adresse = stream.get_extra_info('server_addr') if stream is not None else None
+            self._transport._neue_verbindung(adresse[0] if adresse else '')
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        import httpx
+        import requests
+
+        try:
+            antwort = self.client.get(url, headers=headers, timeout=timeout,
+                                      extensions={'trace': self._verfolge})
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.ConnectionError(str(e)) from e
+        self._transport._antwort(antwort.num_bytes_downloaded, antwort.http_version)
+        return _als_requests_antwort(antwort)
+
+    def close(self):
+        self.client.close()
+
+
+def _als_requests_antwort(antwort):
+    """Übersetzt eine ``httpx.Response`` in eine ``requests.Response``"""
+    import requests
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+
+    response = requests.Response()
+    response.status_code = antwort.status_code
+    response.reason = antwort.reason_phrase
+    response.url = str(antwort.url)
+    response.headers = CaseInsensitiveDict(antwort.headers.items())
+    response.encoding = antwort.charset_encoding or get_encoding_from_headers(response.headers)
+    response._content = antwort.content
+    response.elapsed = antwort.elapsed
+    return response
+
+
+def erstelle_transport(http2=False, pool_pro_host=10, hosts=10, blockieren=False,
+                       metriken=None) -> Transport:
+    """
+    Transport nach Wunsch; ohne httpx fällt ``http2=True`` auf HTTP/1.1 zurück
+
+    Args:
+        http2: HTTP/2 über httpx verwenden, falls installiert
+    """
+    if http2:
+        if _verfuegbar('httpx') and _verfuegbar('h2'):
+            return HTTP2Transport(pool_pro_host, hosts, blockieren, metriken)
+        print("⚠️ HTTP/2 benötigt 'httpx[http2]', verwende HTTP/1.1", file=sys.stderr)
+    return Transport(pool_pro_host, hosts, blockieren, metriken)
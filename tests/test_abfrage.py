@@ -0,0 +1,47 @@
+"""Einzelprädikate und verkettete Auswertung der Abfragen liefern dasselbe"""
+
+from src.abfrage import Abfrage
+from src.kleinanzeigen_scraper import DienstleistungsAnzeige
+
+ORTE = ('Berlin', 'Köln', 'Berlin-Mitte', 'Hamburg')
+PREISE = ('20 €', '45 € VB', '80 €/h', 'Auf Anfrage', None)
+KATEGORIEN = ('it', 'handwerk', 'garten')
+
+
+def _anzeigen():
+    return [
+        DienstleistungsAnzeige(f"Anzeige {i}", "Text", PREISE[i % 5], ORTE[i % 4], KATEGORIEN[i % 3],
+                               "Kontakt", f"https://example.org/s-anzeige/a/{i}", None, [])
+        for i in range(120)
+    ]
+
+
+def _abfragen(anzeigen):
+    return [
+        Abfrage(anzeigen).kategorie('it'),
+        Abfrage(anzeigen).ort('berlin'),
+        Abfrage(anzeigen).preis(min=30, max=60),
+        Abfrage(anzeigen).preis(max=50, ohne_preis_behalten=False),
+        Abfrage(anzeigen).wo(lambda a: a.url.endswith('7')),
+        Abfrage(anzeigen).kategorie('it').ort('berlin').preis(max=60).wo(lambda a: '1' in a.titel),
+    ]
+
+
+def test_auswertung_entspricht_den_einzelpraedikaten():
+    anzeigen = _anzeigen()
+    for abfrage in _abfragen(anzeigen):
+        erwartet = [a for a in anzeigen if all(f.praedikat(a) for f in abfrage._filter)]
+        assert abfrage.liste() == erwartet
+
+
+def test_praedikate_entsprechen_der_bedeutung():
+    anzeigen = _anzeigen()
+    kategorie, ort, preis, preis_ohne, _, _ = _abfragen(anzeigen)
+    assert [a for a in anzeigen if kategorie._filter[0].praedikat(a)] == \
+        [a for a in anzeigen if a.kategorie == 'it']
+    assert [a for a in anzeigen if ort._filter[0].praedikat(a)] == \
+        [a for a in anzeigen if 'berlin' in a.ort.lower()]
+    assert [a for a in anzeigen if preis._filter[0].praedikat(a)] == \
+        [a for a in anzeigen if a.preis_info.betrag is None or 30 <= a.preis_info.betrag <= 60]
+    assert [a for a in anzeigen if preis_ohne._filter[0].praedikat(a)] == \
+        [a for a in anzeigen if a.preis_info.betrag is not None and a.preis_info.betrag <= 50]
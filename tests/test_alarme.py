@@ -0,0 +1,90 @@
+"""Planung, gemeinsamer Abruf und Fehlerbehandlung des Alarm-Schedulers"""
+
+import random
+
+from src.alarme import Alarm, AlarmScheduler
+from src.gesehen import GesehenSpeicher
+from src.kleinanzeigen_scraper import DienstleistungsAnzeige
+
+
+class _Scraper:
+    """Liefert pro Suche eine feste Ergebnisseite und zählt die Abrufe"""
+
+    def __init__(self, seiten):
+        self.seiten = seiten
+        self.abrufe = []
+
+    def baue_such_url(self, suchbegriff, ort="", seite=1):
+        return f"https://example.org/{suchbegriff}/{ort}/{seite}"
+
+    def lade_ergebnisseite(self, url):
+        self.abrufe.append(url)
+        suche = url.split('/')[3]
+        return self.seiten.get(suche, []) if url.endswith('/1') else []
+
+
+def _anzeigen(suche, anzahl):
+    return [DienstleistungsAnzeige(f"{suche} {i}", "Text", None, "Berlin", "sonstiges", "Kontakt",
+                                   f"https://example.org/s-anzeige/{suche}/{i}", None, [])
+            for i in range(anzahl)]
+
+
+def _scheduler(scraper, benachrichtige, **kwargs):
+    return AlarmScheduler(scraper, benachrichtige, jitter=0, zufall=random.Random(1), **kwargs)
+
+
+def test_gleiche_suche_wird_einmal_geladen_und_an_alle_verteilt():
+    scraper = _Scraper({'maler': _anzeigen('maler', 3)})
+    meldungen = []
+    scheduler = _scheduler(scraper, lambda alarm, treffer: meldungen.append((alarm.name, len(treffer))),
+                           gesehen=GesehenSpeicher(':memory:'))
+    scheduler.hinzufuegen(Alarm('maler', intervall=60, name='a'), jetzt=0)
+    scheduler.hinzufuegen(Alarm('maler', intervall=60, name='b'), jetzt=0)
+
+    statistik = scheduler.fuehre_zyklus_aus(jetzt=60)
+    assert statistik.alarme == 2 and statistik.seiten == 1 and statistik.neue == 3
+    assert sorted(meldungen) == [('a', 3), ('b', 3)]
+
+    # Im nächsten Zyklus ist nichts mehr neu
+    meldungen.clear()
+    scheduler.fuehre_zyklus_aus(jetzt=200)
+    assert meldungen == []
+
+
+def test_fehlerhafter_callback_stoppt_weder_andere_alarme_noch_die_planung():
+    scraper = _Scraper({'maler': _anzeigen('maler', 2), 'garten': _anzeigen('garten', 2)})
+    gemeldet = []
+
+    def benachrichtige(alarm, treffer):
+        if alarm.suchbegriff == 'maler' and not gemeldet:
+            gemeldet.append(None)
+            raise RuntimeError("Versand fehlgeschlagen")
+        gemeldet.append((alarm.name, len(treffer)))
+
+    scheduler = _scheduler(scraper, benachrichtige, gesehen=GesehenSpeicher(':memory:'))
+    maler = scheduler.hinzufuegen(Alarm('maler', intervall=60, prioritaet=1), jetzt=0)
+    garten = scheduler.hinzufuegen(Alarm('garten', intervall=60), jetzt=0)
+
+    statistik = scheduler.fuehre_zyklus_aus(jetzt=60)
+    assert statistik.fehler == 1
+    assert ('garten', 2) in gemeldet
+    assert maler.naechster_lauf > 60 and garten.naechster_lauf > 60
+    assert scheduler.naechster_zeitpunkt() == min(maler.naechster_lauf, garten.naechster_lauf)
+
+    # Die nicht zugestellten Anzeigen werden beim nächsten Lauf gemeldet
+    scheduler.fuehre_zyklus_aus(jetzt=200)
+    assert ('maler', 2) in gemeldet
+
+
+def test_fehler_beim_parsen_plant_die_alarme_neu_ein():
+    class Kaputt(_Scraper):
+        def lade_ergebnisseite(self, url):
+            raise ValueError("unerwartetes HTML")
+
+    scheduler = _scheduler(Kaputt({}), lambda alarm, treffer: None)
+    alarm = scheduler.hinzufuegen(Alarm('maler', intervall=60), jetzt=0)
+
+    statistik = scheduler.fuehre_zyklus_aus(jetzt=60)
+    assert statistik.fehler == 1
+    assert alarm.naechster_lauf == 120
+    assert scheduler.naechster_zeitpunkt() == 120
@@ -0,0 +1,51 @@
+"""Seitenabruf der asynchronen Suche"""
+
+import asyncio
+
+import pytest
+
+from src.async_scraper import AsyncKleinanzeigenScraper
+
+VOLL = AsyncKleinanzeigenScraper.VOLLE_SEITE
+
+
+def _suche(seiten, max_seiten=4):
+    """Führt eine Suche aus, deren Seite n ``seiten[n - 1]`` liefert (Zahl oder Ausnahme)"""
+    scraper = AsyncKleinanzeigenScraper(base_url="https://example.org")
+    geladen = []
+
+    async def lade_ergebnisseite(url):
+        nummer = int(url.split('seite:')[1].split('/')[0]) if 'seite:' in url else 1
+        geladen.append(nummer)
+        ergebnis = seiten[nummer - 1] if nummer <= len(seiten) else 0
+        if isinstance(ergebnis, Exception):
+            raise ergebnis
+        return [f"{nummer}-{i}" for i in range(ergebnis)]
+
+    scraper._lade_ergebnisseite = lade_ergebnisseite
+    try:
+        return asyncio.run(scraper.extrahiere_anzeigen_async("maler", max_seiten=max_seiten)), sorted(geladen)
+    finally:
+        scraper.schliessen()
+
+
+def test_nicht_volle_erste_seite_laedt_keine_weiteren():
+    anzeigen, geladen = _suche([7, VOLL, VOLL])
+    assert len(anzeigen) == 7
+    assert geladen == [1]
+
+
+def test_volle_erste_seite_laedt_den_rest_gleichzeitig_und_stoppt_an_kurzer_seite():
+    anzeigen, geladen = _suche([VOLL, VOLL, 3, VOLL])
+    assert len(anzeigen) == 2 * VOLL + 3
+    assert geladen == [1, 2, 3, 4]
+
+
+def test_fehler_auf_spaeterer_seite_behaelt_die_geladenen_anzeigen():
+    anzeigen, _ = _suche([VOLL, VOLL, RuntimeError("503"), VOLL])
+    assert len(anzeigen) == 2 * VOLL
+
+
+def test_fehler_auf_erster_seite_wird_weitergegeben():
+    with pytest.raises(RuntimeError):
+        _suche([RuntimeError("503")])
@@ -0,0 +1,69 @@
+"""Duplikat-Cluster per MinHash/LSH und ihre Nutzung in Abfrage und Export"""
+
+import json
+import os
+import subprocess
+import sys
+
+from src.duplikate import DuplikatIndex, aehnlichkeit, signatur
+from src.export import exportiere
+from src.kleinanzeigen_scraper import DienstleistungsAnzeige
+
+TEXT = ("Biete zuverlässige Hilfe bei Computerproblemen, Einrichtung von WLAN, Druckern "
+        "und Smartphones in Berlin und Umgebung, faire Preise und schnelle Termine")
+
+
+def _anzeige(nummer, titel, beschreibung):
+    return DienstleistungsAnzeige(titel, beschreibung, "30 €", "Berlin", "it", "Kontakt",
+                                  f"https://www.kleinanzeigen.de/s-anzeige/x/{nummer}-1-2", None, [])
+
+
+def _anzeigen():
+    return [
+        _anzeige(1, "PC-Hilfe vom Profi", TEXT),
+        _anzeige(2, "PC-Hilfe vom Profi", TEXT + " auch am Wochenende"),
+        _anzeige(3, "PC-Hilfe vom Profi!", TEXT.replace("faire", "günstige")),
+        _anzeige(4, "Gartenpflege", "Rasen mähen, Hecke schneiden, Laub entfernen im Herbst"),
+    ]
+
+
+def test_signatur_ist_stabil_und_aehnlichkeit_plausibel():
+    assert signatur(TEXT) == signatur(TEXT)
+    assert signatur("") is None
+    assert aehnlichkeit(signatur(TEXT), signatur(TEXT)) == 1.0
+    assert aehnlichkeit(signatur(TEXT), signatur("Rasen mähen und Hecke schneiden")) < 0.2
+
+
+def test_aehnliche_anzeigen_bilden_einen_cluster_mit_der_ersten_als_repraesentant():
+    anzeigen = _anzeigen()
+    index = DuplikatIndex().hinzufuegen_viele(anzeigen)
+    assert index.anzahl_cluster == 2
+    assert index.cluster() == [anzeigen[:3]]
+    assert index.repraesentant(anzeigen[2]) is anzeigen[0]
+    assert not index.ist_repraesentant(anzeigen[1])
+    # Eine bekannte URL wird nicht erneut aufgenommen
+    assert index.hinzufuegen(anzeigen[0]) is anzeigen[0]
+    assert len(index) == 4
+
+
+def test_export_entdoppelt_auch_mit_uebergebenem_leerem_index(tmp_path):
+    for eindeutig in (True, DuplikatIndex()):
+        pfad = tmp_path / "export.jsonl"
+        assert exportiere(_anzeigen(), str(pfad), eindeutig=eindeutig) == 2
+        titel = [json.loads(zeile)['titel'] for zeile in pfad.read_text(encoding='utf-8').splitlines()]
+        assert titel == ["PC-Hilfe vom Profi", "Gartenpflege"]
+    assert exportiere(_anzeigen(), str(tmp_path / "alle.csv")) == 4
+
+
+def test_abfrage_legt_den_index_erst_bei_eindeutig_an():
+    code = (
+        "import sys\n"
+        "from src.kleinanzeigen_scraper import KleinanzeigenScraper\n"
+        "scraper = KleinanzeigenScraper()\n"
+        "scraper.abfrage([]).kategorie('it').liste()\n"
+        "assert 'sqlite3' not in sys.modules and scraper._duplikate is None\n"
+        "scraper.abfrage([]).eindeutig().liste()\n"
+        "assert scraper._duplikate is not None\n"
+    )
+    wurzel = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=wurzel)
@@ -0,0 +1,79 @@
+"""lxml- und BeautifulSoup-Backend des Ergebnis-Parsers"""
+
+import os
+
+import pytest
+
+from src.ergebnis_parser import ErgebnisParser, STANDARD_KONTAKT, parse_detailseite, schneide_anzeigenliste
+from src.kleinanzeigen_scraper import KleinanzeigenScraper, NichtGeladen
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'fixtures', 'suchergebnis.html')
+BASE_URL = "https://www.kleinanzeigen.de"
+
+SEITE = """<html><body>
+<ul><li>Navigation</li></ul>
+<ul id="srchrslt-adtable" class="itemlist">
+  <li><article class="aditem" data-href="/s-anzeige/pc-hilfe/123-297-3331">
+    <div class="aditem-main--top--left"> 10115 Berlin
+      (2 km) </div>
+    <div class="aditem-main--top--right">Heute, 10:00</div>
+    <h2><a href="/s-anzeige/pc-hilfe/123-297-3331">PC-Hilfe &amp; Computer</a></h2>
+    <p class="aditem-main--middle--description">Hilfe bei   Computerproblemen</p>
+    <p class="aditem-main--middle--price-shipping--price"> 30 € VB </p>
+    <ul><li>verschachtelt</li></ul>
+  </article></li>
+  <li><article class="aditem top-ad"><h2><a href="/s-anzeige/garten/456-297-3331">Gartenpflege</a></h2>
+  </article></li>
+  <li><article class="aditem"><p>Ohne Titel</p></article></li>
+</ul>
+<ul><li>Fußzeile</li></ul>
+</body></html>"""
+
+
+def _parser(backend):
+    return ErgebnisParser(BASE_URL, KleinanzeigenScraper().bestimme_kategorie_und_tags, backend=backend)
+
+
+@pytest.mark.parametrize('backend', ['lxml', 'bs4'])
+def test_felder_einer_ergebnisseite(backend):
+    erste, zweite = _parser(backend).parse(SEITE)
+    assert erste.titel == "PC-Hilfe & Computer"
+    assert erste.url == "https://www.kleinanzeigen.de/s-anzeige/pc-hilfe/123-297-3331"
+    assert erste.ort == "10115 Berlin (2 km)"
+    assert erste.datum == "Heute, 10:00"
+    assert erste.preis == "30 € VB" and erste.preis_info.betrag == 30
+    assert erste.kategorie == 'it'
+    assert type(erste.roher_wert('beschreibung')) is NichtGeladen
+    assert erste.roher_wert('beschreibung') == "Hilfe bei Computerproblemen"
+    assert erste.roher_wert('kontakt') == STANDARD_KONTAKT
+    # Fehlende Felder werden zu None bzw. leerem Text
+    assert (zweite.titel, zweite.preis, zweite.datum, zweite.ort) == ("Gartenpflege", None, None, "")
+
+
+def test_beide_backends_liefern_dieselben_anzeigen():
+    with open(FIXTURE, encoding='utf-8') as datei:
+        html = datei.read()
+    lxml_anzeigen = _parser('lxml').parse(html)
+    assert len(lxml_anzeigen) == 25
+    assert lxml_anzeigen == _parser('bs4').parse(html.encode('utf-8'))
+
+
+def test_schneide_anzeigenliste_beachtet_verschachtelte_listen():
+    teil = schneide_anzeigenliste(SEITE)
+    assert teil.startswith('<ul id="srchrslt-adtable"') and teil.endswith('</ul>')
+    assert 'verschachtelt' in teil and 'Fußzeile' not in teil
+    assert schneide_anzeigenliste("<p>keine Liste</p>") == "<p>keine Liste</p>"
+
+
+def test_leere_seite_und_unbekanntes_backend():
+    assert _parser('lxml').parse("") == []
+    assert _parser('bs4').parse("") == []
+    with pytest.raises(ValueError):
+        _parser('regex')
+
+
+def test_detailseite():
+    html = """<div id="viewad-description-text"> Ausführliche
+        Beschreibung </div><div id="viewad-contact"><span class="userprofile-vip">Max M.</span></div>"""
+    assert parse_detailseite(html) == {'beschreibung': "Ausführliche Beschreibung", 'kontakt': "Max M."}
+    assert parse_detailseite(b"<p>nichts</p>") == {}
@@ -0,0 +1,93 @@
+"""Streamende Exportformate, Kompression und Formaterkennung"""
+
+import csv
+import gzip
+import importlib.util
+import json
+
+import pytest
+
+from src.export import FELDER, erkenne_format, exportiere
+from src.kleinanzeigen_scraper import DienstleistungsAnzeige
+
+
+def _anzeigen(anzahl=3):
+    return [DienstleistungsAnzeige(f"Anzeige {i}", "Beschreibung, mit \"Komma\"", f"{10 * i} €/h", "Berlin",
+                                   "it", "Kontakt", f"https://www.kleinanzeigen.de/s-anzeige/x/{i}-1-2",
+                                   None, ['it', 'pc'])
+            for i in range(1, anzahl + 1)]
+
+
+@pytest.mark.parametrize('pfad, erwartet', [
+    ("a.csv", ('csv', None)),
+    ("a.JSONL.gz", ('jsonl', 'gzip')),
+    ("a.json.zst", ('json', 'zstd')),
+    ("a.parquet", ('parquet', None)),
+    ("ohne_endung", ('csv', None)),
+])
+def test_erkenne_format(pfad, erwartet):
+    assert erkenne_format(pfad) == erwartet
+
+
+def test_csv_und_jsonl_in_kleinen_stuecken(tmp_path):
+    assert exportiere(_anzeigen(), str(tmp_path / "a.csv"), stueck_groesse=2) == 3
+    with open(tmp_path / "a.csv", encoding='utf-8', newline='') as datei:
+        zeilen = list(csv.reader(datei))
+    assert zeilen[0] == list(FELDER)
+    assert len(zeilen) == 4
+    zeile = dict(zip(FELDER, zeilen[1]))
+    assert zeile['beschreibung'] == "Beschreibung, mit \"Komma\""
+    assert (zeile['preis_betrag'], zeile['preis_einheit'], zeile['tags']) == ('10.0', 'stunde', 'it, pc')
+
+    assert exportiere(_anzeigen(), str(tmp_path / "a.jsonl"), stueck_groesse=2) == 3
+    zeilen = [json.loads(z) for z in (tmp_path / "a.jsonl").read_text(encoding='utf-8').splitlines()]
+    assert [z['titel'] for z in zeilen] == ["Anzeige 1", "Anzeige 2", "Anzeige 3"]
+    assert zeilen[2]['preis_betrag'] == 30.0 and zeilen[2]['tags'] == ['it', 'pc']
+
+
+def test_json_ist_ein_gueltiges_array_auch_ohne_anzeigen(tmp_path):
+    pfad = tmp_path / "a.json"
+    assert exportiere(_anzeigen(), str(pfad), felder=('titel', 'url'), stueck_groesse=1) == 3
+    daten = json.loads(pfad.read_text(encoding='utf-8'))
+    assert daten[1] == {'titel': "Anzeige 2", 'url': "https://www.kleinanzeigen.de/s-anzeige/x/2-1-2"}
+
+    assert exportiere([], str(pfad)) == 0
+    assert json.loads(pfad.read_text(encoding='utf-8')) == []
+
+
+def test_txt_und_dicts_als_eingabe(tmp_path):
+    pfad = tmp_path / "a.txt"
+    assert exportiere([{'titel': "Aus Dict", 'tags': ['a', 'b']}], str(pfad), felder=('titel', 'tags', 'ort')) == 1
+    text = pfad.read_text(encoding='utf-8')
+    assert text.startswith("Kleinanzeigen Export\n")
+    assert "Anzeige 1:\n  Titel: Aus Dict\n  Tags: a, b\n  Ort: \n" in text
+
+
+def test_gzip_nach_endung_und_explizit(tmp_path):
+    pfad = tmp_path / "a.jsonl.gz"
+    assert exportiere(_anzeigen(2), str(pfad)) == 2
+    with gzip.open(pfad, 'rt', encoding='utf-8') as datei:
+        assert len(datei.read().splitlines()) == 2
+
+    pfad = tmp_path / "ausgabe"
+    exportiere(_anzeigen(2), str(pfad), format='csv', kompression='gzip')
+    with gzip.open(pfad, 'rt', encoding='utf-8') as datei:
+        assert datei.readline().startswith('titel,')
+
+
+def test_unbekanntes_format_und_kompression(tmp_path):
+    with pytest.raises(ValueError):
+        exportiere(_anzeigen(), str(tmp_path / "a.xml"))
+    with pytest.raises(ValueError):
+        exportiere(_anzeigen(), str(tmp_path / "a.csv"), kompression='bz2')
+
+
+@pytest.mark.skipif(importlib.util.find_spec('pyarrow') is None, reason="pyarrow nicht installiert")
+def test_parquet(tmp_path):
+    import pyarrow.parquet as pq
+    pfad = tmp_path / "a.parquet"
+    assert exportiere(_anzeigen(5), str(pfad), stueck_groesse=2) == 5
+    tabelle = pq.read_table(pfad)
+    assert tabelle.num_rows == 5
+    assert tabelle.column('preis_betrag').to_pylist() == [10.0, 20.0, 30.0, 40.0, 50.0]
+    assert pq.ParquetFile(pfad).num_row_groups == 3
@@ -0,0 +1,84 @@
+"""Atomare Neu-Erkennung, Bereiche und Ausaltern im GesehenSpeicher"""
+
+import threading
+import time
+from collections import namedtuple
+
+from src.gesehen import BloomFilter, GesehenSpeicher, normalisiere_url
+
+Anzeige = namedtuple('Anzeige', 'url')
+
+
+def _url(nummer, titel="pc-hilfe"):
+    return f"https://www.kleinanzeigen.de/s-anzeige/{titel}/{nummer}-297-3331"
+
+
+def test_normalisiere_url():
+    schluessel = "kleinanzeigen.de/s-anzeige/123"
+    assert normalisiere_url(_url(123)) == schluessel
+    assert normalisiere_url("http://kleinanzeigen.de/s-anzeige/anderer-titel/123-297-3331/?utm_source=x") == schluessel
+    assert normalisiere_url(" https://WWW.Example.org/pfad/?b=2&utm_medium=y&a=1#oben ") == "example.org/pfad?a=1&b=2"
+
+
+def test_neue_liefert_jede_anzeige_einmal_auch_innerhalb_der_seite():
+    with GesehenSpeicher(':memory:') as gesehen:
+        seite = [Anzeige(_url(1)), Anzeige(_url(2)), Anzeige(_url(1, "neuer-titel"))]
+        assert gesehen.neue(seite) == seite[:2]
+        assert gesehen.neue(seite + [Anzeige(_url(3))]) == [Anzeige(_url(3))]
+        assert len(gesehen) == 3
+
+
+def test_ohne_markieren_und_mit_getrennten_bereichen():
+    with GesehenSpeicher(':memory:') as gesehen:
+        seite = [Anzeige(_url(1))]
+        assert gesehen.neue(seite, markieren=False) == seite
+        assert gesehen.neue(seite, markieren=False) == seite
+        assert not gesehen.enthaelt(_url(1))
+
+        gesehen.markiere([_url(1)], bereich='maler')
+        assert gesehen.enthaelt_viele([_url(1), _url(2)], bereich='maler') == [True, False]
+        assert gesehen.neue(seite, bereich='garten') == seite
+        assert gesehen.neue(seite, bereich='maler') == []
+
+        assert gesehen.vergiss([_url(1), _url(9)], bereich='maler') == 1
+        assert gesehen.neue(seite, bereich='maler') == seite
+
+
+def test_parallele_aufrufe_liefern_jede_anzeige_nur_einmal():
+    seite = [Anzeige(_url(nummer)) for nummer in range(200)]
+    ergebnisse = []
+    with GesehenSpeicher(':memory:', erwartete_anzahl=10) as gesehen:
+        start = threading.Barrier(8)
+
+        def arbeite():
+            start.wait()
+            ergebnisse.extend(gesehen.neue(seite))
+
+        threads = [threading.Thread(target=arbeite) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Der Bloom-Filter ist dabei über seine Kapazität gewachsen
+        assert gesehen._bloom.kapazitaet >= 200
+    assert sorted(ergebnisse) == sorted(seite)
+
+
+def test_altere_aus_entfernt_nur_alte_eintraege(tmp_path):
+    pfad = str(tmp_path / "gesehen.db")
+    with GesehenSpeicher(pfad) as gesehen:
+        gesehen.markiere([_url(1)], zeitpunkt=time.time() - 3600)
+        gesehen.markiere([_url(2)])
+        assert gesehen.altere_aus(60) == 1
+    # Nach dem Neustart gilt der SQLite-Stand
+    with GesehenSpeicher(pfad) as gesehen:
+        assert len(gesehen) == 1
+        assert gesehen.enthaelt_viele([_url(1), _url(2)]) == [False, True]
+
+
+def test_bloom_filter_hat_keine_falsch_negativen():
+    bloom = BloomFilter(1000)
+    for i in range(1000):
+        bloom.hinzufuegen(str(i))
+    assert all(str(i) in bloom for i in range(1000))
+    assert sum(str(i) in bloom for i in range(1000, 11000)) < 300
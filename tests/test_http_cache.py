@@ -0,0 +1,81 @@
+"""Bedingte Anfragen, Frische und Cache-Control im HTTP-Cache"""
+
+import requests
+
+from src.http_cache import HttpCache
+from src.kleinanzeigen_scraper import KleinanzeigenScraper
+from src.rate_limiter import RateLimiter
+
+URL = "https://example.org/s-maler/k0"
+
+
+class _Session:
+    """Beantwortet Anfragen mit vorgegebenen Antworten und merkt sich die Header"""
+
+    def __init__(self, *antworten):
+        self.antworten = list(antworten)
+        self.anfragen = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.anfragen.append(dict(headers or {}))
+        status, header, inhalt = self.antworten.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response.headers = requests.structures.CaseInsensitiveDict(header)
+        response.encoding = 'utf-8'
+        response._content = inhalt
+        return response
+
+
+def test_etag_wird_revalidiert_und_304_aus_dem_cache_beantwortet(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    session = _Session((200, {'ETag': '"v1"'}, b"<html>1</html>"), (304, {}, b""))
+
+    assert cache.hole(session, URL).cache_status == 'fehlschlag'
+    antwort = cache.hole(session, URL)
+    assert antwort.cache_status == 'revalidiert'
+    assert antwort.status_code == 200 and antwort.content == b"<html>1</html>"
+    assert session.anfragen[1] == {'If-None-Match': '"v1"'}
+    assert cache.statistik.revalidierungen == 1
+
+
+def test_max_age_liefert_treffer_ohne_anfrage_s_maxage_nicht(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    session = _Session((200, {'ETag': '"v1"', 'Cache-Control': 'max-age=60'}, b"frisch"))
+    cache.hole(session, URL)
+    assert cache.hole(session, URL).cache_status == 'treffer'
+    assert len(session.anfragen) == 1
+
+    andere = "https://example.org/s-garten/k0"
+    session = _Session((200, {'ETag': '"v1"', 'Cache-Control': 'public, s-maxage=60'}, b"geteilt"),
+                       (304, {}, b""))
+    cache.hole(session, andere)
+    assert cache.hole(session, andere).cache_status == 'revalidiert'
+
+
+def test_no_store_wird_nicht_gespeichert_und_entfernt_alte_eintraege(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.hole(_Session((200, {'ETag': '"v1"'}, b"alt")), URL)
+    assert len(cache) == 1
+
+    session = _Session((200, {'ETag': '"v2"', 'Cache-Control': 'no-store'}, b"neu"),
+                       (200, {'ETag': '"v3"', 'Cache-Control': 'no-store'}, b"neuer"))
+    assert cache.hole(session, URL).content == b"neu"
+    assert len(cache) == 0 and cache.groesse == 0
+    cache.hole(session, URL)
+    assert session.anfragen[1] == {}
+
+
+def test_cache_treffer_zaehlen_nicht_als_netzverkehr(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    scraper = KleinanzeigenScraper(base_url="https://example.org", http_cache=cache,
+                                   rate_limiter=RateLimiter(standard_intervall=0))
+    scraper.session = _Session((200, {'ETag': '"v1"', 'Cache-Control': 'max-age=60'}, b"<html></html>"))
+
+    scraper._sende(URL)
+    scraper._sende(URL)
+    statistik = scraper.metriken.statistik()
+    assert statistik['status'] == {200: 1}
+    assert statistik['cache'] == {'treffer': 1}
+    assert statistik['stufen']['abruf']['anzahl'] == 1
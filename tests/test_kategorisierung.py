@@ -0,0 +1,37 @@
+"""Längster Treffer, Rangfolge und Batch-Modus des Kategorisierers"""
+
+from src.kategorisierung import Kategorisierer
+
+KATEGORIEN = {
+    'garten': ['rasen', 'rasenmäher'],
+    'it': ['pc', 'pc-hilfe', 'computer'],
+    'handwerk': ['mäher', 'maler'],
+}
+
+
+def test_laengster_treffer_liefert_auch_kuerzere_keywords_mit_gleichem_anfang():
+    kategorisierer = Kategorisierer(KATEGORIEN)
+    assert kategorisierer.finde("Biete PC-Hilfe an") == ('it', ['pc', 'pc-hilfe'])
+    # "mäher" steckt innerhalb von "rasenmäher" und wird ebenfalls gefunden
+    assert kategorisierer.finde("Rasenmäher-Service") == ('garten', ['rasen', 'rasenmäher', 'mäher'])
+
+
+def test_erste_kategorie_gewinnt_unabhaengig_von_der_textreihenfolge():
+    kategorisierer = Kategorisierer(KATEGORIEN)
+    kategorie, tags = kategorisierer.finde("Maler hilft auch beim Computer und Rasen")
+    assert kategorie == 'garten'
+    assert set(tags) == {'maler', 'computer', 'rasen'}
+    assert kategorisierer.kategorie("Malerarbeiten am PC geplant") == 'it'
+
+
+def test_ohne_treffer_und_ohne_keywords_gilt_die_standardkategorie():
+    assert Kategorisierer(KATEGORIEN).finde("Umzugshilfe") == ('sonstige', [])
+    leer = Kategorisierer({'it': ['']}, standard='unbekannt')
+    assert leer.finde("pc") == ('unbekannt', [])
+    assert leer.finde_viele(["pc", "maler"]) == [('unbekannt', []), ('unbekannt', [])]
+
+
+def test_batch_modus_entspricht_einzelaufrufen():
+    kategorisierer = Kategorisierer(KATEGORIEN)
+    texte = ["PC-Hilfe", "", "nichts", "Rasen\x00Maler", "maler", "COMPUTER rasen"]
+    assert kategorisierer.finde_viele(texte) == [kategorisierer.finde(t.replace('\x00', ' ')) for t in texte]
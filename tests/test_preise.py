@@ -0,0 +1,67 @@
+"""Preistexte und Bereichsabfragen über den PreisIndex"""
+
+import pytest
+
+from src.preise import (EINHEIT_AUF_ANFRAGE, EINHEIT_FESTPREIS, EINHEIT_STUNDE, EINHEIT_UNBEKANNT,
+                        EINHEIT_VB, EINHEIT_ZU_VERSCHENKEN, STATUS_FEHLT, STATUS_OHNE_BETRAG,
+                        STATUS_OK, Preis, PreisIndex, parse_preis)
+
+
+class _Anzeige:
+    def __init__(self, name, preis):
+        self.name = name
+        self.preis_info = parse_preis(preis)
+
+    def __repr__(self):
+        return self.name
+
+
+@pytest.mark.parametrize('text, erwartet', [
+    ("45 €/h", Preis(45.0, EINHEIT_STUNDE, STATUS_OK)),
+    ("25,50 € pro Stunde", Preis(25.5, EINHEIT_STUNDE, STATUS_OK)),
+    ("1.200 € VB", Preis(1200.0, EINHEIT_VB, STATUS_OK)),
+    ("350 €", Preis(350.0, EINHEIT_FESTPREIS, STATUS_OK)),
+    ("VB", Preis(None, EINHEIT_VB, STATUS_OHNE_BETRAG)),
+    ("Auf Anfrage", Preis(None, EINHEIT_AUF_ANFRAGE, STATUS_OHNE_BETRAG)),
+    ("Zu verschenken", Preis(0.0, EINHEIT_ZU_VERSCHENKEN, STATUS_OK)),
+    ("Preis folgt", Preis(None, EINHEIT_UNBEKANNT, STATUS_OHNE_BETRAG)),
+    ("  ", Preis(None, EINHEIT_UNBEKANNT, STATUS_FEHLT)),
+    (None, Preis(None, EINHEIT_UNBEKANNT, STATUS_FEHLT)),
+])
+def test_parse_preis(text, erwartet):
+    assert parse_preis(text) == erwartet
+
+
+def _namen(anzeigen):
+    return [a.name for a in anzeigen]
+
+
+def _index():
+    return PreisIndex([_Anzeige('a', "50 €"), _Anzeige('b', "Auf Anfrage"), _Anzeige('c', "20 €"),
+                       _Anzeige('d', "50 € VB"), _Anzeige('e', "80 €")])
+
+
+def test_bereich_schliesst_grenzen_ein_und_behaelt_die_reihenfolge():
+    index = _index()
+    assert _namen(index.bereich(20, 50)) == ['a', 'b', 'c', 'd']
+    assert _namen(index.bereich(20, 50, ohne_preis_behalten=False)) == ['a', 'c', 'd']
+    assert _namen(index.bereich(min_preis=51, ohne_preis_behalten=False)) == ['e']
+    assert _namen(index.bereich(max_preis=10, ohne_preis_behalten=False)) == []
+    assert _namen(index.bereich()) == ['a', 'b', 'c', 'd', 'e']
+
+
+def test_einzelnes_und_gesammeltes_einfuegen_ergeben_denselben_index():
+    anzeigen = [_Anzeige(str(i), f"{(i * 37) % 100} €" if i % 7 else "Auf Anfrage") for i in range(60)]
+    einzeln = PreisIndex()
+    for anzeige in anzeigen:
+        einzeln.hinzufuegen(anzeige)
+    gesammelt = PreisIndex(anzeigen[:5])
+    gesammelt.erweitere(anzeigen[5:])
+
+    assert len(einzeln) == len(gesammelt) == 60
+    assert gesammelt.letzte is anzeigen[-1]
+    for grenzen in [(None, None), (10, 40), (0, 0), (99, None)]:
+        assert einzeln.bereich(*grenzen) == gesammelt.bereich(*grenzen)
+        assert all(grenzen[0] is None or a.preis_info.betrag is None or a.preis_info.betrag >= grenzen[0]
+                   for a in gesammelt.bereich(*grenzen))
+    assert PreisIndex().letzte is None
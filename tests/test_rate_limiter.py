@@ -0,0 +1,71 @@
+"""AIMD-Anpassung, Retry-After und Crawl-delay des Rate-Limiters"""
+
+import pytest
+
+from src.rate_limiter import RateLimiter, parse_retry_after
+
+URL = "https://example.org/s-maler/k0"
+
+
+def _limiter():
+    return RateLimiter(standard_intervall=1.0, min_intervall=0.5, max_intervall=8.0, ziel_latenz=1.0)
+
+
+def test_schnelle_antworten_erhoehen_die_rate_bis_zur_obergrenze():
+    limiter = _limiter()
+    raten = []
+    for _ in range(20):
+        limiter.melde_antwort(URL, 200, 0.1)
+        raten.append(limiter.bucket(URL).rate)
+    assert raten[0] == pytest.approx(1.1)
+    assert raten == sorted(raten)
+    assert raten[-1] == pytest.approx(2.0)
+
+
+def test_drosselung_halbiert_fehler_und_latenz_senken_die_rate():
+    limiter = _limiter()
+    limiter.melde_antwort(URL, 429, 0.1)
+    assert limiter.bucket(URL).rate == pytest.approx(0.5)
+    limiter.melde_antwort(URL, None, 0.1)
+    assert limiter.bucket(URL).rate == pytest.approx(0.375)
+    # Langsame Antworten senken die Rate, bis zur Untergrenze von 1/8
+    for _ in range(50):
+        limiter.melde_antwort(URL, 200, 5.0)
+    assert limiter.bucket(URL).rate == pytest.approx(1 / 8)
+    assert limiter.statistik()['example.org'].fehlerquote > 0
+
+
+def test_reservierungen_halten_den_abstand_ein_ohne_zu_schlafen():
+    limiter = _limiter()
+    bucket = limiter.bucket(URL)
+    wartezeiten = [bucket.reserviere() for _ in range(3)]
+    assert wartezeiten[0] == pytest.approx(0, abs=0.01)
+    assert wartezeiten[1] == pytest.approx(1.0, abs=0.01)
+    assert wartezeiten[2] == pytest.approx(2.0, abs=0.01)
+    # Andere Hosts haben eigene Buckets
+    assert limiter.bucket("https://anders.example/").reserviere() == pytest.approx(0, abs=0.01)
+
+
+def test_retry_after_sperrt_den_host():
+    limiter = _limiter()
+    limiter.melde_antwort(URL, 503, 0.1, retry_after='30')
+    assert limiter.statistik()['example.org'].gesperrt_fuer == pytest.approx(30, abs=0.5)
+    assert limiter.bucket(URL).reserviere() == pytest.approx(30, abs=0.5)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('12') == 12.0
+    assert parse_retry_after('-3') == 0.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('bald') is None
+    assert parse_retry_after(None) is None
+
+
+def test_crawl_delay_begrenzt_die_rate_auch_ohne_startintervall():
+    limiter = RateLimiter(standard_intervall=0)
+    limiter.setze_crawl_delay(URL, 4)
+    for _ in range(10):
+        limiter.melde_antwort(URL, 200, 0.1)
+    status = limiter.statistik()['example.org']
+    assert status.crawl_delay == 4
+    assert status.rate == pytest.approx(0.25)
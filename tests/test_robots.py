@@ -0,0 +1,104 @@
+"""Tests für die Auswahl der robots.txt-Gruppe und die Prüfung vor jedem Abruf"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.async_scraper import AsyncKleinanzeigenScraper
+from src.kleinanzeigen_scraper import KleinanzeigenScraper
+from src.rate_limiter import RateLimiter
+from src.robots import RobotsRegeln, RobotsVerbot
+
+ROBOTS = """
+User-agent: Scraper
+Disallow: /
+
+User-agent: *
+Disallow: /privat/
+Crawl-delay: 3
+"""
+
+
+def test_fremder_agent_als_teilstring_wird_nicht_gewaehlt():
+    regeln = RobotsRegeln.parse(ROBOTS, 'KleinanzeigenScraper')
+    assert regeln.erlaubt('/s-handwerker/k0')
+    assert not regeln.erlaubt('/privat/seite')
+    assert regeln.crawl_delay == 3
+
+
+def test_eigenes_produkt_token_ohne_gross_kleinschreibung():
+    text = ROBOTS + "\nUser-agent: kleinanzeigenscraper\nDisallow: /s-\n"
+    regeln = RobotsRegeln.parse(text, 'KleinanzeigenScraper/1.0')
+    assert not regeln.erlaubt('/s-handwerker/k0')
+    assert regeln.erlaubt('/privat/seite')
+    assert regeln.crawl_delay is None
+
+
+class _Antwort:
+    status_code = 200
+    text = "<html></html>"
+    content = text.encode()
+    headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+def _scraper(klasse=KleinanzeigenScraper):
+    """Scraper, dessen Host ``/privat/`` verbietet; gesendete URLs landen in ``scraper.gesendet``"""
+    scraper = klasse(base_url="https://example.org", rate_limiter=RateLimiter(standard_intervall=0))
+    scraper.gesendet = []
+
+    def sende(url, timeout=None):
+        scraper.gesendet.append(url)
+        return _Antwort()
+
+    def lade_robots_txt(url):
+        scraper.gesendet.append(url)
+        return 200, ROBOTS
+
+    scraper._sende = sende
+    scraper.robots._laden = lade_robots_txt
+    return scraper
+
+
+def test_verbotene_urls_werden_in_allen_abrufwegen_nicht_angefragt():
+    scraper = _scraper()
+    with pytest.raises(RobotsVerbot):
+        scraper.hole_seite("https://example.org/privat/seite")
+    with pytest.raises(RobotsVerbot):
+        scraper.lade_ergebnisseite("https://example.org/privat/s-suche/k0")
+    scraper.baue_such_url = lambda suchbegriff, ort="", seite=1: f"https://example.org/privat/{seite}"
+    with pytest.raises(RobotsVerbot):
+        list(scraper.iter_seiten("maler", max_seiten=3))
+    assert scraper.gesendet == ["https://example.org/robots.txt"]
+
+
+def test_erlaubte_url_laedt_zuerst_robots_und_uebernimmt_crawl_delay():
+    scraper = _scraper()
+    scraper.hole_seite("https://example.org/s-maler/k0")
+    assert scraper.gesendet == ["https://example.org/robots.txt", "https://example.org/s-maler/k0"]
+    assert scraper.rate_limiter.bucket("https://example.org/").crawl_delay == 3
+
+
+def test_async_abruf_prueft_robots():
+    scraper = _scraper(AsyncKleinanzeigenScraper)
+    try:
+        with pytest.raises(RobotsVerbot):
+            asyncio.run(scraper.hole_seite_async("https://example.org/privat/seite"))
+        assert scraper.gesendet == ["https://example.org/robots.txt"]
+    finally:
+        scraper.schliessen()
+
+
+def test_stufe_robots_enthaelt_nicht_das_laden_der_regeln():
+    scraper = KleinanzeigenScraper(base_url="https://example.org", rate_limiter=RateLimiter(standard_intervall=0))
+
+    def sende(url, timeout=None):
+        time.sleep(0.05)
+        return _Antwort()
+
+    scraper._sende = sende
+    assert scraper.respektiere_robots_txt("https://example.org/s-maler/k0")
+    assert scraper.metriken.statistik()['stufen']['robots']['summe_s'] < 0.05
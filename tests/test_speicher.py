@@ -0,0 +1,98 @@
+"""Upserts und Abfragen des SQLite-Anzeigenspeichers"""
+
+import pytest
+
+from src.kleinanzeigen_scraper import DienstleistungsAnzeige, NichtGeladen
+from src.speicher import AnzeigenSpeicher, fts5_verfuegbar
+
+URL = "https://www.kleinanzeigen.de/s-anzeige/hilfe/123-1-2"
+
+
+def _anzeige(beschreibung, kontakt, titel="PC-Hilfe", preis="30 €", ort="Berlin", kategorie="it", url=URL):
+    return DienstleistungsAnzeige(titel, beschreibung, preis, ort, kategorie, kontakt, url, None, [kategorie])
+
+
+def _bestand():
+    return [
+        _anzeige("Hilfe bei Computerproblemen", "A", preis="30 €", url=URL),
+        _anzeige("Rasen mähen und Hecke schneiden", "B", titel="Gartenpflege", preis="Auf Anfrage",
+                 ort="12345 Berlin-Mitte", kategorie="garten", url=URL + "0"),
+        _anzeige("Wände streichen, Tapezieren", "C", titel="Malerarbeiten", preis="80 € VB",
+                 ort="München", kategorie="handwerk", url=URL + "1"),
+        _anzeige("Computer reparieren, Hilfe vor Ort", "D", titel="Reparatur", preis="15 €/h",
+                 ort="Hamburg", url=URL + "2"),
+    ]
+
+
+def _titel(anzeigen):
+    return [a.titel for a in anzeigen]
+
+
+def test_liste_ueberschreibt_geladene_details_nicht():
+    with AnzeigenSpeicher(':memory:') as speicher:
+        speicher.speichere([_anzeige("Ausführliche Beschreibung", "Tel. 0123")])
+        speicher.speichere([_anzeige(NichtGeladen("snip"), NichtGeladen("Siehe Anzeige"), preis="25 €")])
+
+        gespeichert, = speicher.alle()
+        assert (gespeichert.beschreibung, gespeichert.kontakt) == ("Ausführliche Beschreibung", "Tel. 0123")
+        assert gespeichert.preis == "25 €"
+        assert gespeichert.details_geladen
+
+
+def test_nicht_geladene_details_bleiben_erkennbar_und_werden_ersetzt():
+    with AnzeigenSpeicher(':memory:') as speicher:
+        speicher.speichere([_anzeige(NichtGeladen("snip"), NichtGeladen("Siehe Anzeige"))])
+        gespeichert, = speicher.alle()
+        assert not gespeichert.details_geladen
+        assert type(gespeichert.roher_wert('beschreibung')) is NichtGeladen
+
+        speicher.speichere([_anzeige("Ausführliche Beschreibung", "Tel. 0123")])
+        gespeichert, = speicher.alle()
+        assert gespeichert.details_geladen
+        assert gespeichert.beschreibung == "Ausführliche Beschreibung"
+
+
+def test_upsert_zaehlt_batches_und_ersetzt_vorhandene_urls():
+    with AnzeigenSpeicher(':memory:', batch_groesse=3) as speicher:
+        assert speicher.speichere(_bestand()) == 4
+        assert speicher.speichere([_anzeige("Neu", "E", titel="PC-Hilfe Plus", preis="35 €")]) == 1
+        assert len(speicher) == 4
+        assert [a.titel for a in speicher.alle()] == ["PC-Hilfe Plus", "Gartenpflege", "Malerarbeiten", "Reparatur"]
+
+
+def test_filter_nach_kategorie_ort_und_preis():
+    with AnzeigenSpeicher(':memory:') as speicher:
+        speicher.speichere(_bestand())
+        assert _titel(speicher.filtere_nach_kategorie('it')) == ["PC-Hilfe", "Reparatur"]
+        assert _titel(speicher.filtere_nach_ort('BERLIN')) == ["PC-Hilfe", "Gartenpflege"]
+        assert _titel(speicher.filtere_nach_preisspanne(20, 80)) == ["PC-Hilfe", "Gartenpflege", "Malerarbeiten"]
+        assert _titel(speicher.filtere_nach_preisspanne(20, 80, ohne_preis_behalten=False)) == [
+            "PC-Hilfe", "Malerarbeiten"]
+        assert _titel(speicher.filtere(kategorie='it', max_preis=20, limit=5)) == ["Reparatur"]
+
+
+@pytest.mark.skipif(not fts5_verfuegbar(), reason="SQLite ohne FTS5")
+def test_volltextsuche_folgt_aktualisierten_texten():
+    with AnzeigenSpeicher(':memory:') as speicher:
+        speicher.speichere(_bestand())
+        # Ganze Wörter, ohne Beachtung von Umlauten
+        assert {a.titel for a in speicher.suche("hilfe")} == {"PC-Hilfe", "Reparatur"}
+        assert [a.titel for a in speicher.suche("computer hilfe")] == ["Reparatur"]
+        assert [a.titel for a in speicher.suche("wande")] == ["Malerarbeiten"]
+        assert len(speicher.suche("hilfe", limit=1)) == 1
+
+        speicher.speichere([_anzeige("Fenster putzen", "A")])
+        assert speicher.suche("computerproblemen") == []
+        assert [a.titel for a in speicher.filtere(text="fenster", kategorie='it')] == ["PC-Hilfe"]
+
+
+def test_fehlgeschlagener_batch_vergisst_seine_neuen_orte():
+    with AnzeigenSpeicher(':memory:') as speicher:
+        kaputt = _anzeige("x", "y", ort="Potsdam")
+        kaputt.tags = [object()]
+        with pytest.raises(TypeError):
+            speicher.speichere([kaputt])
+        assert len(speicher) == 0 and 'potsdam' not in speicher._orte
+
+        speicher.speichere([_anzeige("x", "y", ort="Potsdam")])
+        assert [a.ort for a in speicher.filtere_nach_ort("potsdam")] == ["Potsdam"]